@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+
+"""Benchmark lookups end to end against a local mock of every provider.
+
+Starts a MockProviderServer that answers like each provider does, points the lookup sources at it,
+and measures the hot paths:
+
+- Single-IP latency of IPLooker.query_sources() with a fixed provider latency, so anything above
+  that latency is overhead. The mock server runs in the same interpreter, so the overhead includes
+  its share of the work, which stays the same from run to run.
+- Batch throughput of BatchLookup in addresses per second, and HTTP requests sent per address.
+- Memory retained per 100k addresses, both as IPLookupResult objects and as an
+  IPLookupResultBatch, with a result from every source for each address.
+- CPU time of each source's _parse_response(), of formatting a result for display, and of merging
+  the results for an address.
+- CPU time of decoding each source's responses, at the size of the real provider's, with each
+  installed JSON backend, and with the text copy that decoding through response.json() makes.
+
+It also runs a batch through the error modes (rate limiting, slow responses, malformed JSON, and
+providers without IPv6 support) and fails if any of them raise instead of being reported as a
+failed source, and it sends the lookup server a bulk request larger than the batch window and
+fails if any address goes unanswered.
+
+Run it from the repository root, saving a baseline before a change and comparing after it:
+
+    python -m benchmarks.lookups --save baseline.json
+    python -m benchmarks.lookups --compare baseline.json --tolerance 0.25
+
+Exits with status 1 if a measurement is worse than the baseline by more than the tolerance, if
+the error modes aren't handled, or if the bulk server request isn't fully answered.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from collections import Counter
+from functools import partial
+from ipaddress import IPv4Address, IPv6Address, ip_address
+from itertools import starmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from benchmarks.mock_providers import PROVIDERS, MockProviderServer, MockScenario, build_response
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from iplooker.lookup_result import IPLookupResult
+    from iplooker.lookup_source import IPLookupSource
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+# Failures expected to show up as failure reasons when running through the error modes
+EXPECTED_ERRORS: tuple[str, ...] = ("JSON decode error", "IPv6 addresses are not supported")
+
+ERROR_SCENARIO = MockScenario(
+    latency=0.002,
+    slow_fraction=0.02,
+    slow_latency=0.5,
+    rate_limit_fraction=0.1,
+    malformed_fraction=0.05,
+    ipv6_unsupported=frozenset({"ip-api.com", "ipapi.co", "ipgeolocation.io"}),
+)
+
+
+class Measurement(NamedTuple):
+    """A single benchmark result."""
+
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+def make_ips(count: int, ipv6_every: int = 10) -> list[str]:
+    """Make a list of distinct public addresses, with every nth one an IPv6 address."""
+    ips = []
+    for index in range(count):
+        if ipv6_every and index % ipv6_every == ipv6_every - 1:
+            ips.append(str(IPv6Address((0x2001_4860 << 96) + index * 0x1_0000_0001)))
+        else:
+            ips.append(str(IPv4Address(0x0C00_0000 + index * 7919)))
+    return ips
+
+
+def remote_sources() -> list[type[IPLookupSource]]:
+    """Get the lookup sources the mock server emulates."""
+    from iplooker.ip_looker import IPLooker
+
+    return [source for source in IPLooker.get_lookup_sources() if source.SOURCE_NAME in PROVIDERS]
+
+
+def measure_single_lookups(
+    sources: list[type[IPLookupSource]], ips: list[str], latency: float
+) -> list[Measurement]:
+    """Time lookups of one address at a time across every source."""
+    from iplooker.ip_looker import IPLooker
+
+    timings = []
+    with MockProviderServer(MockScenario(latency=latency)) as server, server.install(sources):
+        IPLooker.query_sources(ips[0])  # Open the connections before timing anything
+
+        for ip in ips:
+            started = time.perf_counter()
+            IPLooker.query_sources(ip)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    return [
+        Measurement("single_ip_p50", statistics.median(timings), "ms"),
+        Measurement("single_ip_p95", statistics.quantiles(timings, n=20)[-1], "ms"),
+        Measurement("single_ip_overhead", statistics.median(timings) - latency * 1000, "ms"),
+    ]
+
+
+def measure_batch(
+    sources: list[type[IPLookupSource]], ips: list[str], latency: float, workers: int | None
+) -> list[Measurement]:
+    """Time a batch lookup and count the requests it sends."""
+    from iplooker.batch_lookup import BatchLookup
+
+    with MockProviderServer(MockScenario(latency=latency)) as server, server.install(sources):
+        started = time.perf_counter()
+        completed = sum(1 for _ in BatchLookup(max_workers=workers, sources=sources).run(ips))
+        elapsed = time.perf_counter() - started
+        requests = server.requests.total()
+
+    return [
+        Measurement("batch_throughput", completed / elapsed, "IPs/s", higher_is_better=True),
+        Measurement("batch_requests_per_ip", requests / completed, "requests"),
+    ]
+
+
+def parse_results(
+    sources: list[type[IPLookupSource]], ips: list[str]
+) -> list[IPLookupResult | None]:
+    """Parse a freshly decoded mock response from every source for every address."""
+    results = []
+    for ip in ips:
+        ip_obj = IPv6Address(ip) if ":" in ip else IPv4Address(ip)
+        for source in sources:
+            data = json.loads(json.dumps(build_response(source, ip_obj)))
+            results.append(source._parse_response(data, ip_obj))  # noqa: SLF001
+    return results
+
+
+def measure_memory(sources: list[type[IPLookupSource]], ips: list[str]) -> list[Measurement]:
+    """Measure the memory retained by the results for a set of addresses, scaled to 100k."""
+    from iplooker.result_batch import IPLookupResultBatch
+
+    scale = 100_000 / len(ips)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results = parse_results(sources, ips)
+    gc.collect()
+    objects_size = tracemalloc.get_traced_memory()[0] - baseline
+
+    batch = IPLookupResultBatch(result for result in results if result)
+    del results
+    gc.collect()
+    batch_size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del batch
+
+    return [
+        Measurement("memory_objects_per_100k_ips", objects_size * scale / 1e6, "MB"),
+        Measurement("memory_batch_per_100k_ips", batch_size * scale / 1e6, "MB"),
+    ]
+
+
+def measure_cpu(sources: list[type[IPLookupSource]], ips: list[str]) -> list[Measurement]:
+    """Measure the CPU time of parsing, formatting, and merging results."""
+    from iplooker.ip_formatter import IPFormatter
+    from iplooker.result_merger import ResultMerger
+
+    measurements = []
+    for source in sources:
+        decoded = []
+        for ip in ips:
+            ip_obj = IPv6Address(ip) if ":" in ip else IPv4Address(ip)
+            decoded.append((json.loads(json.dumps(build_response(source, ip_obj))), ip_obj))
+
+        parse = source._parse_response  # noqa: SLF001
+        seconds = _best_time(partial(_call_each, parse, decoded))
+        measurements.append(
+            Measurement(f"parse_{source.SOURCE_NAME}", seconds / len(decoded) * 1e6, "us")
+        )
+
+    results = [result for result in parse_results(sources, ips) if result]
+    formatter = IPFormatter("")
+    seconds = _best_time(
+        lambda: [formatter.format_lookup_result(result, True, True) for result in results]
+    )
+    measurements.append(Measurement("format_result", seconds / len(results) * 1e6, "us"))
+
+    per_ip = [
+        results[start : start + len(sources)] for start in range(0, len(results), len(sources))
+    ]
+    merger = ResultMerger()
+    seconds = _best_time(lambda: [merger.merge(group) for group in per_ip])
+    measurements.append(Measurement("merge_ip", seconds / len(per_ip) * 1e6, "us"))
+    return measurements
+
+
+def measure_decode(sources: list[type[IPLookupSource]], ips: list[str]) -> list[Measurement]:
+    """Measure the CPU time of decoding full-size responses with each installed JSON backend."""
+    from iplooker.response_decoder import BACKENDS
+
+    decoders: dict[str, Callable[[bytes], object]] = {
+        "json_text": lambda body: json.loads(body.decode())
+    }
+    for name, load in BACKENDS.items():
+        try:
+            decoders[name] = load()
+        except ImportError:
+            continue
+
+    measurements = []
+    for source in sources:
+        bodies = [
+            json.dumps(build_response(source, ip_address(ip), full=True)).encode() for ip in ips
+        ]
+        for name, decode in decoders.items():
+            seconds = _best_time(partial(_call_each, decode, [(body,) for body in bodies]))
+            measurements.append(
+                Measurement(
+                    f"decode_{source.SOURCE_NAME}_{name}", seconds / len(bodies) * 1e6, "us"
+                )
+            )
+    return measurements
+
+
+def check_error_modes(sources: list[type[IPLookupSource]], ips: list[str]) -> Counter[str]:
+    """Run a batch through every error mode and count the outcomes by failure reason."""
+    from iplooker.batch_lookup import BatchLookup
+
+    outcomes: Counter[str] = Counter()
+    with MockProviderServer(ERROR_SCENARIO) as server, server.install(sources):
+        for item in BatchLookup(sources=sources).run(ips):
+            outcomes["ok"] += len(item.results)
+            outcomes.update(item.missing_sources.values())
+    return outcomes
+
+
+def check_bulk_server(sources: list[type[IPLookupSource]], ips: list[str]) -> list[str]:
+    """Send one bulk lookup to the lookup server's service and describe anything that went wrong.
+
+    With more addresses than the batch window, addresses are still being read while earlier ones
+    finish, which is where bulk requests can break.
+    """
+    from iplooker.lookup_server import LookupService
+
+    service = LookupService()
+    try:
+        with MockProviderServer(MockScenario(latency=0.002)) as server, server.install(sources):
+            responses = service.lookup_many(ips)
+    except Exception as e:
+        return [f"bulk lookup of {len(ips)} addresses raised {e!r}"]
+    finally:
+        service.close()
+
+    unanswered = [response["ip"] for response in responses if not response.get("results")]
+    if unanswered:
+        return [
+            f"{len(unanswered)} of {len(ips)} addresses had no results, such as {unanswered[0]}"
+        ]
+    return []
+
+
+def _call_each(func: Callable[..., object], calls: Iterable[tuple[Any, ...]]) -> list[object]:
+    """Call a function once for each tuple of arguments and collect the results."""
+    return list(starmap(func, calls))
+
+
+def _best_time(func: Callable[[], object], repeat: int = 5) -> float:
+    """Get the fastest time for one call of a function, in seconds, over several timed runs."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def find_regressions(
+    measurements: list[Measurement], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """Describe each measurement that's worse than its baseline by more than the tolerance."""
+    regressions = []
+    for measurement in measurements:
+        previous = baseline.get(measurement.name)
+        if not previous:
+            continue
+
+        change = (measurement.value - previous) / previous
+        if measurement.higher_is_better:
+            change = -change
+        if change > tolerance:
+            regressions.append(
+                f"{measurement.name}: {previous:.2f} -> {measurement.value:.2f} "
+                f"{measurement.unit} ({change:.0%} worse)"
+            )
+    return regressions
+
+
+def run_benchmarks(
+    args: argparse.Namespace,
+) -> tuple[list[Measurement], Counter[str], list[str]]:
+    """Run every benchmark, the error mode check, and the bulk server check."""
+    from iplooker.circuit_breaker import CircuitBreakers
+    from iplooker.result_cache import ResultCache
+
+    ResultCache.configure(enabled=False)
+    CircuitBreakers.configure(enabled=False)
+    sources = remote_sources()
+
+    measurements = measure_single_lookups(sources, make_ips(args.single_ips), args.latency)
+    measurements.extend(
+        measure_batch(sources, make_ips(args.batch_ips), args.latency, args.workers)
+    )
+    measurements.extend(measure_memory(sources, make_ips(args.memory_ips)))
+    measurements.extend(measure_cpu(sources, make_ips(args.cpu_ips)))
+    measurements.extend(measure_decode(sources, make_ips(args.decode_ips)))
+    outcomes = check_error_modes(sources, make_ips(args.error_ips, ipv6_every=4))
+    return measurements, outcomes, check_bulk_server(sources, make_ips(args.bulk_ips))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="the mock provider latency in seconds"
+    )
+    parser.add_argument(
+        "--single-ips", type=int, default=20, help="the number of single lookups to time"
+    )
+    parser.add_argument(
+        "--batch-ips", type=int, default=2000, help="the number of addresses in the batch"
+    )
+    parser.add_argument("--workers", type=int, help="the number of batch workers")
+    parser.add_argument(
+        "--memory-ips",
+        type=int,
+        default=10_000,
+        help="the number of addresses to measure memory for (scaled to 100k)",
+    )
+    parser.add_argument(
+        "--cpu-ips", type=int, default=1000, help="the number of addresses to time parsing for"
+    )
+    parser.add_argument(
+        "--decode-ips",
+        type=int,
+        default=200,
+        help="the number of responses per source to time decoding for",
+    )
+    parser.add_argument(
+        "--error-ips", type=int, default=200, help="the number of addresses in the error run"
+    )
+    parser.add_argument(
+        "--bulk-ips",
+        type=int,
+        default=1000,
+        help="the number of addresses in the bulk server request (more than the batch window)",
+    )
+    parser.add_argument("--save", metavar="FILE", help="save the measurements as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="the fraction a measurement may be worse than the baseline",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks, report the measurements, and check them against a baseline."""
+    args = parse_args()
+    if str(SRC_PATH) not in sys.path:
+        sys.path.insert(0, str(SRC_PATH))
+
+    measurements, outcomes, bulk_problems = run_benchmarks(args)
+    for measurement in measurements:
+        print(f"{measurement.name:<40} {measurement.value:>10.2f} {measurement.unit}")
+
+    print("\nError modes: " + ", ".join(f"{reason} {count}" for reason, count in outcomes.items()))
+    failed = False
+    if missing := [error for error in EXPECTED_ERRORS if not outcomes[error]]:
+        print(f"Error modes not reported: {', '.join(missing)}")
+        failed = True
+
+    if bulk_problems:
+        print("Bulk server lookups failed: " + "; ".join(bulk_problems))
+        failed = True
+
+    if args.save:
+        values = {measurement.name: measurement.value for measurement in measurements}
+        Path(args.save).write_text(json.dumps(values, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if regressions := find_regressions(measurements, baseline, args.tolerance):
+            print("\nRegressions:\n" + "\n".join(f"  {line}" for line in regressions))
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,734 @@
+"""Local stand-in for the lookup providers, for benchmarks.
+
+MockProviderServer is an HTTP server that answers requests for every remote lookup source with
+responses shaped like the real provider's, so the real parsers run against them. Single lookups,
+bulk endpoints (POSTed JSON arrays and ipregistry.co's comma-separated URLs), and each provider's
+error format are all emulated. A MockScenario controls latency and the error modes: rate limiting
+with HTTP 429, slow responses, malformed JSON, and providers that don't support IPv6.
+
+Each address always gets the same location and network, so results are reproducible, and values
+repeat across addresses the way they do in real data.
+
+    with MockProviderServer(MockScenario(latency=0.02)) as server, server.install(sources):
+        IPLooker.query_sources("12.34.56.78")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import IPv6Address, ip_address
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable
+    from ipaddress import IPv4Address
+
+    from iplooker.lookup_source import IPLookupSource
+
+
+@dataclass(frozen=True)
+class MockScenario:
+    """How the mock providers behave. Fractions are of all requests, chosen at random.
+
+    Attributes:
+        latency: The time taken to answer every request, in seconds.
+        slow_fraction: The fraction of requests that take slow_latency instead.
+        slow_latency: The time taken to answer a slow request, in seconds.
+        rate_limit_fraction: The fraction of requests answered with HTTP 429.
+        retry_after: The Retry-After value sent with rate limit responses, in seconds.
+        malformed_fraction: The fraction of requests answered with truncated JSON.
+        ipv6_unsupported: The names of the sources that answer IPv6 lookups with an error.
+        full_responses: Whether to include the sections real providers send that the parsers
+            don't read, as build_response() does with full=True.
+        seed: The seed for choosing which requests fail, so runs are repeatable.
+    """
+
+    latency: float = 0.0
+    slow_fraction: float = 0.0
+    slow_latency: float = 1.0
+    rate_limit_fraction: float = 0.0
+    retry_after: int = 0
+    malformed_fraction: float = 0.0
+    ipv6_unsupported: frozenset[str] = frozenset()
+    full_responses: bool = False
+    seed: int = 0
+
+
+class _Profile(NamedTuple):
+    """The made-up facts about one IP address that every provider reports in its own format."""
+
+    ip: str
+    country_code: str
+    country: str
+    region: str
+    city: str
+    asn: int
+    network: str
+    domain: str
+    route: str
+    is_datacenter: bool
+    is_vpn: bool
+    is_tor: bool
+
+
+_LOCATIONS: tuple[tuple[str, str, str, str], ...] = (
+    ("US", "United States", "California", "Mountain View"),
+    ("US", "United States", "New York", "New York"),
+    ("US", "United States", "Texas", "Dallas"),
+    ("DE", "Germany", "Hesse", "Frankfurt am Main"),
+    ("GB", "United Kingdom", "England", "London"),
+    ("NL", "Netherlands", "North Holland", "Amsterdam"),
+    ("JP", "Japan", "Tokyo", "Tokyo"),
+    ("SG", "Singapore", "Central Singapore", "Singapore"),
+    ("BR", "Brazil", "Sao Paulo", "São Paulo"),
+    ("AU", "Australia", "New South Wales", "Sydney"),
+)
+
+_NETWORKS: tuple[tuple[int, str, str, bool], ...] = (
+    (15169, "Google LLC", "google.com", True),
+    (7922, "Comcast Cable Communications, LLC", "comcast.net", False),
+    (16509, "Amazon.com, Inc.", "amazon.com", True),
+    (3320, "Deutsche Telekom AG", "telekom.de", False),
+    (2856, "British Telecommunications PLC", "bt.com", False),
+    (13335, "Cloudflare, Inc.", "cloudflare.com", True),
+    (2516, "KDDI Corporation", "kddi.com", False),
+    (9506, "Singtel Fibre Broadband", "singtel.com", False),
+)
+
+
+def make_profile(ip: IPv4Address | IPv6Address) -> _Profile:
+    """Make up the facts for an IP address, always the same ones for the same address."""
+    packed = int(ip)
+    country_code, country, region, city = _LOCATIONS[packed % len(_LOCATIONS)]
+    asn, network, domain, is_datacenter = _NETWORKS[(packed >> 8) % len(_NETWORKS)]
+    prefix = 48 if isinstance(ip, IPv6Address) else 24
+    route = str(ip_address(packed >> (ip.max_prefixlen - prefix) << (ip.max_prefixlen - prefix)))
+    return _Profile(
+        ip=str(ip),
+        country_code=country_code,
+        country=country,
+        region=region,
+        city=city,
+        asn=asn,
+        network=network,
+        domain=domain,
+        route=f"{route}/{prefix}",
+        is_datacenter=is_datacenter,
+        is_vpn=packed % 17 == 0,
+        is_tor=packed % 101 == 0,
+    )
+
+
+def _ip_api_com(p: _Profile) -> dict[str, Any]:
+    return {
+        "status": "success",
+        "country": p.country,
+        "countryCode": p.country_code,
+        "regionName": p.region,
+        "city": p.city,
+        "isp": p.network,
+        "org": p.network,
+        "as": f"AS{p.asn} {p.network}",
+        "query": p.ip,
+    }
+
+
+def _ipapi_co(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "city": p.city,
+        "region": p.region,
+        "country_code": p.country_code,
+        "country_name": p.country,
+        "asn": f"AS{p.asn}",
+        "org": p.network,
+    }
+
+
+def _ipapi_is(p: _Profile) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "ip": p.ip,
+        "is_datacenter": p.is_datacenter,
+        "is_tor": p.is_tor,
+        "is_proxy": False,
+        "is_vpn": p.is_vpn,
+        "company": {"name": p.network, "domain": p.domain},
+        "asn": {"asn": p.asn, "route": p.route, "org": p.network, "domain": p.domain},
+        "location": {
+            "country": p.country,
+            "country_code": p.country_code,
+            "state": p.region,
+            "city": p.city,
+        },
+    }
+    if p.is_datacenter:
+        data["datacenter"] = {"datacenter": p.network, "domain": p.domain}
+    if p.is_vpn:
+        data["vpn"] = {"is_vpn": True, "service": "ExampleVPN"}
+    return data
+
+
+def _ipdata_co(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "city": p.city,
+        "region": p.region,
+        "country_name": p.country,
+        "country_code": p.country_code,
+        "asn": {"asn": f"AS{p.asn}", "name": p.network, "domain": p.domain, "route": p.route},
+        "threat": {
+            "is_tor": p.is_tor,
+            "is_proxy": False,
+            "is_datacenter": p.is_datacenter,
+            "is_anonymous": p.is_tor or p.is_vpn,
+        },
+    }
+
+
+def _ipgeolocation_io(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "location": {
+            "country_code2": p.country_code,
+            "country_name": p.country,
+            "state_prov": p.region,
+            "city": p.city,
+        },
+    }
+
+
+def _ipinfo_io(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "city": p.city,
+        "region": p.region,
+        "country": p.country_code,
+        "org": f"AS{p.asn} {p.network}",
+        "privacy": {
+            "vpn": p.is_vpn,
+            "proxy": False,
+            "tor": p.is_tor,
+            "hosting": p.is_datacenter,
+            "service": "ExampleVPN" if p.is_vpn else "",
+        },
+    }
+
+
+def _iplocate_io(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "country": p.country,
+        "country_code": p.country_code,
+        "city": p.city,
+        "subdivision": p.region,
+        "asn": {"asn": f"AS{p.asn}", "route": p.route, "name": p.network, "domain": p.domain},
+        "company": {"name": p.network, "domain": p.domain},
+    }
+
+
+def _ipregistry_co(p: _Profile) -> dict[str, Any]:
+    return {
+        "ip": p.ip,
+        "connection": {
+            "asn": p.asn,
+            "domain": p.domain,
+            "organization": p.network,
+            "route": p.route,
+        },
+        "location": {
+            "country": {"code": p.country_code, "name": p.country},
+            "region": {"name": p.region},
+            "city": p.city,
+        },
+        "security": {
+            "is_vpn": p.is_vpn,
+            "is_proxy": False,
+            "is_tor": p.is_tor,
+            "is_cloud_provider": p.is_datacenter,
+            "is_anonymous": p.is_tor or p.is_vpn,
+        },
+    }
+
+
+def _time_zone(p: _Profile) -> dict[str, Any]:
+    return {
+        "id": f"{p.country_code}/{p.city.replace(' ', '_')}",
+        "abbreviation": "UTC",
+        "current_time": "2026-01-01T12:00:00+00:00",
+        "name": "Coordinated Universal Time",
+        "offset": 0,
+        "in_daylight_saving": False,
+    }
+
+
+def _currency(p: _Profile) -> dict[str, Any]:
+    return {
+        "code": "USD" if p.country_code == "US" else "EUR",
+        "name": "US Dollar" if p.country_code == "US" else "Euro",
+        "name_native": "US Dollar" if p.country_code == "US" else "Euro",
+        "plural": "US dollars" if p.country_code == "US" else "euros",
+        "plural_native": "US dollars" if p.country_code == "US" else "euros",
+        "symbol": "$" if p.country_code == "US" else "€",
+        "symbol_native": "$" if p.country_code == "US" else "€",
+        "format": {
+            "decimal_separator": ".",
+            "group_separator": ",",
+            "negative": {"prefix": "-$", "suffix": ""},
+            "positive": {"prefix": "$", "suffix": ""},
+        },
+    }
+
+
+def _ipapi_is_extras(p: _Profile) -> dict[str, Any]:
+    return {
+        "rir": "ARIN",
+        "is_bogon": False,
+        "is_mobile": False,
+        "is_satellite": False,
+        "is_crawler": False,
+        "is_abuser": False,
+        "company": {
+            "abuser_score": "0.0012 (Very Low)",
+            "type": "hosting" if p.is_datacenter else "isp",
+            "network": p.route,
+            "whois": f"https://api.ipapi.is/?whois={p.route.split('/')[0]}",
+        },
+        "abuse": {
+            "name": f"{p.network} Abuse",
+            "address": "1 Network Way, Example City, EX 00000",
+            "email": f"abuse@{p.domain}",
+            "phone": "+1-555-0100",
+        },
+        "asn": {
+            "abuser_score": "0.0009 (Very Low)",
+            "descr": f"{p.network.upper()}, {p.country_code}",
+            "country": p.country_code.lower(),
+            "active": True,
+            "created": "2000-03-30",
+            "updated": "2024-02-17",
+            "rir": "ARIN",
+            "whois": f"https://api.ipapi.is/?whois=AS{p.asn}",
+            "type": "hosting" if p.is_datacenter else "isp",
+        },
+        "location": {
+            "continent": "NA" if p.country_code == "US" else "EU",
+            "latitude": 37.40599,
+            "longitude": -122.078514,
+            "zip": "94043",
+            "timezone": "America/Los_Angeles",
+            "local_time": "2026-01-01T04:00:00-08:00",
+            "local_time_unix": 1767268800,
+            "is_dst": False,
+        },
+        "elapsed_ms": 0.42,
+    }
+
+
+def _ipdata_co_extras(p: _Profile) -> dict[str, Any]:
+    return {
+        "is_eu": p.country_code in {"DE", "NL"},
+        "region_code": p.region[:2].upper(),
+        "region_type": "state",
+        "continent_name": "North America",
+        "continent_code": "NA",
+        "latitude": 37.40599,
+        "longitude": -122.078514,
+        "postal": "94043",
+        "calling_code": "1",
+        "flag": f"https://ipdata.co/flags/{p.country_code.lower()}.png",
+        "emoji_flag": "🇺🇸",
+        "emoji_unicode": "U+1F1FA U+1F1F8",
+        "languages": [{"name": "English", "native": "English", "code": "en"}],
+        "currency": {
+            "name": "US Dollar",
+            "code": "USD",
+            "symbol": "$",
+            "native": "$",
+            "plural": "US dollars",
+        },
+        "time_zone": _time_zone(p),
+        "threat": {
+            "is_icloud_relay": False,
+            "is_known_attacker": False,
+            "is_known_abuser": False,
+            "is_threat": False,
+            "is_bogon": False,
+            "blocklists": [],
+            "scores": {"vpn_score": 0, "proxy_score": 0, "threat_score": 0, "trust_score": 0},
+        },
+        "count": "1",
+    }
+
+
+def _ipregistry_co_extras(p: _Profile) -> dict[str, Any]:
+    return {
+        "type": "IPv6" if ":" in p.ip else "IPv4",
+        "hostname": f"host-{p.ip.replace('.', '-').replace(':', '-')}.{p.domain}",
+        "carrier": {"name": None, "mcc": None, "mnc": None},
+        "company": {"domain": p.domain, "name": p.network, "type": "business"},
+        "connection": {"type": "hosting" if p.is_datacenter else "isp"},
+        "currency": _currency(p),
+        "location": {
+            "continent": {"code": "NA", "name": "North America"},
+            "country": {
+                "area": 9629091,
+                "borders": ["CA", "MX"],
+                "calling_code": "1",
+                "capital": "Washington D.C.",
+                "population": 327167434,
+                "population_density": 33.98,
+                "flag": {
+                    "emoji": "🇺🇸",
+                    "emoji_unicode": "U+1F1FA U+1F1F8",
+                    "emojitwo": "https://cdn.ipregistry.co/flags/emojitwo/us.svg",
+                    "noto": "https://cdn.ipregistry.co/flags/noto/us.png",
+                    "twemoji": "https://cdn.ipregistry.co/flags/twemoji/us.svg",
+                    "wikimedia": "https://cdn.ipregistry.co/flags/wikimedia/us.svg",
+                },
+                "languages": [{"code": "en", "name": "English", "native": "English"}],
+                "tld": f".{p.country_code.lower()}",
+            },
+            "region": {"code": f"{p.country_code}-{p.region[:2].upper()}"},
+            "in_eu": p.country_code in {"DE", "NL"},
+            "postal": "94043",
+            "latitude": 37.40599,
+            "longitude": -122.078514,
+            "language": {"code": "en", "name": "English", "native": "English"},
+        },
+        "security": {
+            "is_abuser": False,
+            "is_attacker": False,
+            "is_bogon": False,
+            "is_relay": False,
+            "is_threat": False,
+        },
+        "time_zone": _time_zone(p),
+    }
+
+
+# Sections each provider sends beyond what the parser reads, for providers with large responses
+_EXTRAS: dict[str, Callable[[_Profile], dict[str, Any]]] = {
+    "ipapi.is": _ipapi_is_extras,
+    "ipdata.co": _ipdata_co_extras,
+    "ipregistry.co": _ipregistry_co_extras,
+}
+
+
+class MockProvider(NamedTuple):
+    """How a provider shapes its responses.
+
+    Attributes:
+        build: Builds the response for a single lookup from an address's profile.
+        batch_shape: How bulk responses are shaped: "list" for a list of entries, "dict" for an
+            object keyed by IP address, or "results" for a list wrapped in a "results" key.
+        batch_ip_key: The key naming the IP address in each entry of a list-shaped bulk response.
+    """
+
+    build: Callable[[_Profile], dict[str, Any]]
+    batch_shape: str = "list"
+    batch_ip_key: str = "ip"
+
+
+# Response shapes for each remote source, keyed by source name
+PROVIDERS: dict[str, MockProvider] = {
+    "ip-api.com": MockProvider(_ip_api_com, batch_ip_key="query"),
+    "ipapi.co": MockProvider(_ipapi_co),
+    "ipapi.is": MockProvider(_ipapi_is),
+    "ipdata.co": MockProvider(_ipdata_co),
+    "ipgeolocation.io": MockProvider(_ipgeolocation_io),
+    "ipinfo.io": MockProvider(_ipinfo_io, batch_shape="dict"),
+    "iplocate.io": MockProvider(_iplocate_io),
+    "ipregistry.co": MockProvider(_ipregistry_co, batch_shape="results"),
+}
+
+
+def build_response(
+    source: type[IPLookupSource], ip: IPv4Address | IPv6Address, full: bool = False
+) -> dict[str, Any]:
+    """Build the response a source's provider would send for a successful lookup.
+
+    Args:
+        source: The source to build the response for.
+        ip: The address looked up.
+        full: Whether to add the sections the real provider sends that the parser doesn't read,
+            so the response has the size and nesting of a real one.
+    """
+    profile = make_profile(ip)
+    data = PROVIDERS[source.SOURCE_NAME].build(profile)
+    if full and (extras := _EXTRAS.get(source.SOURCE_NAME)):
+        _deep_merge(data, extras(profile))
+    return data
+
+
+def _deep_merge(data: dict[str, Any], extra: dict[str, Any]) -> None:
+    """Add the keys of one nested dictionary to another, keeping values already present."""
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            _deep_merge(data[key], value)
+        else:
+            data.setdefault(key, value)
+
+
+def build_error(source: type[IPLookupSource], message: str) -> dict[str, Any]:
+    """Build an error response in the format a source's parser checks for."""
+    if source.SUCCESS_VALUES:
+        data: dict[str, Any] = {
+            key: "fail" if isinstance(value, str) else 400
+            for key, value in source.SUCCESS_VALUES.items()
+        }
+    else:
+        data = {source.ERROR_KEYS[0]: True}
+
+    data[source.ERROR_MSG_KEYS[0] if source.ERROR_MSG_KEYS else "message"] = message
+    return data
+
+
+# Source settings that install() changes while a source is pointed at the server
+_OVERRIDDEN_SETTINGS: tuple[str, ...] = (
+    "API_URL",
+    "BATCH_URL",
+    "RATE_LIMIT",
+    "BATCH_RATE_LIMIT",
+    "REQUIRES_KEY",
+)
+
+
+class MockProviderServer(ThreadingHTTPServer):
+    """Serve provider-shaped responses for every remote lookup source on a local port.
+
+    Requests are routed by the source name in the first path segment, which install() adds when it
+    points each source at the server. The server runs on a background thread while it's used as a
+    context manager.
+    """
+
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        """Ignore clients hanging up early, as abandoned hedged requests and timeouts do."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __init__(self, scenario: MockScenario | None = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), _MockHandler)
+        self.scenario: MockScenario = scenario or MockScenario()
+        self.requests: Counter[tuple[str, str]] = Counter()  # By (source, outcome)
+        self._sources: dict[str, type[IPLookupSource]] = {}
+        self._random = random.Random(self.scenario.seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL the server is reachable at."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> None:
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-providers")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    @contextlib.contextmanager
+    def install(self, sources: Iterable[type[IPLookupSource]]) -> Generator[None]:
+        """Point lookup sources at the server for the duration of the block.
+
+        Each source's URLs are rewritten to the server, and its rate limits and API key
+        requirement are lifted. Sources the server doesn't emulate (such as the local database) are
+        left alone. Rate limit buckets are created on a source's first lookup, so install sources
+        before looking anything up with them.
+
+        Args:
+            sources: The lookup source classes to point at the server.
+        """
+        saved: list[tuple[type[IPLookupSource], dict[str, Any]]] = []
+        for source in sources:
+            if source.SOURCE_NAME not in PROVIDERS:
+                continue
+
+            overrides = {
+                "API_URL": self._rewrite_url(source.SOURCE_NAME, source.API_URL),
+                "BATCH_URL": source.BATCH_URL
+                and self._rewrite_url(source.SOURCE_NAME, source.BATCH_URL),
+                "RATE_LIMIT": None,
+                "BATCH_RATE_LIMIT": None,
+                "REQUIRES_KEY": False,
+            }
+            originals = {name: vars(source)[name] for name in overrides if name in vars(source)}
+            saved.append((source, originals))
+            for name, value in overrides.items():
+                setattr(source, name, value)
+            self._sources[source.SOURCE_NAME] = source
+
+        try:
+            yield
+        finally:
+            # Put back values the class defined itself, and drop overrides of inherited ones
+            for source, originals in saved:
+                for name in _OVERRIDDEN_SETTINGS:
+                    if name in originals:
+                        setattr(source, name, originals[name])
+                    else:
+                        delattr(source, name)
+                self._sources.pop(source.SOURCE_NAME, None)
+
+    def _rewrite_url(self, source_name: str, url: str) -> str:
+        """Rewrite a provider URL to the server, keeping its path and query."""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{source_name}{parts.path or '/'}{query}"
+
+    def get_source(self, source_name: str) -> type[IPLookupSource] | None:
+        """Get the source class pointed at the server under a name, if there is one."""
+        return self._sources.get(source_name)
+
+    def choose_failure(self) -> str:
+        """Pick how to answer the next request: "rate limited", "malformed", "slow", or "ok"."""
+        scenario = self.scenario
+        with self._lock:
+            draw = self._random.random()
+
+        for outcome, fraction in (
+            ("rate limited", scenario.rate_limit_fraction),
+            ("malformed", scenario.malformed_fraction),
+            ("slow", scenario.slow_fraction),
+        ):
+            if draw < fraction:
+                return outcome
+            draw -= fraction
+        return "ok"
+
+    def answer(self, source: type[IPLookupSource], ips: list[str], batch: bool) -> Any:
+        """Build the response body for a lookup of one or more addresses."""
+        source_name = source.SOURCE_NAME
+        provider = PROVIDERS[source_name]
+        entries: dict[str, dict[str, Any]] = {}
+        for ip in ips:
+            try:
+                ip_obj = ip_address(ip)
+            except ValueError:
+                entries[ip] = build_error(source, "invalid query")
+                continue
+
+            if isinstance(ip_obj, IPv6Address) and source_name in self.scenario.ipv6_unsupported:
+                entries[ip] = build_error(source, "IPv6 addresses are not supported")
+            else:
+                entries[ip] = build_response(source, ip_obj, self.scenario.full_responses)
+
+        if not batch:
+            return next(iter(entries.values()))
+        if provider.batch_shape == "dict":
+            return entries
+
+        listed = [{**entry, provider.batch_ip_key: ip} for ip, entry in entries.items()]
+        return {"results": listed} if provider.batch_shape == "results" else listed
+
+    def record(self, source_name: str, outcome: str) -> None:
+        """Count a request by source and outcome."""
+        with self._lock:
+            self.requests[source_name, outcome] += 1
+
+    def __enter__(self) -> MockProviderServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Route a request to the emulated provider named in its path."""
+
+    protocol_version = "HTTP/1.1"
+    server: MockProviderServer
+
+    # Send small responses right away instead of waiting on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Answer a single lookup, or a bulk lookup with comma-separated addresses in the URL."""
+        source_name, rest = self._split_path()
+        parts = urlsplit(rest)
+        candidates = [unquote(part) for part in parts.path.split("/") if part]
+        candidates.extend(value for _, value in parse_qsl(parts.query))
+
+        for candidate in candidates:
+            if "," in candidate:
+                self._respond(source_name, candidate.split(","), batch=True)
+                return
+        ips = [candidate for candidate in candidates if _is_ip(candidate)]
+        self._respond(source_name, ips[:1], batch=False)
+
+    def do_POST(self) -> None:
+        """Answer a bulk lookup with a JSON array of addresses in the body."""
+        source_name, _ = self._split_path()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            ips = [str(ip) for ip in json.loads(body)]
+        except (TypeError, ValueError):
+            ips = []
+        self._respond(source_name, ips, batch=True)
+
+    def _split_path(self) -> tuple[str, str]:
+        """Split the request path into the source name and the provider's own path."""
+        source_name, _, rest = self.path.lstrip("/").partition("/")
+        return unquote(source_name), f"/{rest}"
+
+    def _respond(self, source_name: str, ips: list[str], batch: bool) -> None:
+        """Send the provider's response, or one of the scenario's failures."""
+        server = self.server
+        source = server.get_source(source_name)
+        if source is None or not ips:
+            server.record(source_name, "not found")
+            self._send(404, b'{"error": true, "reason": "not found"}')
+            return
+
+        outcome = server.choose_failure()
+        server.record(source_name, outcome)
+        time.sleep(server.scenario.slow_latency if outcome == "slow" else server.scenario.latency)
+
+        if outcome == "rate limited":
+            self._send(429, b'{"message": "rate limited"}', server.scenario.retry_after)
+        elif outcome == "malformed":
+            self._send(200, b'{"ip": "' + ips[0].encode() + b'", "country": ')
+        else:
+            body = json.dumps(server.answer(source, ips, batch), ensure_ascii=False)
+            self._send(200, body.encode())
+
+    def _send(self, status: int, body: bytes, retry_after: int | None = None) -> None:
+        """Send a JSON response with a length so connections stay open for reuse."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keep request logging out of benchmark output."""
+
+
+def _is_ip(value: str) -> bool:
+    """Whether a string is an IP address."""
+    try:
+        ip_address(value)
+    except ValueError:
+        return False
+    return True
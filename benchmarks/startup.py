@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""Check that importing iplooker stays within its startup budget.
+
+Imports the CLI module in a fresh interpreter with `-X importtime` several times and compares the
+median cumulative import time against a budget. It also checks that the modules which are meant to
+load on demand (HTTP clients, asyncio, sqlite3, country data, output writers, and the provider
+sources) were not pulled in by the import, and that a cache-hit lookup can load every source without
+importing requests.
+
+Run it from the repository root:
+
+    python -m benchmarks.startup --budget 60
+
+Exits with status 1 if the budget is exceeded or a deferred module is imported eagerly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that should only be imported when a code path actually needs them
+DEFERRED_MODULES: tuple[str, ...] = (
+    "asyncio",
+    "httpx",
+    "pycountry",
+    "requests",
+    "sqlite3",
+    "urllib3",
+    "iplooker.sources.ipinfo_io",
+    "iplooker.batch_lookup",
+    "iplooker.output_writers",
+    "iplooker.range_db",
+    "iplooker.result_merger",
+)
+
+# Modules a cache-hit lookup still shouldn't need, even after loading every source
+CACHE_HIT_DEFERRED_MODULES: tuple[str, ...] = ("asyncio", "httpx", "requests", "urllib3")
+
+_LOADED_MODULES_SCRIPT = """
+import json, sys
+import iplooker.ip_looker
+loaded = set(sys.modules)
+iplooker.ip_looker.IPLooker.get_lookup_sources()
+print(json.dumps({"import": sorted(loaded), "sources": sorted(sys.modules)}))
+"""
+
+
+def measure_import_time(module: str) -> float:
+    """Import a module in a fresh interpreter and return its cumulative import time in ms.
+
+    Raises:
+        RuntimeError: If the interpreter didn't report an import time for the module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_subprocess_env(),
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in reversed(result.stderr.splitlines()):
+        _, _, columns = line.partition("import time:")
+        parts = [part.strip() for part in columns.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+
+    msg = f"No import time reported for {module}."
+    raise RuntimeError(msg)
+
+
+def find_eager_imports() -> list[str]:
+    """Get the deferred modules that were imported eagerly, and by which code path."""
+    result = subprocess.run(
+        [sys.executable, "-c", _LOADED_MODULES_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_subprocess_env(),
+    )
+    loaded = json.loads(result.stdout)
+
+    problems = [f"{name} (on import)" for name in DEFERRED_MODULES if name in set(loaded["import"])]
+    problems.extend(
+        f"{name} (when loading sources)"
+        for name in CACHE_HIT_DEFERRED_MODULES
+        if name in set(loaded["sources"])
+    )
+    return problems
+
+
+def _subprocess_env() -> dict[str, str]:
+    """Get the environment for child interpreters, with the source tree on the import path."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_PATH), env.get("PYTHONPATH")]))
+    return env
+
+
+def main() -> None:
+    """Measure startup time and report whether it's within budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=60.0, help="the import time budget in milliseconds"
+    )
+    parser.add_argument("--runs", type=int, default=7, help="the number of imports to measure")
+    parser.add_argument("--module", default="iplooker.ip_looker", help="the module to import")
+    args = parser.parse_args()
+
+    timings = [measure_import_time(args.module) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(
+        f"Imported {args.module} in {median:.1f} ms "
+        f"(median of {args.runs} run{'s' if args.runs != 1 else ''}, budget {args.budget:.0f} ms)"
+    )
+
+    failed = False
+    if median > args.budget:
+        print(f"Import time is {median - args.budget:.1f} ms over budget.")
+        failed = True
+
+    if eager := find_eager_imports():
+        print(f"Imported eagerly: {', '.join(eager)}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
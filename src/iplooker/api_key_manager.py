@@ -11,47 +11,105 @@ from __future__ import annotations
 import base64
 import hashlib
 import json
+import threading
+from itertools import cycle
 from pathlib import Path
+from typing import ClassVar
 
 from polykit import PolyEnv
 
 
 class APIKeyManager:
-    """Manages API keys with obfuscation to prevent casual inspection."""
+    """Manages API keys with obfuscation to prevent casual inspection.
+
+    Keys are resolved once per process and kept in memory, so repeated lookups never re-read the
+    key file or re-run the key derivation. Call invalidate() or reload() to pick up changes to the
+    key file or environment.
+    """
 
     _APP_SALT = "BuRdjP7teuDnGDrsJmwjnJBYc6FHV6vRF4xi6KEJybpyTZFVuvV2W9EFrbJ6fPLb"
 
+    _resolved_keys: ClassVar[dict[tuple[str, bool], str]] = {}
+    _encoded_keys: ClassVar[dict[str, str] | None] = None
+    _env: ClassVar[PolyEnv | None] = None
+    _lock: ClassVar[threading.RLock] = threading.RLock()
+
     @classmethod
     def get_key(cls, service: str, requires_user_key: bool = False) -> str:
         """Get API key for a service."""
+        cache_key = (service, requires_user_key)
+        if (key := cls._resolved_keys.get(cache_key)) is not None:
+            return key
+
+        with cls._lock:
+            if (key := cls._resolved_keys.get(cache_key)) is None:
+                key = cls._resolve_key(service, requires_user_key)
+                cls._resolved_keys[cache_key] = key
+            return key
+
+    @classmethod
+    def invalidate(cls, service: str | None = None) -> None:
+        """Forget resolved keys so they're looked up again on next use.
+
+        Args:
+            service: The service to forget the key for. If not provided, all keys are forgotten and
+                the key file and environment are read again on next use.
+        """
+        with cls._lock:
+            if service is None:
+                cls._resolved_keys.clear()
+                cls._encoded_keys = None
+                cls._env = None
+                return
+
+            cls._resolved_keys.pop((service, False), None)
+            cls._resolved_keys.pop((service, True), None)
+
+    @classmethod
+    def reload(cls) -> None:
+        """Forget all resolved keys and immediately re-read the key file."""
+        with cls._lock:
+            cls.invalidate()
+            cls._load_encoded_keys()
+
+    @classmethod
+    def _resolve_key(cls, service: str, requires_user_key: bool) -> str:
+        """Look up and decode the key for a service without consulting the in-memory cache."""
         # Handle services that require a user-supplied API key first
         if requires_user_key:
-            env = PolyEnv()
+            if cls._env is None:
+                cls._env = PolyEnv()
+
             var_name = f"IPLOOKER_API_KEY_{service.upper().replace('.', '')}"
             try:
-                if key := env.get(var_name):
+                if key := cls._env.get(var_name):
                     return key
             except (KeyError, ValueError):
                 pass
 
             return ""
 
-        # Load the encoded keys from file
-        keys_path = Path(__file__).parent / "encoded_keys.json"
-        try:
-            with Path(keys_path).open(encoding="utf-8") as f:
-                encoded_keys = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            encoded_keys = {}
-
         # Get and decode the key for the requested service
-        encoded = encoded_keys.get(service, "")
+        encoded = cls._load_encoded_keys().get(service, "")
         if encoded:
             return cls._decode_key(encoded, service)
 
         # Return empty string if no key is available
         return ""
 
+    @classmethod
+    def _load_encoded_keys(cls) -> dict[str, str]:
+        """Load the encoded keys from file, reading it only once."""
+        if cls._encoded_keys is None:
+            keys_path = Path(__file__).parent / "encoded_keys.json"
+            try:
+                with Path(keys_path).open(encoding="utf-8") as f:
+                    cls._encoded_keys = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                cls._encoded_keys = {}
+
+        return cls._encoded_keys
+
     @classmethod
     def _decode_key(cls, encoded: str, service: str) -> str:
         """Decode an obfuscated API key."""
@@ -60,15 +118,15 @@ class APIKeyManager:
             service_key = hashlib.pbkdf2_hmac(
                 "sha256", service.encode(), cls._APP_SALT.encode(), 10000
             ).hex()[:16]
+            key_bytes = [int(char, 16) for char in service_key]
 
             # Decode the base64 first
             decoded = base64.b64decode(encoded)
 
             # XOR with the service key
-            result = bytearray()
-            for i, byte in enumerate(decoded):
-                key_byte = int(service_key[i % len(service_key)], 16)
-                result.append(byte ^ key_byte)
+            result = bytes(
+                byte ^ key_byte for byte, key_byte in zip(decoded, cycle(key_bytes), strict=False)
+            )
 
             return result.decode("utf-8")
         except Exception:
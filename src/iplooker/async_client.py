@@ -0,0 +1,74 @@
+"""Shared async HTTP client for asyncio-based lookups.
+
+The async lookup API needs the optional httpx dependency, which can be installed with
+`pip install iplooker[async]`. One client is shared by every source on a given event loop, so
+concurrent lookups reuse the same connection pool.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, ClassVar
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    import asyncio
+
+    import httpx
+
+
+class AsyncClientPool:
+    """Manage one shared httpx.AsyncClient per event loop."""
+
+    # Maximum number of connections the shared client keeps open across all sources
+    MAX_CONNECTIONS: ClassVar[int] = 100
+
+    # Maximum number of idle keep-alive connections to hold on to
+    MAX_KEEPALIVE: ClassVar[int] = 32
+
+    _clients: ClassVar[WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]] = (
+        WeakKeyDictionary()
+    )
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Get the shared client for the running event loop, creating it on first use.
+
+        Must be called from a coroutine, since the client belongs to the running event loop.
+
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if client := cls._clients.get(loop):
+            return client
+
+        try:
+            import httpx
+        except ImportError as e:
+            msg = "Async lookups require httpx. Install it with: pip install iplooker[async]"
+            raise ImportError(msg) from e
+
+        with cls._lock:
+            if (client := cls._clients.get(loop)) is None:
+                limits = httpx.Limits(
+                    max_connections=cls.MAX_CONNECTIONS,
+                    max_keepalive_connections=cls.MAX_KEEPALIVE,
+                )
+                client = httpx.AsyncClient(limits=limits)
+                cls._clients[loop] = client
+            return client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared client for the running event loop, if there is one."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            client = cls._clients.pop(loop, None)
+        if client:
+            await client.aclose()
@@ -0,0 +1,313 @@
+"""Look up large numbers of IP addresses through a shared pipeline.
+
+Instead of running the whole lookup process once per address, the batch pipeline reads addresses
+lazily from any iterable of lines (such as a file or stdin), skips duplicates, and feeds them
+through a single shared thread pool. Only a bounded window of addresses is in flight at any time,
+and each address is yielded as soon as all of its sources have responded, so nothing but a compact
+set of already-seen addresses grows with the length of the input.
+
+Like single lookups, a batch can give up on the sources for an address early, once a quorum of
+them agree on the country or ASN or once a deadline passes since the address was sent out.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from ipaddress import ip_address as parse_ip_address
+from queue import Empty, SimpleQueue
+from typing import TYPE_CHECKING, ClassVar
+
+from iplooker.ip_formatter import IPFormatter
+from iplooker.ip_looker import IPLooker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Executor, Future
+
+    from iplooker.lookup_result import IPLookupResult
+    from iplooker.lookup_source import IPLookupSource
+
+    # Completed source lookups as (lookup ID, source index, (LookupResult or None, failure_reason))
+    _CompletionQueue = SimpleQueue[tuple[int, int, tuple[IPLookupResult | None, str]]]
+
+
+@dataclass
+class BatchLookupResult:
+    """The combined results of all sources for a single IP address in a batch."""
+
+    ip_address: str
+    results: list[IPLookupResult] = field(default_factory=list)
+    missing_sources: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _PendingLookup:
+    """Tracks the per-source outcomes for an IP address that is still in flight."""
+
+    ip_address: str
+    outcomes: list[tuple[IPLookupResult | None, str]]
+    remaining: int
+    started: float
+    finished: set[int] = field(default_factory=set)
+
+
+class BatchLookup:
+    """Look up many IP addresses using bounded concurrency across both IPs and sources."""
+
+    # Maximum number of source lookups running at the same time across all IPs
+    MAX_WORKERS: ClassVar[int] = 32
+
+    # Maximum number of IP addresses in flight at the same time
+    MAX_PENDING: ClassVar[int] = 16
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        sources: list[type[IPLookupSource]] | None = None,
+        executor: Executor | None = None,
+        quorum: int | None = None,
+        deadline: float | None = None,
+    ):
+        """Set up a batch pipeline.
+
+        Args:
+            max_workers: The number of threads to run source lookups on. Defaults to MAX_WORKERS.
+            max_pending: The number of addresses to keep in flight. Defaults to MAX_PENDING.
+            sources: The sources to query. Defaults to IPLooker's lookup sources.
+            executor: An executor to submit the lookups to, shared between runs. If not provided,
+                each run starts and shuts down a pool of max_workers threads.
+            quorum: The number of sources that must agree on the country or ASN of an address
+                before it's yielded without waiting for the rest.
+            deadline: The maximum number of seconds to wait for the sources of each address.
+        """
+        self.max_workers: int = max(1, max_workers or self.MAX_WORKERS)
+        self.max_pending: int = max(1, max_pending or self.MAX_PENDING)
+        self.sources: list[type[IPLookupSource]] = list(sources or IPLooker.get_lookup_sources())
+        self.executor: Executor | None = executor
+        self.quorum: int | None = quorum
+        self.deadline: float | None = deadline
+
+    def run(self, lines: Iterable[str]) -> Iterator[BatchLookupResult]:
+        """Look up every unique IP address in the input and yield results as they complete.
+
+        Results are yielded in completion order rather than input order, so a slow address never
+        holds up the ones behind it. Sources with a bulk endpoint get pending addresses grouped
+        into batches of up to their BATCH_SIZE, while other sources get one request per address.
+
+        With a quorum or deadline, an address is yielded as soon as enough of its sources agree or
+        its deadline passes. Sources that haven't answered by then are left to finish in the
+        background and are listed as skipped in the missing sources.
+
+        Args:
+            lines: An iterable of lines, each containing an IP address.
+
+        Yields:
+            A BatchLookupResult for each unique, valid IP address in the input.
+        """
+        ip_addresses = self.iter_unique_ips(lines)
+        completed: _CompletionQueue = SimpleQueue()
+        pending: dict[int, _PendingLookup] = {}
+        next_id = 0
+        exhausted = False
+
+        # Addresses waiting to be sent to each batch-capable source, by source index
+        batches: dict[int, list[tuple[int, str]]] = {
+            index: [] for index, source in enumerate(self.sources) if source.supports_batch()
+        }
+
+        # With batching, keep room for two full batches in flight and only top up once a whole
+        # batch worth of addresses has finished, so batches don't dwindle to one address each
+        largest_batch = max((self.sources[index].BATCH_SIZE for index in batches), default=1)
+        window = max(self.max_pending, 2 * largest_batch) if batches else self.max_pending
+        refill_below = window - largest_batch
+
+        with ExitStack() as stack:
+            executor = self.executor or stack.enter_context(
+                ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="iplooker-batch"
+                )
+            )
+            while True:
+                # Top up the window of in-flight addresses from the input
+                if len(pending) <= refill_below:
+                    while not exhausted and len(pending) < window:
+                        ip = next(ip_addresses, None)
+                        if ip is None:
+                            exhausted = True
+                            break
+
+                        pending[next_id] = _PendingLookup(
+                            ip_address=ip,
+                            outcomes=[(None, "")] * len(self.sources),
+                            remaining=len(self.sources),
+                            started=time.monotonic(),
+                        )
+                        self._dispatch(executor, completed, batches, next_id, ip)
+                        next_id += 1
+
+                    # Nothing more is added until a batch worth finishes, so send partial batches
+                    for index, batch in batches.items():
+                        if batch:
+                            self._submit_batch(
+                                executor, completed, self.sources[index], index, batch
+                            )
+                            batches[index] = []
+
+                if not pending:
+                    return
+
+                # Wait for the next source to finish and yield the address once it's done
+                if item := self._wait_for_outcome(completed, pending):
+                    yield item
+
+    def _wait_for_outcome(
+        self, completed: _CompletionQueue, pending: dict[int, _PendingLookup]
+    ) -> BatchLookupResult | None:
+        """Record the next source outcome, or wait for the oldest address's deadline.
+
+        Returns:
+            The combined result for an address that no longer needs to wait for its sources, if
+            the outcome finished one.
+        """
+        try:
+            lookup_id, index, outcome = completed.get(timeout=self._time_left(pending))
+        except Empty:
+            return self._finish(pending.pop(next(iter(pending))), "skipped (deadline)")
+
+        # Outcomes for addresses that were already yielded early are dropped
+        if (lookup := pending.get(lookup_id)) is None:
+            return None
+
+        lookup.outcomes[index] = outcome
+        lookup.finished.add(index)
+        lookup.remaining -= 1
+
+        if lookup.remaining == 0:
+            return self._finish(pending.pop(lookup_id))
+        if self.quorum and IPLooker.has_quorum(
+            [result for result, _ in lookup.outcomes], self.quorum, IPFormatter(lookup.ip_address)
+        ):
+            return self._finish(pending.pop(lookup_id), "skipped (quorum reached)")
+        return None
+
+    def _time_left(self, pending: dict[int, _PendingLookup]) -> float | None:
+        """Get the seconds until the oldest pending address's deadline, or None without one."""
+        if self.deadline is None:
+            return None
+
+        # Addresses are added in order, so the first one still pending is the oldest
+        oldest = next(iter(pending.values()))
+        return max(0.0, oldest.started + self.deadline - time.monotonic())
+
+    def _finish(self, lookup: _PendingLookup, skip_reason: str = "") -> BatchLookupResult:
+        """Combine an address's outcomes, marking sources that haven't answered as skipped."""
+        if skip_reason:
+            for index in range(len(self.sources)):
+                if index not in lookup.finished:
+                    lookup.outcomes[index] = (None, skip_reason)
+
+        results, missing_sources = IPLooker.collect_outcomes(self.sources, lookup.outcomes)
+        return BatchLookupResult(lookup.ip_address, results, missing_sources)
+
+    def _dispatch(
+        self,
+        executor: Executor,
+        completed: _CompletionQueue,
+        batches: dict[int, list[tuple[int, str]]],
+        lookup_id: int,
+        ip: str,
+    ) -> None:
+        """Send an address to every source, adding it to the batch for batch-capable sources."""
+        for index, source_class in enumerate(self.sources):
+            if index not in batches:
+                self._submit_single(executor, completed, source_class, index, lookup_id, ip)
+                continue
+
+            batch = batches[index]
+            batch.append((lookup_id, ip))
+            if len(batch) >= source_class.BATCH_SIZE:
+                self._submit_batch(executor, completed, source_class, index, batch)
+                batches[index] = []
+
+    @staticmethod
+    def _submit_single(
+        executor: Executor,
+        completed: _CompletionQueue,
+        source_class: type[IPLookupSource],
+        index: int,
+        lookup_id: int,
+        ip: str,
+    ) -> None:
+        """Submit a lookup of one address and report its outcome to the completion queue."""
+
+        def report(future: Future[tuple[IPLookupResult | None, str]]) -> None:
+            try:
+                outcome = future.result()
+            except Exception:
+                outcome = (None, "lookup error")
+            completed.put((lookup_id, index, outcome))
+
+        executor.submit(source_class.lookup_with_reason, ip).add_done_callback(report)
+
+    @staticmethod
+    def _submit_batch(
+        executor: Executor,
+        completed: _CompletionQueue,
+        source_class: type[IPLookupSource],
+        index: int,
+        batch: list[tuple[int, str]],
+    ) -> None:
+        """Submit a bulk lookup of several addresses and report each outcome separately."""
+        lookup_ids = [lookup_id for lookup_id, _ in batch]
+        ips = [ip for _, ip in batch]
+
+        def report(future: Future[list[tuple[IPLookupResult | None, str]]]) -> None:
+            try:
+                outcomes = future.result()
+            except Exception:
+                outcomes = [(None, "lookup error")] * len(lookup_ids)
+            for lookup_id, outcome in zip(lookup_ids, outcomes, strict=True):
+                completed.put((lookup_id, index, outcome))
+
+        executor.submit(source_class.lookup_batch_with_reason, ips).add_done_callback(report)
+
+    @staticmethod
+    def iter_unique_ips(lines: Iterable[str]) -> Iterator[str]:
+        """Parse IP addresses from lines of input, skipping blanks, comments, and duplicates.
+
+        Addresses are normalized before de-duplication so that different spellings of the same
+        IPv6 address count as one. Seen addresses are tracked as packed integers to keep the memory
+        cost per unique address small.
+
+        Args:
+            lines: An iterable of lines, each containing an IP address as its first field.
+
+        Yields:
+            Each unique, valid IP address in its normalized form.
+        """
+        seen: set[int] = set()
+
+        for line in lines:
+            text = line.strip()
+            if not text or text.startswith("#"):
+                continue
+
+            candidate = text.split()[0]
+            try:
+                ip_obj = parse_ip_address(candidate)
+            except ValueError:
+                print(f"Skipping invalid IP address: {candidate}", file=sys.stderr)
+                continue
+
+            # Fold the version into the key so IPv4 and IPv6 integers can never collide
+            key = int(ip_obj) << 1 | (ip_obj.version == 6)
+            if key in seen:
+                continue
+
+            seen.add(key)
+            yield str(ip_obj)
@@ -0,0 +1,254 @@
+"""Per-source circuit breakers that skip providers which keep failing.
+
+Each lookup source gets a circuit breaker shared by every thread and coroutine in the process. The
+circuit starts closed, and requests go through as usual. After FAILURE_THRESHOLD consecutive failed
+requests (connection errors, timeouts, rate limiting, server errors, or malformed responses), or a
+single authentication error (HTTP 401, 402, or 403, which usually means the key is invalid or its
+quota is used up), the circuit opens and lookups skip the source instantly instead of paying for
+another failed request. Once the cool-down has passed, the circuit goes half-open and lets a single
+probe request through: if it succeeds the circuit closes, and if it fails the circuit opens again.
+
+Open circuits can optionally be persisted to a small JSON file in the cache directory, so a provider
+that's down or a key that's exhausted is skipped from the start of the next run too.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# HTTP status codes that mean the API key was rejected or has run out
+AUTH_ERROR_CODES: frozenset[int] = frozenset({401, 402, 403})
+
+
+class CircuitBreaker:
+    """Track consecutive failures for one source and decide whether to send requests to it."""
+
+    def __init__(self, name: str, failure_threshold: int, cooldown: float, auth_cooldown: float):
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self.auth_cooldown: float = auth_cooldown
+
+        self.state: str = CLOSED
+        self.failures: int = 0
+        self.last_failure: str = ""
+        self.opened_at: float = 0.0  # Wall-clock time, so it can be compared across runs
+        self.open_for: float = 0.0
+        self._probe_started: float | None = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now.
+
+        An open circuit turns half-open once its cool-down has passed, and then allows one probe
+        request at a time. If a probe never reports back, another is allowed after a cool-down.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            now = time.time()
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_for:
+                    return False
+                self.state = HALF_OPEN
+            elif self._probe_started is not None and now - self._probe_started < self.cooldown:
+                return False
+
+            self._probe_started = now
+            return True
+
+    def record(self, error_reason: str) -> bool:
+        """Count the outcome of a request and open or close the circuit as needed.
+
+        Only failures that say something about the provider count. Errors about the address
+        itself, such as a reserved range or a missing entry in a bulk response, are ignored.
+
+        Args:
+            error_reason: The request's failure reason, or an empty string if it succeeded.
+
+        Returns:
+            True if the circuit changed between open and closed.
+        """
+        kind = self.classify(error_reason)
+        if kind is None:
+            return False
+
+        with self._lock:
+            if kind == "ok":
+                changed = self.state != CLOSED
+                self.state = CLOSED
+                self.failures = 0
+                self._probe_started = None
+                return changed
+
+            self.failures += 1
+            self.last_failure = error_reason
+            if kind == "auth":
+                return self._open(self.auth_cooldown)
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                return self._open(self.cooldown)
+            return False
+
+    def _open(self, seconds: float) -> bool:
+        """Open the circuit for a number of seconds. The lock must be held."""
+        changed = self.state != OPEN
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.open_for = seconds
+        self._probe_started = None
+        return changed
+
+    @staticmethod
+    def classify(error_reason: str) -> str | None:
+        """Classify a request's failure reason as "ok", "auth", "failure", or None to ignore it."""
+        if not error_reason:
+            return "ok"
+
+        if error_reason.startswith("API error: "):
+            status = error_reason.removeprefix("API error: ")
+            if not status.isdigit():
+                return "failure"
+            if int(status) in AUTH_ERROR_CODES:
+                return "auth"
+            return "failure" if int(status) >= 500 else None
+
+        if error_reason in {"request error", "rate limited", "JSON decode error"}:
+            return "failure"
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert an open circuit to a dict for saving."""
+        return {
+            "opened_at": self.opened_at,
+            "open_for": self.open_for,
+            "failures": self.failures,
+            "last_failure": self.last_failure,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Reopen a circuit saved by a previous run, unless its cool-down is already over."""
+        with self._lock:
+            self.opened_at = float(data["opened_at"])
+            self.open_for = float(data["open_for"])
+            self.failures = int(data.get("failures", 0))
+            self.last_failure = str(data.get("last_failure", ""))
+            self.state = OPEN
+
+
+class CircuitBreakers:
+    """Keep a shared circuit breaker per lookup source, optionally persisted between runs."""
+
+    # Consecutive failures that open a source's circuit
+    FAILURE_THRESHOLD: ClassVar[int] = 5
+
+    # How long an open circuit skips a source before probing it again, in seconds
+    COOLDOWN: ClassVar[float] = 60.0
+
+    # How long to skip a source after an authentication or quota error, in seconds
+    AUTH_COOLDOWN: ClassVar[float] = 15 * 60.0
+
+    _enabled: ClassVar[bool] = True
+    _path: ClassVar[Path | None] = None
+    _breakers: ClassVar[dict[str, CircuitBreaker]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def configure(
+        cls, enabled: bool = True, persist: bool = False, path: Path | None = None
+    ) -> None:
+        """Configure the circuit breakers used by all lookup sources.
+
+        Args:
+            enabled: Whether to skip sources whose circuit is open.
+            persist: Whether to save open circuits so later runs skip those sources too.
+            path: The file to save open circuits in. Defaults to the user cache directory.
+        """
+        with cls._lock:
+            cls._enabled = enabled
+            cls._breakers = {}
+            cls._path = (path or cls.default_path()) if enabled and persist else None
+            if cls._path is not None:
+                cls._load(cls._path)
+
+    @classmethod
+    def default_path(cls) -> Path:
+        """Get the default location of the saved circuits, next to the result cache."""
+        from iplooker.result_cache import ResultCache
+
+        return ResultCache.default_path().with_name("circuits.json")
+
+    @classmethod
+    def get(cls, name: str) -> CircuitBreaker | None:
+        """Get the shared circuit breaker for a source, or None if circuit breakers are disabled."""
+        if not cls._enabled:
+            return None
+        if breaker := cls._breakers.get(name):
+            return breaker
+
+        with cls._lock:
+            if (breaker := cls._breakers.get(name)) is None:
+                breaker = cls._breakers[name] = cls._create(name)
+            return breaker
+
+    @classmethod
+    def record(cls, name: str, error_reason: str) -> None:
+        """Count the outcome of a request to a source, saving the circuits if one opens or closes.
+
+        Args:
+            name: The name of the source.
+            error_reason: The request's failure reason, or an empty string if it succeeded.
+        """
+        if (breaker := cls.get(name)) and breaker.record(error_reason) and cls._path is not None:
+            cls._save(cls._path)
+
+    @classmethod
+    def _create(cls, name: str) -> CircuitBreaker:
+        """Create a circuit breaker with the configured thresholds."""
+        return CircuitBreaker(name, cls.FAILURE_THRESHOLD, cls.COOLDOWN, cls.AUTH_COOLDOWN)
+
+    @classmethod
+    def _load(cls, path: Path) -> None:
+        """Restore the circuits that were still open at the end of a previous run."""
+        try:
+            saved = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for name, data in saved.items():
+            try:
+                if now - float(data["opened_at"]) < float(data["open_for"]):
+                    breaker = cls._breakers[name] = cls._create(name)
+                    breaker.restore(data)
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    @classmethod
+    def _save(cls, path: Path) -> None:
+        """Write out every open circuit, replacing the file in one step."""
+        with cls._lock:
+            circuits = {
+                name: breaker.to_dict()
+                for name, breaker in cls._breakers.items()
+                if breaker.state != CLOSED
+            }
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(circuits, indent=2), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError:
+            return
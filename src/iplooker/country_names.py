@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""Precomputed table of country codes and names mapped to a canonical country name.
+
+The table covers the ISO 3166 alpha-2 and alpha-3 codes, short names, official names, and common
+names for every country, keyed in lowercase. It's generated from pycountry ahead of time and shipped
+as country_names.json, so formatting results never has to import pycountry.
+
+To regenerate it after updating pycountry:
+
+    python -m iplooker.country_names
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+TABLE_PATH: Path = Path(__file__).parent / "country_names.json"
+
+# The United States is always shown by its abbreviation
+USA_CANONICAL_NAME = "US"
+
+
+def load_country_names(path: Path = TABLE_PATH) -> Mapping[str, str]:
+    """Load the country name table as a read-only mapping of lowercase alias to canonical name."""
+    with path.open(encoding="utf-8") as f:
+        return MappingProxyType(json.load(f))
+
+
+def build_country_names() -> dict[str, str]:
+    """Build the country name table from pycountry.
+
+    Returns:
+        A dict mapping each lowercase code and name to the country's canonical name, sorted by key.
+    """
+    import pycountry
+
+    table: dict[str, str] = {}
+    for country in pycountry.countries:
+        # Show countries by their common name where they have one, such as "Taiwan" or "Vietnam"
+        if country.alpha_2 == "US":
+            canonical = USA_CANONICAL_NAME
+        else:
+            canonical = getattr(country, "common_name", None) or country.name
+        aliases = (
+            country.alpha_2,
+            country.alpha_3,
+            country.name,
+            getattr(country, "official_name", None),
+            getattr(country, "common_name", None),
+        )
+        for alias in aliases:
+            if alias:
+                table.setdefault(alias.lower(), canonical)
+
+    return dict(sorted(table.items()))
+
+
+def main() -> None:
+    """Regenerate the shipped country name table."""
+    table = build_country_names()
+    with TABLE_PATH.open("w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=0)
+        f.write("\n")
+    print(f"Wrote {len(table)} country name{'s' if len(table) != 1 else ''} to {TABLE_PATH}")
+
+
+COUNTRY_NAMES: Mapping[str, str] = load_country_names()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Declarative field maps for parsing provider responses.
+
+Most providers' responses can be described by where each IPLookupResult field lives in the JSON,
+so instead of hand-writing a parser, a source declares a FIELD_MAP:
+
+    FIELD_MAP = {
+        "country": "location.country.name",
+        "org": ("connection.organization", "company.name"),
+        "asn": "connection.asn|asn",
+        "vpn_service": "vpn.service if vpn.is_vpn",
+    }
+
+Each field maps to a dotted path into the response, or a tuple of paths to try in order until one
+gives a value other than None or an empty string. A path can end with `|transform` to pass the value
+through one of the TRANSFORMS, such as normalizing an ASN to "AS15169" or splitting the "AS15169
+Google LLC" strings some providers send, and with `if path` to only use it when another value in
+the response is truthy. Paths only descend through objects, so a missing key or an unexpected type
+anywhere along a path gives None rather than an error.
+
+When a source class is defined, its field map is compiled into Python code specialized for that
+map: every object along the paths is fetched once, then each field is picked from those values and
+the result is built in one call. The same code is also compiled into a loop, for parsing many
+responses at once.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from iplooker.lookup_result import RESULT_FIELDS, IPLookupResult
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+    from ipaddress import IPv4Address, IPv6Address
+
+    # A field map as declared by a source: field name -> path, or paths to try in order
+    FieldMap = Mapping[str, str | tuple[str, ...]]
+
+# A dotted path with an optional transform and condition
+_PATH_PATTERN = re.compile(r"(?P<path>[^|\s]+)(?:\|(?P<transform>\w+))?(?:\s+if\s+(?P<when>\S+))?")
+
+
+def normalize_asn(value: Any) -> str | None:
+    """Format an AS number like "AS15169", whether it's given as 15169, "15169", or "AS15169".
+
+    Empty values, and values that aren't a string or an integer, give None.
+    """
+    if not value or isinstance(value, bool) or not isinstance(value, (str, int)):
+        return None
+    text = str(value)
+    return text if text.startswith("AS") else f"AS{text}"
+
+
+def asn_number(value: Any) -> str | None:
+    """Get the ASN from a string like "AS15169 Google LLC", or None if it doesn't start with one."""
+    return split_asn(value)[0]
+
+
+def asn_name(value: Any) -> str | None:
+    """Get the name from a string like "AS15169 Google LLC", or None if it has no ASN and name."""
+    return split_asn(value)[1]
+
+
+def org_name(value: Any) -> str | None:
+    """Get the name from a string like "AS15169 Google LLC", or the whole string without an ASN."""
+    return split_asn(value)[2]
+
+
+def text_only(value: Any) -> str | None:
+    """Keep a value only if it's a non-empty string, for fields that are sometimes objects."""
+    return value if isinstance(value, str) and value else None
+
+
+def or_none(value: Any) -> Any:
+    """Turn empty values such as "" into None."""
+    return value or None
+
+
+def split_asn(value: Any) -> tuple[str | None, str | None, str | None]:
+    """Split a string like "AS15169 Google LLC" into its ASN, its name, and the organization.
+
+    The organization is the name if there's an ASN, or the whole string if there isn't.
+    """
+    if not isinstance(value, str):
+        return None, None, None
+    number, _, name = value.partition(" ")
+    if len(number) < 3 or number[:2].upper() != "AS" or not number[2:].isdigit():
+        return None, None, value or None
+    label = name.strip() or None
+    return number, label, label or value
+
+
+# Transforms available to field maps, by name
+TRANSFORMS: dict[str, Callable[[Any], Any]] = {
+    "asn": normalize_asn,
+    "asn_number": asn_number,
+    "asn_name": asn_name,
+    "org_name": org_name,
+    "str": text_only,
+    "or_none": or_none,
+}
+
+# Transforms that take one part of what a split function returns, as (function, index), so the
+# compiled parsers split a value that several fields use only once
+SPLIT_TRANSFORMS: dict[str, tuple[Callable[[Any], tuple[Any, ...]], int]] = {
+    "asn_number": (split_asn, 0),
+    "asn_name": (split_asn, 1),
+    "org_name": (split_asn, 2),
+}
+
+
+class FieldExtractor(NamedTuple):
+    """Parsers compiled from a field map.
+
+    Attributes:
+        extract: Builds the result for one response: extract(data, ip_obj, source_name).
+        extract_many: Builds the results for many (data, ip_obj) pairs in one call:
+            extract_many(rows, source_name).
+        source: The generated Python source of both, for debugging.
+    """
+
+    extract: Callable[[dict[str, Any], IPv4Address | IPv6Address, str], IPLookupResult]
+    extract_many: Callable[
+        [Iterable[tuple[dict[str, Any], IPv4Address | IPv6Address]], str], list[IPLookupResult]
+    ]
+    source: str
+
+
+def compile_field_map(field_map: FieldMap, name: str = "source") -> FieldExtractor:
+    """Compile a field map into parser functions specialized for it.
+
+    Args:
+        field_map: Maps IPLookupResult field names to a path or a tuple of paths.
+        name: A name for the compiled functions, shown in tracebacks.
+
+    Returns:
+        The compiled parsers.
+
+    Raises:
+        ValueError: If the map names an unknown field or transform, or a path can't be parsed.
+    """
+    compiler = _Compiler()
+    body: list[str] = []
+    values: dict[str, str] = {}
+    for field_name, spec in field_map.items():
+        if field_name not in RESULT_FIELDS or field_name in {"ip", "source"}:
+            msg = f"Unknown IPLookupResult field in field map: {field_name}"
+            raise ValueError(msg)
+        lines, values[field_name] = compiler.compile_field(
+            field_name, (spec,) if isinstance(spec, str) else spec
+        )
+        body.extend(lines)
+
+    # Pass fields positionally, stopping at the last one in the map since the rest default to None
+    last = max((RESULT_FIELDS.index(field) for field in values), default=1)
+    arguments = ", ".join([
+        "ip_obj",
+        "source_name",
+        *(values.get(field, "None") for field in RESULT_FIELDS[2 : last + 1]),
+    ])
+    lines = compiler.node_lines() + body
+    source = "\n".join([
+        "def extract(data, ip_obj, source_name):",
+        *(f"    {line}" for line in lines),
+        f"    return IPLookupResult({arguments})",
+        "",
+        "def extract_many(rows, source_name):",
+        "    results = []",
+        "    append = results.append",
+        "    for data, ip_obj in rows:",
+        *(f"        {line}" for line in lines),
+        f"        append(IPLookupResult({arguments}))",
+        "    return results",
+    ])
+
+    namespace: dict[str, Any] = {"IPLookupResult": IPLookupResult, **compiler.globals}
+    exec(compile(source, f"<field map for {name}>", "exec"), namespace)  # noqa: S102
+    return FieldExtractor(namespace["extract"], namespace["extract_many"], source)
+
+
+class _Node:
+    """A value at a path in the response, with the values below it that the field map uses."""
+
+    def __init__(self, variable: str):
+        self.variable: str = variable
+        self.children: dict[str, _Node] = {}
+
+    def descendants(self) -> list[str]:
+        """Get the variables of every value below this one."""
+        return [
+            variable
+            for child in self.children.values()
+            for variable in (child.variable, *child.descendants())
+        ]
+
+
+class _Compiler:
+    """Generate code that fetches each value along the paths of a field map once.
+
+    Each object is checked to be a dictionary once, before fetching every key the map uses from it,
+    rather than once per field.
+    """
+
+    def __init__(self):
+        self.globals: dict[str, Any] = {}
+        self._root: _Node = _Node("data")
+        self._nodes: dict[str, _Node] = {}
+        self._calls: dict[str, str] = {}
+        self._call_lines: list[str] = []
+
+    def compile_field(self, field_name: str, specs: tuple[str, ...]) -> tuple[list[str], str]:
+        """Generate the statements and expression that give a field the first value found.
+
+        Returns:
+            The statements to run, and the expression for the field's value once they have run.
+        """
+        expression = self._expression(specs[0], first=True)
+
+        if len(specs) == 1:
+            return [], expression
+
+        target = f"f_{field_name}"
+        lines = [f"{target} = {expression}"]
+        for spec in specs[1:]:
+            lines.extend((
+                f'if {target} is None or {target} == "":',
+                f"    {target} = {self._expression(spec)}",
+            ))
+        return lines, target
+
+    def node_lines(self) -> list[str]:
+        """Generate the statements that fetch every value the fields start from."""
+        return self._fetch_children(self._root) + self._call_lines
+
+    def _fetch_children(self, node: _Node) -> list[str]:
+        """Generate the statements that fetch the values below a node known to be a dictionary."""
+        lines = []
+        for key, child in node.children.items():
+            lines.append(f"{child.variable} = {node.variable}.get({key!r})")
+            if child.children:
+                lines.append(f"if isinstance({child.variable}, dict):")
+                lines.extend(f"    {line}" for line in self._fetch_children(child))
+                lines.extend(("else:", f"    {' = '.join(child.descendants())} = None"))
+        return lines
+
+    def _expression(self, spec: str, first: bool = False) -> str:
+        """Generate the expression for one path, with its transform and condition.
+
+        A first choice is always evaluated, so its transform is run once before the fields are
+        chosen and shared by every field that uses it.
+
+        Raises:
+            ValueError: If the path can't be parsed or names an unknown transform.
+        """
+        if (match := _PATH_PATTERN.fullmatch(spec.strip())) is None:
+            msg = f"Invalid field map path: {spec!r}"
+            raise ValueError(msg)
+
+        expression = self._node(match["path"]).variable
+        if transform := match["transform"]:
+            if transform not in TRANSFORMS:
+                msg = f"Unknown field map transform: {transform}"
+                raise ValueError(msg)
+            if first and transform in SPLIT_TRANSFORMS:
+                function, index = SPLIT_TRANSFORMS[transform]
+                split = self._shared_call(function, expression)
+                expression = f"{split}[{index}]"
+            elif first:
+                expression = self._shared_call(TRANSFORMS[transform], expression)
+            else:
+                function = TRANSFORMS[transform]
+                self.globals[f"_{function.__name__}"] = function
+                expression = f"_{function.__name__}({expression})"
+        if when := match["when"]:
+            expression = f"({expression} if {self._node(when).variable} else None)"
+        return expression
+
+    def _shared_call(self, function: Callable[[Any], Any], argument: str) -> str:
+        """Get a variable holding a function's result, calling it the first time it's needed."""
+        call = f"_{function.__name__}({argument})"
+        if (variable := self._calls.get(call)) is None:
+            self.globals[f"_{function.__name__}"] = function
+            variable = self._calls[call] = f"t{len(self._calls)}"
+            self._call_lines.append(f"{variable} = {call}")
+        return variable
+
+    def _node(self, path: str) -> _Node:
+        """Get the node for the value at a path, adding it and its parents the first time."""
+        if (node := self._nodes.get(path)) is not None:
+            return node
+
+        parent_path, _, key = path.rpartition(".")
+        parent = self._node(parent_path) if parent_path else self._root
+        node = self._nodes[path] = parent.children[key] = _Node(f"n{len(self._nodes)}")
+        return node
@@ -0,0 +1,107 @@
+"""Shared, connection-pooled HTTP sessions for lookup sources.
+
+Each lookup source gets its own long-lived requests session with keep-alive connections, so repeated
+lookups against the same provider reuse an open TCP/TLS connection instead of paying for a new
+handshake every time. Sessions are created on first use and shared by every thread in the process.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    import requests
+
+
+class SessionPool:
+    """Manage one pooled HTTP session per lookup source."""
+
+    # Default number of keep-alive connections to hold open per source
+    POOL_SIZE: ClassVar[int] = 16
+
+    # Default number of retries for connection errors and transient server errors on GET requests
+    MAX_RETRIES: ClassVar[int] = 2
+
+    # Backoff factor between retries (0.2 means 0.2s, 0.4s, 0.8s, ...)
+    BACKOFF_FACTOR: ClassVar[float] = 0.2
+
+    # Server error statuses worth retrying (rate limits are left to the caller)
+    RETRY_STATUSES: ClassVar[frozenset[int]] = frozenset({502, 503, 504})
+
+    _sessions: ClassVar[dict[str, requests.Session]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def get_session(
+        cls, name: str, pool_size: int | None = None, max_retries: int | None = None
+    ) -> requests.Session:
+        """Get the shared session for a source, creating it on first use.
+
+        Pool size and retry settings only take effect when the session is first created. Call
+        close() for the source to have them applied again.
+
+        Args:
+            name: The name of the source the session belongs to.
+            pool_size: The number of connections to keep open. Defaults to POOL_SIZE.
+            max_retries: The number of retries for failed connections. Defaults to MAX_RETRIES.
+
+        Returns:
+            The requests session shared by all lookups for the source.
+        """
+        if session := cls._sessions.get(name):
+            return session
+
+        with cls._lock:
+            if session := cls._sessions.get(name):
+                return session
+
+            session = cls._create_session(
+                pool_size if pool_size is not None else cls.POOL_SIZE,
+                max_retries if max_retries is not None else cls.MAX_RETRIES,
+            )
+            cls._sessions[name] = session
+            return session
+
+    @classmethod
+    def _create_session(cls, pool_size: int, max_retries: int) -> requests.Session:
+        """Create a session with a pooled adapter and retry policy mounted for HTTP and HTTPS."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Read errors are raised as they are rather than retried, so a stalled provider costs one
+        # timeout and is still reported as a timeout. Bulk POST requests may not be safe to send
+        # twice, so they only retry connections that failed before anything was sent
+        retry = Retry(
+            total=max_retries,
+            read=False,
+            backoff_factor=cls.BACKOFF_FACTOR,
+            status_forcelist=cls.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+            respect_retry_after_header=False,  # Rate limit responses are handled per source
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def close(cls, name: str) -> None:
+        """Close the session for a source and release its connections."""
+        with cls._lock:
+            session = cls._sessions.pop(name, None)
+        if session:
+            session.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every session and release all pooled connections."""
+        with cls._lock:
+            sessions = list(cls._sessions.values())
+            cls._sessions.clear()
+        for session in sessions:
+            session.close()
@@ -1,41 +1,75 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from types import MappingProxyType
 from typing import TYPE_CHECKING, ClassVar
 
-import pycountry
 from polykit.text import color
 
+from iplooker.country_names import COUNTRY_NAMES
+
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from iplooker.lookup_result import IPLookupResult
+    from iplooker.result_merger import MergedResult
+
+
+# Variations of Washington, D.C. region names to be standardized
+REGION_ALIASES: Mapping[str, str] = MappingProxyType(
+    dict.fromkeys(("washington, d.c.", "district of columbia", "d.c.", "dc"), "DC")
+)
+
+# Variations of city names to be standardized
+CITY_ALIASES: Mapping[str, str] = MappingProxyType({
+    "washington d.c.": "Washington",
+    "washington d.c. (northeast washington)": "Washington",
+    "washington d.c. (northwest washington)": "Washington",
+    "new york city": "New York",
+})
+
+# Placeholder values some sources return instead of leaving the field empty
+UNKNOWN_ISP: frozenset[str] = frozenset({"Unknown ISP", ""})
+UNKNOWN_ORG: frozenset[str] = frozenset({"Unknown Org", ""})
+
+
+@lru_cache(maxsize=4096)
+def _standardize_country(country: str) -> str:
+    return COUNTRY_NAMES.get(country.lower(), country)
+
+
+@lru_cache(maxsize=16384)
+def _standardize_region(region: str) -> str:
+    return REGION_ALIASES.get(region.lower(), region)
+
+
+@lru_cache(maxsize=65536)
+def _standardize_city(city: str) -> str:
+    return CITY_ALIASES.get(city.lower(), city)
+
+
+@lru_cache(maxsize=65536)
+def _standardize_isp_or_org(name: str) -> str:
+    return "Comcast" if "comcast" in name.lower() else name
+
+
+@lru_cache(maxsize=65536)
+def _standardize_isp_and_org(isp: str, org: str) -> str | None:
+    standard_isp = _standardize_isp_or_org(isp)
+    standard_org = _standardize_isp_or_org(org)
+
+    if standard_isp not in UNKNOWN_ISP:
+        if standard_org not in UNKNOWN_ORG:
+            return (
+                standard_isp if isp.lower() == org.lower() else f"{standard_isp} / {standard_org}"
+            )
+        return standard_isp
+    return standard_org if standard_org not in UNKNOWN_ORG else None
 
 
 class IPFormatter:
     """Format IP results returned by lookups."""
 
-    # Variations of United States country names to be standardized
-    USA_NAMES: ClassVar[set[str]] = {
-        "us",
-        "usa",
-        "united states",
-        "united states of america",
-    }
-
-    # Variations of Washington, D.C. region names to be standardized
-    REGION_NAMES: ClassVar[set[str]] = {
-        "washington, d.c.",
-        "district of columbia",
-        "d.c.",
-        "dc",
-    }
-
-    # Variations of city names to be standardized
-    CITY_NAMES: ClassVar[set[str]] = {
-        "washington d.c.",
-        "washington d.c. (northeast washington)",
-        "washington d.c. (northwest washington)",
-        "new york city",
-    }
-
     # Omit these values entirely if they start with "Unknown"
     OMIT_IF_UNKNOWN: ClassVar[set[str]] = {"region", "isp", "org"}
 
@@ -131,36 +165,24 @@ class IPFormatter:
             if security:
                 print(f"  {color('  Security:', 'yellow')} {security}")
 
+    def print_merged_result(
+        self, merged: MergedResult, show_asn: bool = False, show_range: bool = False
+    ) -> None:
+        """Print the consensus result across all sources, with its confidence."""
+        formatted = self.format_lookup_result(
+            merged.result, show_asn=show_asn, show_range=show_range
+        )
+        formatted["source"] = f"Consensus ({merged.confidence:.0%} agreement)"
+        self.print_consolidated_results([formatted])
+
     def standardize_country(self, country: str) -> str:
-        """Standardize the country name."""
-        if len(country) == 2 and country.upper() != "US":
-            try:
-                country_obj = pycountry.countries.get(alpha_2=country.upper())
-                return country_obj.name if country_obj is not None else country
-            except (AttributeError, KeyError):
-                return country
-        return "US" if country.lower() in self.USA_NAMES else country
+        """Standardize the country name, mapping country codes and alternate names to one name."""
+        return _standardize_country(country)
 
     def standardize_region_and_city(self, region: str, city: str) -> tuple[str, str]:
         """Standardize the region and city names."""
-        if region.lower() in self.REGION_NAMES:
-            region = "DC"
-        if city.lower() in self.CITY_NAMES:
-            city = "Washington" if "washington" in city.lower() else "New York"
-        return region, city
+        return _standardize_region(region), _standardize_city(city)
 
     def standardize_isp_and_org(self, isp: str, org: str) -> str | None:
         """Standardize the ISP and organization names."""
-        original_isp = isp
-        original_org = org
-
-        if "comcast" in isp.lower():
-            isp = "Comcast"
-        if "comcast" in org.lower():
-            org = "Comcast"
-
-        if isp and isp not in {"Unknown ISP", ""}:
-            if org and org not in {"Unknown Org", ""}:
-                return isp if original_isp.lower() == original_org.lower() else f"{isp} / {org}"
-            return isp
-        return org if org and org not in {"Unknown Org", ""} else None
+        return _standardize_isp_and_org(isp, org)
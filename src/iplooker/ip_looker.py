@@ -7,36 +7,35 @@ organization that may be associated to it.
 
 from __future__ import annotations
 
+import contextlib
+import json
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import Future, as_completed
+from functools import cache, partial
 from ipaddress import ip_address as parse_ip_address
+from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
-import requests
-from polykit import PolyArgs, PolyEnv
-from polykit.cli import halo_progress, handle_interrupt
-from polykit.core import polykit_setup
+from polykit.cli import handle_interrupt
 from polykit.text import color, print_color
 
 from iplooker.ip_formatter import IPFormatter
-from iplooker.sources import (
-    IPAPICoLookup,
-    IPAPIIsLookup,
-    IPAPILookup,
-    IPDataLookup,
-    IPGeolocationLookup,
-    IPInfoLookup,
-    IPLocateLookup,
-    IPRegistryLookup,
-)
+from iplooker.sources import load_sources
 
 if TYPE_CHECKING:
     import argparse
+    import asyncio
+    from collections.abc import Callable, Generator
+    from concurrent.futures import Executor
+
+    from polykit import PolyEnv
 
     from iplooker.lookup_result import IPLookupResult
     from iplooker.lookup_source import IPLookupSource
 
-polykit_setup()
-
-env = PolyEnv()
+    _Outcome = tuple[IPLookupResult | None, str]
 
 
 class IPLooker:
@@ -44,17 +43,11 @@ class IPLooker:
 
     TIMEOUT: ClassVar[int] = 5
 
-    # List of lookup sources to use
-    LOOKUP_SOURCES: ClassVar[list[type[IPLookupSource]]] = [
-        IPAPICoLookup,
-        IPAPIIsLookup,
-        IPAPILookup,
-        IPDataLookup,
-        IPGeolocationLookup,
-        IPInfoLookup,
-        IPLocateLookup,
-        IPRegistryLookup,
-    ]
+    # Maximum number of sources to query at the same time
+    MAX_WORKERS: ClassVar[int] = 8
+
+    # List of lookup sources to use, or None to load every source on first use
+    LOOKUP_SOURCES: ClassVar[list[type[IPLookupSource]] | None] = None
 
     def __init__(
         self,
@@ -62,6 +55,9 @@ class IPLooker:
         do_lookup: bool = True,
         show_asn: bool = False,
         show_range: bool = False,
+        quorum: int | None = None,
+        deadline: float | None = None,
+        merge: bool = False,
     ):
         try:
             self.ip_address: str = ip_address
@@ -71,6 +67,9 @@ class IPLooker:
             self.results: list[IPLookupResult] = []
             self.show_asn: bool = show_asn
             self.show_range: bool = show_range
+            self.quorum: int | None = quorum
+            self.deadline: float | None = deadline
+            self.merge: bool = merge
 
             if do_lookup:
                 self.perform_ip_lookup()
@@ -79,52 +78,308 @@ class IPLooker:
             raise
 
     def perform_ip_lookup(self) -> None:
-        """Fetch IP data from all sources."""
+        """Fetch IP data from all sources concurrently."""
+        from polykit.cli import halo_progress
+
         with halo_progress(
             start_message=f"Getting results for {self.ip_address}",
             end_message=None,
             fail_message=f"Failed to get results for {self.ip_address}",
         ) as spinner:
-            for source_class in self.LOOKUP_SOURCES:
-                if spinner:
-                    spinner.text = color(f"Querying {source_class.SOURCE_NAME}...", "cyan")
+            total = len(self.get_lookup_sources())
+            completed = 0
 
-                result, failure_reason = source_class.lookup_with_reason(self.ip_address)
-                if result:
-                    self.results.append(result)
-                elif failure_reason:  # Only track if there's an actual error reason
-                    self.missing_sources[source_class.SOURCE_NAME] = failure_reason
+            def update_spinner(source_class: type[IPLookupSource]) -> None:
+                nonlocal completed
+                completed += 1
+                if spinner:
+                    spinner.text = color(
+                        f"Received {source_class.SOURCE_NAME} ({completed}/{total})...", "cyan"
+                    )
+
+            self.results, self.missing_sources = self.query_sources(
+                self.ip_address,
+                on_complete=update_spinner,
+                quorum=self.quorum,
+                deadline=self.deadline,
+            )
 
         self.display_results()
 
+    @classmethod
+    def query_sources(
+        cls,
+        ip_address: str,
+        executor: Executor | None = None,
+        on_complete: Callable[[type[IPLookupSource]], None] | None = None,
+        quorum: int | None = None,
+        deadline: float | None = None,
+    ) -> tuple[list[IPLookupResult], dict[str, str]]:
+        """Query all lookup sources for an IP address in parallel.
+
+        Every source is submitted at once and results are gathered as they finish, so the total
+        time is bounded by the slowest source rather than the sum of all of them. The returned
+        results and failure reasons are always in LOOKUP_SOURCES order, regardless of the order in
+        which the sources responded.
+
+        With a quorum or deadline, this returns early: as soon as enough sources agree on the
+        country or ASN, or once the deadline passes. Sources that haven't answered by then are
+        cancelled if they haven't started, or otherwise left to finish in the background, and are
+        listed as skipped in the missing sources.
+
+        Args:
+            ip_address: The IP address to look up.
+            executor: An executor to submit the lookups to. If not provided, up to MAX_WORKERS
+                background threads are started for this lookup, which never delay interpreter exit.
+            on_complete: A callback invoked with each source class as its lookup finishes.
+            quorum: The number of sources that must agree on the country or ASN before returning.
+            deadline: The maximum number of seconds to wait for sources.
+
+        Returns:
+            A tuple of (results, missing_sources), where missing_sources maps source names to
+            their failure reasons.
+        """
+        sources = cls.get_lookup_sources()
+        outcomes: list[tuple[IPLookupResult | None, str]] = [(None, "")] * len(sources)
+        calls = [partial(source_class.lookup_with_reason, ip_address) for source_class in sources]
+
+        if executor is None:
+            futures = dict(
+                zip(_start_daemon_workers(calls, cls.MAX_WORKERS), range(len(sources)), strict=True)
+            )
+        else:
+            futures = {executor.submit(call): index for index, call in enumerate(calls)}
+
+        quorum_formatter = IPFormatter(ip_address) if quorum else None
+        finished: set[int] = set()
+        skip_reason = ""
+
+        completed = as_completed(futures, timeout=deadline)
+        while True:
+            try:
+                future = next(completed, None)
+            except TimeoutError:
+                skip_reason = "skipped (deadline)"
+                break
+            if future is None:
+                break
+
+            index = futures[future]
+            outcomes[index] = cls._future_outcome(future)
+            finished.add(index)
+
+            if on_complete:
+                on_complete(sources[index])
+
+            if quorum_formatter and cls.has_quorum(
+                [outcomes[i][0] for i in finished], quorum, quorum_formatter
+            ):
+                skip_reason = "skipped (quorum reached)"
+                break
+
+        # Keep anything that finished in the meantime and give up on the stragglers
+        for future, index in futures.items():
+            if index in finished:
+                continue
+            if future.done():
+                outcomes[index] = cls._future_outcome(future)
+            else:
+                future.cancel()
+                outcomes[index] = (None, skip_reason)
+
+        return cls.collect_outcomes(sources, outcomes)
+
+    @classmethod
+    def get_lookup_sources(cls) -> list[type[IPLookupSource]]:
+        """Get the sources to query, importing the default sources on first use."""
+        if cls.LOOKUP_SOURCES is None:
+            cls.LOOKUP_SOURCES = load_sources()
+        return list(cls.LOOKUP_SOURCES)
+
+    @staticmethod
+    def _future_outcome(
+        future: Future[tuple[IPLookupResult | None, str]],
+    ) -> tuple[IPLookupResult | None, str]:
+        """Get the outcome of a finished lookup, turning unexpected exceptions into a reason."""
+        try:
+            return future.result()
+        except Exception:
+            return None, "lookup error"
+
+    @staticmethod
+    def has_quorum(
+        results: list[IPLookupResult | None], quorum: int, formatter: IPFormatter
+    ) -> bool:
+        """Check whether enough results agree on the country or the ASN.
+
+        Args:
+            results: The results received so far (None for sources that failed).
+            quorum: The number of sources that must agree.
+            formatter: The formatter used to standardize country names before comparing them.
+
+        Returns:
+            True if at least `quorum` results share a country or share an ASN.
+        """
+        countries: Counter[str] = Counter()
+        asns: Counter[str] = Counter()
+
+        for result in results:
+            if result is None:
+                continue
+            if result.country and (country := formatter.standardize_country(result.country)):
+                countries[country.casefold()] += 1
+            if result.asn:
+                asns[result.asn.strip().upper()] += 1
+
+        return any(count >= quorum for count in (*countries.values(), *asns.values()))
+
+    @classmethod
+    async def alookup(
+        cls, ip_address: str, timeout: float | None = None, quorum: int | None = None
+    ) -> tuple[list[IPLookupResult], dict[str, str]]:
+        """Query all lookup sources for an IP address concurrently on the running event loop.
+
+        This is the asyncio counterpart of query_sources(). All sources share one async HTTP client,
+        and any sources still running when the timeout expires, when a quorum is reached, or when
+        the caller is cancelled are cancelled rather than left to finish in the background.
+
+        Args:
+            ip_address: The IP address to look up.
+            timeout: The maximum number of seconds to wait for all sources. Sources that haven't
+                finished by then are cancelled and reported as timed out.
+            quorum: The number of sources that must agree on the country or ASN before returning.
+
+        Returns:
+            A tuple of (results, missing_sources), where missing_sources maps source names to
+            their failure reasons.
+        """
+        import asyncio
+
+        from iplooker.async_client import AsyncClientPool
+
+        sources = cls.get_lookup_sources()
+        client = AsyncClientPool.get_client()
+        tasks = [
+            asyncio.create_task(source_class.alookup_with_reason(ip_address, client))
+            for source_class in sources
+        ]
+        quorum_formatter = IPFormatter(ip_address) if quorum else None
+        skip_reason = "timed out"
+
+        try:
+            if quorum_formatter and quorum:
+                loop = asyncio.get_running_loop()
+                stop_at = None if timeout is None else loop.time() + timeout
+                pending = set(tasks)
+
+                while pending:
+                    remaining = None if stop_at is None else max(0.0, stop_at - loop.time())
+                    done, pending = await asyncio.wait(
+                        pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+
+                    finished = [task.result()[0] for task in tasks if cls._task_succeeded(task)]
+                    if cls.has_quorum(finished, quorum, quorum_formatter):
+                        skip_reason = "skipped (quorum reached)"
+                        break
+            else:
+                await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Cancel stragglers and wait for them so nothing outlives this call
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        outcomes: list[tuple[IPLookupResult | None, str]] = []
+        for task in tasks:
+            if task.cancelled():
+                outcomes.append((None, skip_reason))
+            elif task.exception():
+                outcomes.append((None, "lookup error"))
+            else:
+                outcomes.append(task.result())
+
+        return cls.collect_outcomes(sources, outcomes)
+
+    @staticmethod
+    def _task_succeeded(task: asyncio.Task[tuple[IPLookupResult | None, str]]) -> bool:
+        """Whether a lookup task has finished without being cancelled or raising."""
+        return task.done() and not task.cancelled() and task.exception() is None
+
+    @staticmethod
+    def collect_outcomes(
+        sources: list[type[IPLookupSource]], outcomes: list[tuple[IPLookupResult | None, str]]
+    ) -> tuple[list[IPLookupResult], dict[str, str]]:
+        """Split per-source outcomes into results and failure reasons, preserving source order."""
+        results: list[IPLookupResult] = []
+        missing_sources: dict[str, str] = {}
+
+        for source_class, (result, failure_reason) in zip(sources, outcomes, strict=True):
+            if result:
+                results.append(result)
+            elif failure_reason:  # Only track if there's an actual error reason
+                missing_sources[source_class.SOURCE_NAME] = failure_reason
+
+        return results, missing_sources
+
     def display_results(self) -> None:
         """Display the consolidated results and any sources with no data."""
-        if not self.results:
+        self.print_results(
+            self.ip_address,
+            self.results,
+            self.missing_sources,
+            show_asn=self.show_asn,
+            show_range=self.show_range,
+            merge=self.merge,
+        )
+
+    @staticmethod
+    def print_results(
+        ip_address: str,
+        results: list[IPLookupResult],
+        missing_sources: dict[str, str],
+        show_asn: bool = False,
+        show_range: bool = False,
+        merge: bool = False,
+    ) -> None:
+        """Print the consolidated results for an IP address and any sources with no data."""
+        if not results:
             print_color(
-                "\n⚠️  WARNING: No sources returned results. Check your API keys and internet connection.",
+                f"\n⚠️  WARNING: No sources returned results for {ip_address}. "
+                "Check your API keys and internet connection.",
                 "yellow",
             )
             return
 
+        formatter = IPFormatter(ip_address)
         formatted_results = []
-        for result in self.results:
-            formatted = self.formatter.format_lookup_result(
-                result, show_asn=self.show_asn, show_range=self.show_range
+        for result in results:
+            formatted = formatter.format_lookup_result(
+                result, show_asn=show_asn, show_range=show_range
             )
             formatted_results.append(formatted)
 
-        print_color(f"\n{color(f'Results for {self.ip_address}:', 'cyan')}", "blue")
-        self.formatter.print_consolidated_results(formatted_results)
+        print_color(f"\n{color(f'Results for {ip_address}:', 'cyan')}", "blue")
+        formatter.print_consolidated_results(formatted_results)
+
+        if merge:
+            from iplooker.result_merger import ResultMerger
 
-        if self.missing_sources:
-            missing_list = [
-                f"{source} ({reason})" for source, reason in self.missing_sources.items()
-            ]
+            if merged := ResultMerger().merge(results):
+                print()
+                formatter.print_merged_result(merged, show_asn=show_asn, show_range=show_range)
+
+        if missing_sources:
+            missing_list = [f"{source} ({reason})" for source, reason in missing_sources.items()]
             print_color(f"\nNo data from: {', '.join(missing_list)}", "blue")
 
     @staticmethod
     def get_external_ip() -> str | None:
         """Get the external IP address using ipify.org."""
+        import requests
+
         try:
             response = requests.get("https://api.ipify.org", timeout=IPLooker.TIMEOUT)
             if response.status_code == 200:
@@ -136,13 +391,68 @@ class IPLooker:
         return None
 
 
+def _start_daemon_workers(
+    calls: list[Callable[[], _Outcome]], max_workers: int
+) -> list[Future[_Outcome]]:
+    """Run calls on a few daemon threads and return a future for each.
+
+    Unlike a ThreadPoolExecutor, the threads don't hold up interpreter exit, so a lookup that
+    returns early never has to wait for slow sources before the program can finish.
+
+    Args:
+        calls: The calls to run.
+        max_workers: The maximum number of threads to start.
+
+    Returns:
+        A future for each call, in the same order. Futures can be cancelled until their call starts.
+    """
+    futures: list[Future[_Outcome]] = [Future() for _ in calls]
+    work = list(zip(futures, calls, strict=True))
+    work.reverse()
+    lock = threading.Lock()
+
+    def run_next() -> None:
+        while True:
+            with lock:
+                if not work:
+                    return
+                future, call = work.pop()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+
+    for _ in range(max(1, min(max_workers, len(calls)))):
+        threading.Thread(target=run_next, name="iplooker", daemon=True).start()
+
+    return futures
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
+    from polykit import PolyArgs
+
     parser = PolyArgs(description=__doc__, lines=2)
     group = parser.add_mutually_exclusive_group()
     group.add_argument("ip_address", type=str, nargs="?", help="the IP address to look up")
     group.add_argument("-m", "--me", action="store_true", help="get your external IP address")
     group.add_argument("-l", "--lookup", action="store_true", help="get lookup for your IP address")
+    group.add_argument(
+        "-b",
+        "--batch",
+        metavar="FILE",
+        help="look up every IP address in a file, one per line (use - for stdin)",
+    )
+    group.add_argument(
+        "--serve",
+        nargs="?",
+        const="127.0.0.1:8750",
+        metavar="ADDRESS",
+        help="run a lookup server on HOST:PORT or unix:PATH (default 127.0.0.1:8750)",
+    )
 
     # Add flags for additional information
     parser.add_argument(
@@ -151,16 +461,147 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "-r", "--range", action="store_true", help="show IP range/block information"
     )
+    parser.add_argument(
+        "-q",
+        "--quorum",
+        type=int,
+        metavar="N",
+        help="return as soon as N sources agree on the country or ASN",
+    )
+    parser.add_argument(
+        "-d",
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="return after this many seconds even if some sources haven't answered",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="send a duplicate of requests that run past a source's usual latency",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="also show a consensus result voted on across all sources",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["text", "jsonl", "csv", "parquet", "arrow"],
+        default="text",
+        help="output format; structured formats write one record per source (or per IP with --merge)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="write structured output to a file instead of stdout",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="don't read or write cached results"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="ignore cached results and fetch fresh ones"
+    )
+    parser.add_argument(
+        "--network-cache",
+        action="store_true",
+        help="reuse ASN/ISP/org details for IPs in a network block already seen (no location)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="maximum number of concurrent source lookups in batch mode",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        metavar="N",
+        help="spread batch mode across N worker processes, with results in input order",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json", "prometheus"],
+        help="print per-source latency, error, and quota metrics to stderr when done",
+    )
 
     return parser.parse_args()
 
 
-@handle_interrupt()
-def main() -> None:
-    """Main function."""
-    args = parse_args()
-    if args.lookup:
-        args.me = True
+@cache
+def get_env() -> PolyEnv:
+    """Get the environment variable manager, creating it on first use."""
+    from polykit import PolyEnv
+
+    return PolyEnv()
+
+
+def register_env_vars() -> None:
+    """Dynamically register environment variables for all sources."""
+    env = get_env()
+    for source in IPLooker.get_lookup_sources():
+        var_name = source.get_env_var_name()
+        env.add_var(var_name, required=False, secret=True)
+
+
+def run_batch(path: str, args: argparse.Namespace) -> None:
+    """Look up every IP address in a file (or stdin) and output results as they complete.
+
+    With --processes, results are output in input order instead of completion order.
+    """
+    from iplooker.batch_lookup import BatchLookup
+    from iplooker.output_writers import open_writer
+    from iplooker.process_batch import ProcessBatchLookup
+    from iplooker.result_merger import ResultMerger
+
+    batch: BatchLookup | ProcessBatchLookup = BatchLookup(max_workers=args.workers)
+    if args.processes:
+        batch = ProcessBatchLookup(
+            processes=args.processes,
+            max_workers=args.workers,
+            initializer=partial(configure_lookups, args),
+        )
+
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if path == "-" else stack.enter_context(Path(path).open(encoding="utf-8"))
+
+        if args.format != "text":
+            writer = stack.enter_context(open_writer(args.format, args.output))
+            merger = ResultMerger() if args.merge else None
+            for item in batch.run(lines):
+                writer.write_results(item.results, merger)
+            return
+
+        for item in batch.run(lines):
+            IPLooker.print_results(
+                item.ip_address,
+                item.results,
+                item.missing_sources,
+                show_asn=args.asn,
+                show_range=args.range,
+                merge=args.merge,
+            )
+
+
+def run(args: argparse.Namespace) -> None:
+    """Do the lookup, batch, server, or external IP check requested on the command line."""
+    if args.serve:
+        from iplooker.lookup_server import LookupService, serve
+
+        register_env_vars()
+        serve(args.serve, LookupService(args.quorum, args.deadline, args.merge))
+        return
+
+    if args.batch:
+        register_env_vars()
+        run_batch(args.batch, args)
+        return
 
     if args.me:
         ip_address = IPLooker.get_external_ip()
@@ -173,12 +614,82 @@ def main() -> None:
         print_color("No IP address provided.", "red")
         return
 
-    # Dynamically register environment variables for all sources
-    for source in IPLooker.LOOKUP_SOURCES:
-        var_name = source.get_env_var_name()
-        env.add_var(var_name, required=False, secret=True)
+    register_env_vars()
+    if args.format != "text":
+        from iplooker.output_writers import open_writer
+        from iplooker.result_merger import ResultMerger
+
+        results, _ = IPLooker.query_sources(ip_address, quorum=args.quorum, deadline=args.deadline)
+        with open_writer(args.format, args.output) as writer:
+            writer.write_results(results, ResultMerger() if args.merge else None)
+        return
+
+    IPLooker(
+        ip_address,
+        show_asn=args.asn,
+        show_range=args.range,
+        quorum=args.quorum,
+        deadline=args.deadline,
+        merge=args.merge,
+    )
+
+
+@contextlib.contextmanager
+def report_stats(stats_format: str | None) -> Generator[None]:
+    """Collect lookup metrics for the duration of the block and print them to stderr after it.
+
+    Args:
+        stats_format: The format to print the metrics in ("text", "json", or "prometheus"), or None
+            to not collect metrics at all.
+    """
+    if stats_format is None:
+        yield
+        return
+
+    from iplooker.metrics import Metrics, MetricsCollector
+
+    collector = MetricsCollector()
+    Metrics.add_hook(collector)
+    try:
+        yield
+    finally:
+        Metrics.remove_hook(collector)
+        if stats_format == "json":
+            report = json.dumps(collector.to_json(), indent=2)
+        elif stats_format == "prometheus":
+            report = collector.to_prometheus().rstrip("\n")
+        else:
+            report = collector.format_summary()
+        print(report, file=sys.stderr)
+
+
+def configure_lookups(args: argparse.Namespace) -> None:
+    """Apply the caching, hedging, and circuit breaker options to every lookup source."""
+    from iplooker.circuit_breaker import CircuitBreakers
+    from iplooker.latency_tracker import LatencyTracker
+    from iplooker.network_cache import NetworkCache
+    from iplooker.result_cache import ResultCache
+
+    ResultCache.configure(enabled=not args.no_cache, refresh=args.refresh)
+    NetworkCache.configure(enabled=args.network_cache)
+    LatencyTracker.configure(hedging=args.hedge)
+    CircuitBreakers.configure(persist=not args.no_cache)
+
+
+@handle_interrupt()
+def main() -> None:
+    """Main function."""
+    from polykit.core import polykit_setup
+
+    polykit_setup()
+
+    args = parse_args()
+    if args.lookup:
+        args.me = True
 
-    IPLooker(ip_address, show_asn=args.asn, show_range=args.range)
+    configure_lookups(args)
+    with report_stats(args.stats):
+        run(args)
 
 
 if __name__ == "__main__":
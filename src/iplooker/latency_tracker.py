@@ -0,0 +1,115 @@
+"""Per-source latency tracking for adaptive timeouts and hedged requests.
+
+Each lookup source gets a window of its most recent request latencies, shared by every thread and
+coroutine in the process. Sources use the window's quantiles to size their timeouts to how the
+provider actually behaves, rather than always waiting the full fixed timeout, and to decide when a
+request has been slow enough that sending a duplicate (a hedged request) is likely to answer
+sooner.
+
+Hedging is off by default. When it's enabled with LatencyTracker.configure(), each source may only
+hedge a fixed fraction of its requests, which bounds how much extra quota it can use.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import ClassVar
+
+
+class LatencyWindow:
+    """Thread-safe window of recent request latencies with a budget for hedged requests."""
+
+    def __init__(self, size: int, min_samples: int, hedge_budget: float):
+        self.min_samples: int = min_samples
+        self.hedge_budget: float = hedge_budget
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+        self._requests: int = 0
+        self._hedges: int = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add the latency of a request that was answered, or the time one took to time out."""
+        with self._lock:
+            self._samples.append(seconds)
+            self._sorted = None
+
+    def quantile(self, quantile: float) -> float | None:
+        """Get a latency quantile in seconds, or None until there are enough samples to trust."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            if self._sorted is None:
+                self._sorted = sorted(self._samples)
+            ordered = self._sorted
+
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def count_request(self) -> None:
+        """Count a request toward the hedging budget."""
+        with self._lock:
+            self._requests += 1
+
+    def try_hedge(self) -> bool:
+        """Claim a hedged request if the budget allows one.
+
+        Returns:
+            True if a duplicate request may be sent, False if that would exceed the budget.
+        """
+        with self._lock:
+            if self._hedges >= self.hedge_budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+
+class LatencyTracker:
+    """Keep a shared latency window per lookup source and the hedging setting."""
+
+    # Number of recent requests to base quantiles on
+    WINDOW_SIZE: ClassVar[int] = 200
+
+    # Number of requests to time before the quantiles are used
+    MIN_SAMPLES: ClassVar[int] = 20
+
+    # Largest fraction of a source's requests that may be hedged
+    HEDGE_BUDGET: ClassVar[float] = 0.05
+
+    _hedging: ClassVar[bool] = False
+    _windows: ClassVar[dict[str, LatencyWindow]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def configure(cls, hedging: bool = False, hedge_budget: float | None = None) -> None:
+        """Configure hedged requests for all lookup sources.
+
+        Args:
+            hedging: Whether to send a duplicate of requests that run past a source's usual latency.
+            hedge_budget: The largest fraction of each source's requests that may be hedged.
+                Defaults to HEDGE_BUDGET.
+        """
+        with cls._lock:
+            cls._hedging = hedging
+            if hedge_budget is not None:
+                cls.HEDGE_BUDGET = hedge_budget
+                for window in cls._windows.values():
+                    window.hedge_budget = hedge_budget
+
+    @classmethod
+    def hedging_enabled(cls) -> bool:
+        """Whether hedged requests are enabled."""
+        return cls._hedging
+
+    @classmethod
+    def get_window(cls, name: str) -> LatencyWindow:
+        """Get the shared latency window for a source, creating it on first use."""
+        if window := cls._windows.get(name):
+            return window
+
+        with cls._lock:
+            if (window := cls._windows.get(name)) is None:
+                window = cls._windows[name] = LatencyWindow(
+                    cls.WINDOW_SIZE, cls.MIN_SAMPLES, cls.HEDGE_BUDGET
+                )
+            return window
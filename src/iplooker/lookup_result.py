@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, fields
+from ipaddress import IPv4Address, IPv6Address, ip_address
+from typing import Any
 
-if TYPE_CHECKING:
-    from ipaddress import IPv4Address, IPv6Address
 
-
-@dataclass
+@dataclass(slots=True)
 class IPLookupResult:
     """Dataclass to hold the result of an IP lookup from a single source."""
 
@@ -31,3 +29,71 @@ class IPLookupResult:
     is_tor: bool | None = None
     is_datacenter: bool | None = None
     is_anonymous: bool | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        data = {name: getattr(self, name) for name in RESULT_FIELDS}
+        data["ip"] = str(self.ip)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> IPLookupResult:
+        """Create a result from a dictionary previously produced by to_dict().
+
+        Args:
+            data: The dictionary to load, with the IP address as a string.
+
+        Returns:
+            A new IPLookupResult with the same field values.
+        """
+        values = {name: data[name] for name in RESULT_FIELDS if name in data}
+        values["ip"] = ip_address(data["ip"])
+        return cls(**values)
+
+    def freeze(self) -> FrozenIPLookupResult:
+        """Get an immutable, hashable copy of the result."""
+        return FrozenIPLookupResult(*(getattr(self, name) for name in RESULT_FIELDS))
+
+
+# Names of the IPLookupResult fields, in declaration order
+RESULT_FIELDS: tuple[str, ...] = tuple(field.name for field in fields(IPLookupResult))
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenIPLookupResult:
+    """Immutable, hashable counterpart of IPLookupResult with the same fields.
+
+    Use IPLookupResult.freeze() and FrozenIPLookupResult.thaw() to convert between them. The fields
+    must be kept in the same order as IPLookupResult's.
+    """
+
+    ip: IPv4Address | IPv6Address
+    source: str
+    country: str | None = None
+    region: str | None = None
+    city: str | None = None
+    isp: str | None = None
+    org: str | None = None
+
+    # Network information
+    asn: str | None = None
+    asn_name: str | None = None
+    ip_range: str | None = None
+
+    # Security information
+    is_vpn: bool | None = None
+    vpn_service: str | None = None
+    is_proxy: bool | None = None
+    is_tor: bool | None = None
+    is_datacenter: bool | None = None
+    is_anonymous: bool | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        data = {name: getattr(self, name) for name in RESULT_FIELDS}
+        data["ip"] = str(self.ip)
+        return data
+
+    def thaw(self) -> IPLookupResult:
+        """Get a mutable copy of the result."""
+        return IPLookupResult(*(getattr(self, name) for name in RESULT_FIELDS))
@@ -0,0 +1,357 @@
+"""Long-running lookup service that keeps sources, connections, keys, and caches warm.
+
+Every command-line run starts cold: sources are imported, API keys decoded, and HTTP connections and
+the result cache opened before the first request goes out, and all of it is thrown away again at
+exit. The lookup server does that work once and then answers lookups over HTTP, on a local TCP port
+or a Unix socket, for as long as it runs.
+
+Endpoints:
+
+- `GET /lookup/<ip>` looks up one address.
+- `POST /lookup` looks up many addresses, given as a JSON list or as `{"ips": [...]}`, using bulk
+  endpoints where sources have them. Results come back in the order the addresses were given.
+- `GET /health` reports that the server is up, along with the sources it queries.
+
+Lookups respond with JSON objects holding the address, each source's result as a dictionary in the
+format of `IPLookupResult.to_dict()`, and the failure reason for each source with no result. Add
+`?merge=1` to either lookup endpoint to include the consensus result as well.
+
+Concurrent requests for the same address share a single fan-out to the sources, so a burst of
+queries for one address costs the providers one lookup. This holds across both endpoints: a bulk
+lookup joins single lookups already running for its addresses, and the other way around.
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import ip_address as parse_ip_address
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
+from urllib.parse import parse_qs, urlsplit
+
+from iplooker.api_key_manager import APIKeyManager
+from iplooker.batch_lookup import BatchLookup
+from iplooker.ip_looker import IPLooker
+from iplooker.result_cache import ResultCache
+from iplooker.result_merger import ResultMerger
+from iplooker.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from concurrent.futures import Future
+
+    from iplooker.lookup_result import IPLookupResult
+
+    # The results and failure reasons of a lookup, as returned by IPLooker.query_sources()
+    _Lookup = tuple[list[IPLookupResult], dict[str, str]]
+
+# Query string values that turn an option on
+TRUE_VALUES: frozenset[str] = frozenset({"1", "true", "yes", "on"})
+
+
+class LookupService:
+    """Answer lookups for the server, sharing one fan-out between requests for the same address."""
+
+    # Maximum number of source lookups running at the same time across all requests
+    MAX_WORKERS: ClassVar[int] = 32
+
+    # Maximum number of addresses in one bulk request
+    MAX_BATCH: ClassVar[int] = 10_000
+
+    def __init__(
+        self, quorum: int | None = None, deadline: float | None = None, merge: bool = False
+    ):
+        self.quorum: int | None = quorum
+        self.deadline: float | None = deadline
+        self.merge: bool = merge
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="iplooker-serve"
+        )
+        self.batch = BatchLookup(executor=self.executor, quorum=quorum, deadline=deadline)
+        self._flights = SingleFlight()
+
+    def warm_up(self) -> None:
+        """Load the sources and open everything they need before the first request arrives."""
+        for source in IPLooker.get_lookup_sources():
+            if source.REQUIRES_KEY:
+                APIKeyManager.get_key(
+                    source.SOURCE_NAME, requires_user_key=source.REQUIRES_USER_KEY
+                )
+            source.get_session()
+        ResultCache.get_shared()
+
+    def lookup(self, ip: str, merge: bool | None = None) -> dict[str, Any]:
+        """Look up one address, joining a lookup of the same address if one is already running.
+
+        Args:
+            ip: The IP address to look up.
+            merge: Whether to include the consensus result. Defaults to the service's setting.
+
+        Returns:
+            The lookup as a JSON-serializable dictionary.
+
+        Raises:
+            ValueError: If the IP address is invalid.
+        """
+        try:
+            key = str(parse_ip_address(ip))
+        except ValueError as e:
+            msg = f"Invalid IP address: {ip}"
+            raise ValueError(msg) from e
+
+        (results, missing_sources), _ = self._flights.do(key, self._query(key))
+        return self.to_response(key, results, missing_sources, merge=merge)
+
+    def lookup_many(self, ips: Sequence[Any], merge: bool | None = None) -> list[dict[str, Any]]:
+        """Look up many addresses at once, using the sources' bulk endpoints where possible.
+
+        Args:
+            ips: The IP addresses to look up.
+            merge: Whether to include the consensus results. Defaults to the service's setting.
+
+        Returns:
+            A lookup for each address in the order given, with an error for each invalid address.
+        """
+        normalized: list[str | None] = []
+        for ip in ips:
+            try:
+                normalized.append(str(parse_ip_address(str(ip).strip())))
+            except ValueError:
+                normalized.append(None)
+
+        # Claim every address, so addresses already being looked up are waited on instead
+        owned: dict[str, Future[Any]] = {}
+        joined: dict[str, Future[Any]] = {}
+        for key in dict.fromkeys(key for key in normalized if key is not None):
+            future, is_owner = self._flights.claim(key)
+            (owned if is_owner else joined)[key] = future
+
+        lookups: dict[str, _Lookup] = {}
+        try:
+            # The batch reads addresses lazily, so give it a copy of the ones being settled here
+            for item in self.batch.run(list(owned)):
+                lookup = lookups[item.ip_address] = (item.results, item.missing_sources)
+                self._flights.settle(item.ip_address, owned.pop(item.ip_address), lookup)
+        except BaseException as e:
+            for key, future in owned.items():
+                self._flights.settle(key, future, error=e)
+            raise
+
+        for key, future in joined.items():
+            lookups[key] = self._flights.join(key, future, self._query(key))
+
+        return [
+            self.to_response(key, *lookups[key], merge=merge)
+            if key is not None
+            else {"ip": str(ip), "error": "invalid IP"}
+            for ip, key in zip(ips, normalized, strict=True)
+        ]
+
+    def _query(self, key: str) -> Callable[[], _Lookup]:
+        """Get a function that queries every source for a normalized address."""
+        return partial(
+            IPLooker.query_sources,
+            key,
+            executor=self.executor,
+            quorum=self.quorum,
+            deadline=self.deadline,
+        )
+
+    def to_response(
+        self,
+        ip: str,
+        results: list[IPLookupResult],
+        missing_sources: dict[str, str],
+        merge: bool | None = None,
+    ) -> dict[str, Any]:
+        """Convert the outcome of a lookup to a JSON-serializable dictionary."""
+        response: dict[str, Any] = {
+            "ip": ip,
+            "results": [result.to_dict() for result in results],
+            "missing_sources": missing_sources,
+        }
+
+        if (self.merge if merge is None else merge) and (merged := ResultMerger().merge(results)):
+            response["merged"] = {
+                **merged.result.to_dict(),
+                "confidence": merged.confidence,
+                "field_confidence": merged.field_confidence,
+                "provenance": merged.provenance,
+            }
+        return response
+
+    def close(self) -> None:
+        """Stop accepting lookups and let the ones already running finish in the background."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    """Handle HTTP requests to the lookup server."""
+
+    server: _LookupHTTPServer | _LookupUnixServer
+
+    # Keep connections open between requests so clients don't reconnect for every lookup
+    protocol_version = "HTTP/1.1"
+
+    # Maximum size of a request body in bytes
+    MAX_BODY: ClassVar[int] = 1024 * 1024
+
+    def do_GET(self) -> None:
+        """Answer a single lookup or a health check."""
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            sources = [source.SOURCE_NAME for source in IPLooker.get_lookup_sources()]
+            self._send_json(200, {"status": "ok", "sources": sources})
+            return
+
+        ip = url.path.removeprefix("/lookup/")
+        if ip == url.path or not ip:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            response = self.server.service.lookup(ip, merge=self._merge_option(url.query))
+        except ValueError:
+            self._send_json(400, {"error": "invalid IP", "ip": ip})
+            return
+        self._send_json(200, response)
+
+    def do_POST(self) -> None:
+        """Answer a bulk lookup."""
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/lookup":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.MAX_BODY:
+            self.close_connection = True
+            self._send_json(413, {"error": "request body too large"})
+            return
+
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._send_json(400, {"error": "request body is not valid JSON"})
+            return
+
+        ips = body.get("ips") if isinstance(body, dict) else body
+        if not isinstance(ips, list):
+            self._send_json(400, {"error": 'expected a list of IPs or {"ips": [...]}'})
+            return
+
+        service = self.server.service
+        if len(ips) > service.MAX_BATCH:
+            self._send_json(413, {"error": f"at most {service.MAX_BATCH} IPs per request"})
+            return
+
+        results = service.lookup_many(ips, merge=self._merge_option(url.query))
+        self._send_json(200, {"results": results})
+
+    @staticmethod
+    def _merge_option(query: str) -> bool | None:
+        """Get the merge option from a query string, or None if it's not given."""
+        values = parse_qs(query).get("merge")
+        return values[-1].lower() in TRUE_VALUES if values else None
+
+    def _send_json(self, status: int, data: Any) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        """Get the client address for log messages, which Unix socket clients don't have."""
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log requests only if the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _LookupHTTPServer(ThreadingHTTPServer):
+    """Lookup server listening on a TCP port."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: LookupService, verbose: bool):
+        self.service: LookupService = service
+        self.verbose: bool = verbose
+        super().__init__(address, LookupRequestHandler)
+
+
+class _LookupUnixServer(socketserver.ThreadingUnixStreamServer):
+    """Lookup server listening on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: LookupService, verbose: bool):
+        self.service: LookupService = service
+        self.verbose: bool = verbose
+        self.path: Path = path
+        path.unlink(missing_ok=True)  # Remove the socket left behind by a previous server
+        super().__init__(str(path), LookupRequestHandler)
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+
+def create_server(
+    address: str, service: LookupService, verbose: bool = False
+) -> _LookupHTTPServer | _LookupUnixServer:
+    """Create a lookup server without starting it.
+
+    Args:
+        address: Where to listen: "HOST:PORT", just a port, or "unix:PATH" (or any path containing
+            a slash) for a Unix socket.
+        service: The service that answers lookups.
+        verbose: Whether to log every request to stderr.
+
+    Returns:
+        The server, bound and ready for serve_forever().
+
+    Raises:
+        ValueError: If the address can't be parsed.
+    """
+    if address.startswith("unix:") or "/" in address:
+        return _LookupUnixServer(Path(address.removeprefix("unix:")), service, verbose)
+
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        msg = f"Invalid server address: {address}"
+        raise ValueError(msg)
+    return _LookupHTTPServer((host.strip("[]") or "127.0.0.1", int(port)), service, verbose)
+
+
+def serve(address: str, service: LookupService, verbose: bool = False) -> None:
+    """Warm up the lookup service and answer requests until interrupted.
+
+    Args:
+        address: Where to listen, as accepted by create_server().
+        service: The service that answers lookups.
+        verbose: Whether to log every request to stderr.
+    """
+    service.warm_up()
+    with create_server(address, service, verbose) as server:
+        if isinstance(server, _LookupUnixServer):
+            location = f"unix:{server.path}"
+        else:
+            host, port = server.server_address[:2]
+            location = f"http://{host!s}:{port}"
+        print(f"Serving lookups on {location}", file=sys.stderr)
+
+        try:
+            server.serve_forever()
+        finally:
+            service.close()
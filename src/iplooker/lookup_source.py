@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
+import threading
+import time
+from abc import ABC
+from concurrent.futures import Future, as_completed
+from functools import partial
+from inspect import isabstract
 from ipaddress import IPv4Address, IPv6Address, ip_address
-from typing import TYPE_CHECKING, Any, ClassVar
+from itertools import starmap
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, cast
 
-import requests
 from polykit.text import print_color
 
 from iplooker.api_key_manager import APIKeyManager
+from iplooker.async_client import AsyncClientPool
+from iplooker.circuit_breaker import CircuitBreakers
+from iplooker.field_map import compile_field_map
+from iplooker.http_session import SessionPool
+from iplooker.latency_tracker import LatencyTracker
+from iplooker.metrics import Metrics
+from iplooker.network_cache import NetworkCache
+from iplooker.rate_limiter import RateLimiter
+from iplooker.response_decoder import ResponseDecoder
+from iplooker.result_cache import ResultCache
+from iplooker.single_flight import SingleFlight
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    import httpx
+    import requests
+
+    from iplooker.circuit_breaker import CircuitBreaker
+    from iplooker.field_map import FieldExtractor
+    from iplooker.latency_tracker import LatencyWindow
     from iplooker.lookup_result import IPLookupResult
+    from iplooker.rate_limiter import TokenBucket
+
+
+class _PreparedLookup(NamedTuple):
+    """A lookup that is ready to send, along with what's needed to finish it."""
+
+    ip_obj: IPv4Address | IPv6Address
+    url: str
+    params: dict[str, Any]
+    headers: dict[str, str]
+    cache: ResultCache | None
 
 
 class IPLookupSource(ABC):
@@ -21,6 +56,37 @@ class IPLookupSource(ABC):
     API_URL: ClassVar[str]
     TIMEOUT: ClassVar[int] = 5
 
+    # Adaptive timeouts: once enough requests have been timed, wait TIMEOUT_FACTOR times the
+    # TIMEOUT_QUANTILE latency instead, but never less than MIN_TIMEOUT or more than TIMEOUT
+    ADAPTIVE_TIMEOUT: ClassVar[bool] = True
+    TIMEOUT_QUANTILE: ClassVar[float] = 0.99
+    TIMEOUT_FACTOR: ClassVar[float] = 3.0
+    MIN_TIMEOUT: ClassVar[float] = 1.0
+
+    # Latency quantile after which a duplicate request is sent, if hedging is enabled
+    HEDGE_QUANTILE: ClassVar[float] = 0.95
+
+    # Connection pool settings (None uses the SessionPool defaults)
+    POOL_SIZE: ClassVar[int | None] = None
+    MAX_RETRIES: ClassVar[int | None] = None
+
+    # Rate limit for requests to this source, in requests per second (None for no limit)
+    RATE_LIMIT: ClassVar[float | None] = None
+    RATE_LIMIT_BURST: ClassVar[int] = 1
+
+    # How many times to wait and retry after a rate limit (HTTP 429) response
+    RATE_LIMIT_RETRIES: ClassVar[int] = 2
+
+    # Bulk lookups: the most IPs per request, and where to send them (0 or None if unsupported)
+    BATCH_SIZE: ClassVar[int] = 0
+    BATCH_URL: ClassVar[str | None] = None
+    BATCH_IP_KEY: ClassVar[str] = "ip"  # Key naming the IP address in each bulk response entry
+    BATCH_RATE_LIMIT: ClassVar[float | None] = None  # Separate limit for bulk requests, if any
+    BATCH_RATE_LIMIT_BURST: ClassVar[int] = 1
+
+    # How long to keep cached results for this source, in seconds (0 disables caching)
+    CACHE_TTL: ClassVar[int] = 24 * 60 * 60
+
     # Whether the source supports IPv6 addresses
     IPV6_SUPPORTED: ClassVar[bool] = True
 
@@ -37,6 +103,30 @@ class IPLookupSource(ABC):
     ERROR_MSG_KEYS: ClassVar[list[str]] = ["reason"]  # Keys for error messages in response
     SUCCESS_VALUES: ClassVar[dict[str, Any]] = {}  # Success values, e.g. {"status": 200}
 
+    # Where each result field is found in a response, compiled into _parse_response() when the
+    # class is defined (see field_map.py for the format)
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {}
+
+    # Set when the bulk endpoint turns out to be unavailable (e.g. not included in the plan)
+    _batch_unavailable: ClassVar[bool] = False
+
+    # The parsers compiled from FIELD_MAP, if the source has one
+    _field_extractor: ClassVar[FieldExtractor | None] = None
+
+    def __init_subclass__(cls, **kwargs: Any):
+        """Compile the field map of a new source class.
+
+        Raises:
+            TypeError: If a concrete source has neither a FIELD_MAP nor its own _parse_response().
+        """
+        super().__init_subclass__(**kwargs)
+        if "FIELD_MAP" in cls.__dict__:
+            cls._field_extractor = compile_field_map(cls.FIELD_MAP, cls.__name__)
+
+        if cls._field_extractor is None and not cls._overrides_parser() and not isabstract(cls):
+            msg = f"{cls.__name__} must define FIELD_MAP or implement _parse_response()"
+            raise TypeError(msg)
+
     @classmethod
     def lookup(cls, ip: str) -> IPLookupResult | None:
         """Look up information about an IP address.
@@ -60,37 +150,437 @@ class IPLookupSource(ABC):
         Returns:
             A tuple of (LookupResult or None, failure_reason).
         """
+        started = time.perf_counter()
+        prepared, outcome = cls._prepare_lookup(ip)
+        if prepared is not None:
+            outcome = cls._fetch_coalesced(prepared)
+
+        cls._record_outcome(outcome, started)
+        return outcome
+
+    @classmethod
+    async def alookup(cls, ip: str) -> IPLookupResult | None:
+        """Look up information about an IP address without blocking the event loop.
+
+        Args:
+            ip: The IP address to look up.
+
+        Returns:
+            A LookupResult object with the lookup results, or None if the lookup failed.
+        """
+        result, _ = await cls.alookup_with_reason(ip)
+        return result
+
+    @classmethod
+    async def alookup_with_reason(
+        cls, ip: str, client: httpx.AsyncClient | None = None
+    ) -> tuple[IPLookupResult | None, str]:
+        """Look up information about an IP address with failure reason, asynchronously.
+
+        This follows the same steps as lookup_with_reason() and uses the same request and parsing
+        hooks, but sends the request with a shared async HTTP client instead of blocking a thread.
+
+        Args:
+            ip: The IP address to look up.
+            client: The async HTTP client to use. Defaults to the shared client for the running
+                event loop.
+
+        Returns:
+            A tuple of (LookupResult or None, failure_reason).
+        """
+        started = time.perf_counter()
+        prepared, outcome = cls._prepare_lookup(ip)
+        if prepared is not None:
+            fetch = partial(cls._afetch, prepared, client)
+            if flights := SingleFlight.get_shared():
+                outcome, shared = await flights.ado(cls._flight_key(prepared), fetch)
+                cls._record_coalesced(shared)
+            else:
+                outcome = await fetch()
+
+        cls._record_outcome(outcome, started)
+        return outcome
+
+    @classmethod
+    def _fetch(cls, prepared: _PreparedLookup) -> tuple[IPLookupResult | None, str]:
+        """Send the request for a prepared lookup and finish it."""
+        data, error_reason = cls._make_request_with_reason(
+            prepared.url, params=prepared.params, headers=prepared.headers
+        )
+        CircuitBreakers.record(cls.SOURCE_NAME, error_reason)
+        return cls._finish_lookup(prepared, data, error_reason)
+
+    @classmethod
+    async def _afetch(
+        cls, prepared: _PreparedLookup, client: httpx.AsyncClient | None
+    ) -> tuple[IPLookupResult | None, str]:
+        """Send the request for a prepared lookup asynchronously and finish it."""
+        data, error_reason = await cls._amake_request_with_reason(
+            prepared.url, params=prepared.params, headers=prepared.headers, client=client
+        )
+        CircuitBreakers.record(cls.SOURCE_NAME, error_reason)
+        return cls._finish_lookup(prepared, data, error_reason)
+
+    @classmethod
+    def _fetch_coalesced(cls, prepared: _PreparedLookup) -> tuple[IPLookupResult | None, str]:
+        """Fetch a prepared lookup, sharing the request of any lookup of the address in flight."""
+        if flights := SingleFlight.get_shared():
+            outcome, shared = flights.do(cls._flight_key(prepared), partial(cls._fetch, prepared))
+            cls._record_coalesced(shared)
+            return outcome
+        return cls._fetch(prepared)
+
+    @classmethod
+    def _flight_key(cls, prepared: _PreparedLookup) -> tuple[str, IPv4Address | IPv6Address]:
+        """Get the key that identifies duplicate in-flight lookups of an address."""
+        return cls.SOURCE_NAME, prepared.ip_obj
+
+    @classmethod
+    def _record_coalesced(cls, shared: bool) -> None:
+        """Report a lookup that was answered by another caller's request to metrics hooks."""
+        if shared:
+            Metrics.emit("cache_hit", cls.SOURCE_NAME, reason="coalesced")
+
+    @classmethod
+    def _record_outcome(cls, outcome: tuple[IPLookupResult | None, str], started: float) -> None:
+        """Report the outcome of a lookup to metrics hooks, unless the source was skipped."""
+        result, reason = outcome
+        if result is not None or reason:
+            Metrics.emit(
+                "lookup", cls.SOURCE_NAME, seconds=time.perf_counter() - started, reason=reason
+            )
+
+    @classmethod
+    def _prepare_lookup(
+        cls, ip: str
+    ) -> tuple[_PreparedLookup | None, tuple[IPLookupResult | None, str]]:
+        """Do everything needed before sending a request for an IP address.
+
+        Args:
+            ip: The IP address to look up.
+
+        Returns:
+            A tuple of (prepared request, outcome). If the prepared request is None, no request is
+            needed and the outcome holds the final (LookupResult or None, failure_reason).
+        """
         ip_obj = cls._validate_ip(ip)
         if not ip_obj:
-            return None, "invalid IP"
+            return None, (None, "invalid IP")
 
         # Check if this source supports IPv6
         if isinstance(ip_obj, IPv6Address) and not cls.IPV6_SUPPORTED:
-            return None, "IPv6 not supported"
+            return None, (None, "IPv6 not supported")
+
+        # Serve from the result cache if there's a fresh entry
+        cache = ResultCache.get_shared() if cls.CACHE_TTL > 0 else None
+        if cache and (cached := cache.get(cls.SOURCE_NAME, str(ip_obj), cls.CACHE_TTL)):
+            Metrics.emit("cache_hit", cls.SOURCE_NAME, reason="result")
+            return None, (cached, "")
+
+        # Answer from a cached network block containing this address if enabled
+        network_cache = NetworkCache.get_shared()
+        if network_cache and (cached := network_cache.get(cls.SOURCE_NAME, ip_obj)):
+            Metrics.emit("cache_hit", cls.SOURCE_NAME, reason="network")
+            return None, (cached, "")
 
         # Get API key if required
         key = ""
         if cls.REQUIRES_KEY:
             key = APIKeyManager.get_key(cls.SOURCE_NAME, requires_user_key=cls.REQUIRES_USER_KEY)
             if not key:
-                return None, ""  # Silently skip sources without keys
+                return None, (None, "")  # Silently skip sources without keys
+
+        # Skip sources that keep failing until their cool-down is over
+        breaker = cls.get_circuit_breaker()
+        if breaker and not breaker.allow():
+            return None, (None, f"circuit open ({breaker.last_failure})")
 
-        # Prepare and make the request
         url, params, headers = cls._prepare_request(ip, key)
-        data, error_reason = cls._make_request_with_reason(url, params=params, headers=headers)
+        return _PreparedLookup(ip_obj, url, params, headers, cache), (None, "")
+
+    @classmethod
+    def _finish_lookup(
+        cls, prepared: _PreparedLookup, data: dict[str, Any] | None, error_reason: str
+    ) -> tuple[IPLookupResult | None, str]:
+        """Validate and parse a response, caching the result if it succeeded.
+
+        Args:
+            prepared: The prepared lookup the response belongs to.
+            data: The decoded response data, or None if the request failed.
+            error_reason: The reason the request failed, if it did.
+
+        Returns:
+            A tuple of (LookupResult or None, failure_reason).
+        """
         if not data:
             return None, error_reason
 
+        started = time.perf_counter()
+
         # Check for errors in the response
         is_valid, error_reason = cls._is_response_valid_with_reason(data)
         if not is_valid:
             return None, error_reason
 
         try:
-            result = cls._parse_response(data, ip_obj)
-            return result, ""
+            result = cls._parse_response(data, prepared.ip_obj)
         except Exception:
             return None, "parse error"
+        finally:
+            Metrics.emit("parse", cls.SOURCE_NAME, seconds=time.perf_counter() - started)
+
+        return cls._store_result(prepared, result)
+
+    @classmethod
+    def _finish_lookups(
+        cls,
+        ready: list[tuple[int, _PreparedLookup, dict[str, Any]]],
+        outcomes: list[tuple[IPLookupResult | None, str]],
+    ) -> None:
+        """Validate and parse the entries of a bulk response together, caching each result.
+
+        Args:
+            ready: The entries to finish, as (outcome index, prepared lookup, entry data).
+            outcomes: The outcomes to store each (LookupResult or None, failure_reason) in.
+        """
+        started = time.perf_counter()
+        valid: list[tuple[int, _PreparedLookup, dict[str, Any]]] = []
+        for index, prepared, entry in ready:
+            is_valid, error_reason = cls._is_response_valid_with_reason(entry)
+            if is_valid:
+                valid.append((index, prepared, entry))
+            else:
+                outcomes[index] = (None, error_reason)
+
+        try:
+            results = cls._parse_responses([
+                (entry, prepared.ip_obj) for _, prepared, entry in valid
+            ])
+        except Exception:
+            # Parse them one at a time, so one bad entry doesn't fail the rest
+            for index, prepared, entry in valid:
+                outcomes[index] = cls._finish_lookup(prepared, entry, "")
+            return
+
+        if Metrics.enabled():
+            seconds = (time.perf_counter() - started) / max(1, len(ready))
+            for _ in ready:
+                Metrics.emit("parse", cls.SOURCE_NAME, seconds=seconds)
+
+        for (index, prepared, _), result in zip(valid, results, strict=True):
+            outcomes[index] = cls._store_result(prepared, result)
+
+    @classmethod
+    def _store_result(
+        cls, prepared: _PreparedLookup, result: IPLookupResult | None
+    ) -> tuple[IPLookupResult | None, str]:
+        """Add a parsed result to the caches and turn it into an outcome."""
+        if prepared.cache and result:
+            prepared.cache.set(cls.SOURCE_NAME, str(prepared.ip_obj), result)
+        if result and (network_cache := NetworkCache.get_shared()):
+            network_cache.add(result)
+
+        return result, ""
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """Whether this source can look up many IP addresses in a single request."""
+        return cls.BATCH_SIZE > 1 and bool(cls.BATCH_URL) and not cls._batch_unavailable
+
+    @classmethod
+    def lookup_batch_with_reason(
+        cls, ips: Sequence[str]
+    ) -> list[tuple[IPLookupResult | None, str]]:
+        """Look up many IP addresses, using the source's bulk endpoint if it has one.
+
+        Each address goes through the same validation, caching, and parsing steps as
+        lookup_with_reason(), but the addresses that still need a request are sent to the provider
+        in groups of up to BATCH_SIZE. Sources without a bulk endpoint fall back to one request per
+        address.
+
+        Args:
+            ips: The IP addresses to look up.
+
+        Returns:
+            A list of (LookupResult or None, failure_reason) tuples in the same order as the input.
+        """
+        started = time.perf_counter()
+        outcomes: list[tuple[IPLookupResult | None, str]] = [(None, "")] * len(ips)
+        to_fetch: list[tuple[int, _PreparedLookup]] = []
+
+        for index, ip in enumerate(ips):
+            prepared, outcome = cls._prepare_lookup(ip)
+            if prepared is None:
+                outcomes[index] = outcome
+            else:
+                to_fetch.append((index, prepared))
+
+        if flights := SingleFlight.get_shared():
+            cls._fetch_all_coalesced(flights, to_fetch, outcomes)
+        else:
+            cls._fetch_all(to_fetch, outcomes)
+
+        if Metrics.enabled():
+            for outcome in outcomes:
+                cls._record_outcome(outcome, started)
+
+        return outcomes
+
+    @classmethod
+    def _fetch_all(
+        cls,
+        to_fetch: list[tuple[int, _PreparedLookup]],
+        outcomes: list[tuple[IPLookupResult | None, str]],
+    ) -> None:
+        """Fetch prepared lookups in groups of up to BATCH_SIZE and store each outcome."""
+        for start in range(0, len(to_fetch), max(1, cls.BATCH_SIZE)):
+            chunk = to_fetch[start : start + max(1, cls.BATCH_SIZE)]
+            if len(chunk) > 1 and cls.supports_batch():
+                cls._fetch_batch(chunk, outcomes)
+            else:
+                cls._fetch_individually(chunk, outcomes)
+
+    @classmethod
+    def _fetch_all_coalesced(
+        cls,
+        flights: SingleFlight,
+        to_fetch: list[tuple[int, _PreparedLookup]],
+        outcomes: list[tuple[IPLookupResult | None, str]],
+    ) -> None:
+        """Fetch prepared lookups, leaving addresses already in flight to the caller fetching them.
+
+        Addresses nobody else is fetching are claimed and fetched as usual, in groups, and their
+        outcomes are shared with anyone who asks for them in the meantime. The rest wait for the
+        lookup already in flight.
+        """
+        claimed: list[tuple[int, _PreparedLookup, Future[Any]]] = []
+        joined: list[tuple[int, _PreparedLookup, Future[Any]]] = []
+        for index, prepared in to_fetch:
+            future, is_owner = flights.claim(cls._flight_key(prepared))
+            (claimed if is_owner else joined).append((index, prepared, future))
+
+        try:
+            cls._fetch_all([(index, prepared) for index, prepared, _ in claimed], outcomes)
+        except BaseException as e:
+            for _, prepared, future in claimed:
+                flights.settle(cls._flight_key(prepared), future, error=e)
+            raise
+
+        for index, prepared, future in claimed:
+            flights.settle(cls._flight_key(prepared), future, outcomes[index])
+
+        for index, prepared, future in joined:
+            fetch = partial(cls._fetch, prepared)
+            outcomes[index] = flights.join(cls._flight_key(prepared), future, fetch)
+            cls._record_coalesced(True)
+
+    @classmethod
+    def _fetch_individually(
+        cls,
+        chunk: list[tuple[int, _PreparedLookup]],
+        outcomes: list[tuple[IPLookupResult | None, str]],
+    ) -> None:
+        """Send one request per prepared lookup and store each outcome."""
+        for index, prepared in chunk:
+            outcomes[index] = cls._fetch(prepared)
+
+    @classmethod
+    def _fetch_batch(
+        cls,
+        chunk: list[tuple[int, _PreparedLookup]],
+        outcomes: list[tuple[IPLookupResult | None, str]],
+    ) -> None:
+        """Send a group of prepared lookups in one bulk request and store each outcome."""
+        chunk_ips = [str(prepared.ip_obj) for _, prepared in chunk]
+        key = ""
+        if cls.REQUIRES_KEY:
+            key = APIKeyManager.get_key(cls.SOURCE_NAME, requires_user_key=cls.REQUIRES_USER_KEY)
+
+        url, params, headers, body = cls._prepare_batch_request(chunk_ips, key)
+        data, error_reason = cls._send_request_with_reason(
+            url,
+            params=params,
+            headers=headers,
+            json_body=body,
+            bucket=cls.get_batch_bucket(),
+            adaptive=False,
+        )
+
+        # Client errors usually mean the plan doesn't include bulk lookups, so stop trying
+        if data is None and error_reason.startswith("API error: 4"):
+            cls._batch_unavailable = True
+            cls._fetch_individually(chunk, outcomes)
+            return
+
+        CircuitBreakers.record(cls.SOURCE_NAME, error_reason)
+        entries: dict[str, Any] = {}
+        if data is not None:
+            try:
+                entries = cls._split_batch_response(data)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                error_reason = "parse error"
+                data = None
+
+        ready: list[tuple[int, _PreparedLookup, dict[str, Any]]] = []
+        for (index, prepared), ip in zip(chunk, chunk_ips, strict=True):
+            if data is None:
+                outcomes[index] = (None, error_reason)
+            elif (entry := entries.get(ip)) is None:
+                outcomes[index] = (None, "missing from batch response")
+            else:
+                ready.append((index, prepared, entry))
+
+        cls._finish_lookups(ready, outcomes)
+
+    @classmethod
+    def _prepare_batch_request(
+        cls, ips: list[str], key: str
+    ) -> tuple[str, dict[str, Any], dict[str, str], Any]:
+        """Prepare a bulk request for a list of normalized IP addresses.
+
+        The default sends the addresses as a JSON array in a POST to BATCH_URL, with the API key
+        added the same way as for single lookups.
+
+        Args:
+            ips: The IP addresses to look up.
+            key: The API key, if the source needs one.
+
+        Returns:
+            A tuple of (url, params, headers, JSON body). A body of None sends a GET instead.
+        """
+        _, params, headers = cls._prepare_request("", key)
+        return cls.BATCH_URL or "", params, headers, ips
+
+    @classmethod
+    def _split_batch_response(cls, data: Any) -> dict[str, Any]:
+        """Split a bulk response into per-IP response data, keyed by normalized IP address.
+
+        The default handles a list of objects (optionally wrapped in a "results" key) that each
+        name their IP address in BATCH_IP_KEY, as well as an object keyed by IP address.
+
+        Args:
+            data: The decoded bulk response.
+
+        Returns:
+            A dict mapping each normalized IP address to the data for that address.
+        """
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = data["results"]
+
+        pairs: Iterable[tuple[Any, Any]]
+        if isinstance(data, dict):
+            pairs = data.items()
+        else:
+            pairs = ((entry.get(cls.BATCH_IP_KEY), entry) for entry in data)
+
+        entries: dict[str, Any] = {}
+        for ip, entry in pairs:
+            if ip and isinstance(entry, dict):
+                try:
+                    entries[str(ip_address(ip))] = entry
+                except ValueError:
+                    continue
+        return entries
 
     @classmethod
     def _is_response_valid(cls, data: dict[str, Any]) -> bool:
@@ -196,8 +686,12 @@ class IPLookupSource(ABC):
         Returns:
             The parsed JSON response as a dict, or None if the request failed.
         """
+        import requests
+
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=cls.TIMEOUT)
+            response = cls.get_session().get(
+                url, params=params, headers=headers, timeout=cls.TIMEOUT
+            )
 
             if response.status_code == 429:
                 print_color(
@@ -206,7 +700,7 @@ class IPLookupSource(ABC):
                 return None
 
             if response.status_code == 200:
-                return response.json()
+                return ResponseDecoder.decode(response.content)
 
             print(f"{cls.SOURCE_NAME} API error: {response.status_code} - {response.text[:100]}")
             return None
@@ -235,30 +729,294 @@ class IPLookupSource(ABC):
         Returns:
             A tuple of (parsed JSON response as a dict, error_reason).
         """
+        return cls._send_request_with_reason(url, params=params, headers=headers)
+
+    @classmethod
+    def _send_request_with_reason(
+        cls,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        json_body: Any = None,
+        bucket: TokenBucket | None = None,
+        adaptive: bool = True,
+    ) -> tuple[Any, str]:
+        """Send a rate-limited HTTP request, retrying after 429 responses, and decode the JSON.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters to include in the request.
+            headers: HTTP headers to include in the request.
+            json_body: A body to send as JSON. If provided, the request is a POST instead of a GET.
+            bucket: The token bucket to throttle with. Defaults to the source's rate limit bucket.
+            adaptive: Whether to time the request against the source's usual latency, for the
+                adaptive timeout and hedging. Bulk requests take longer, so they use TIMEOUT.
+
+        Returns:
+            A tuple of (parsed JSON response, error_reason).
+        """
+        import requests
+
+        bucket = bucket or cls.get_rate_limit_bucket()
+        session = cls.get_session()
+        if json_body is None:
+            send = partial(session.get, url, params=params, headers=headers)
+        else:
+            send = partial(session.post, url, params=params, headers=headers, json=json_body)
+
+        for attempt in range(cls.RATE_LIMIT_RETRIES + 1):
+            bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = cls._send_adaptively(send) if adaptive else send(timeout=cls.TIMEOUT)
+            except requests.RequestException:
+                Metrics.emit("request", cls.SOURCE_NAME, seconds=time.perf_counter() - started)
+                return None, "request error"
+
+            cls._record_response(response.status_code, response.headers, started)
+            if response.status_code != 429 or not cls._back_off(
+                bucket, response.headers.get("Retry-After"), attempt
+            ):
+                break
+
+        return cls._interpret_response(
+            response.status_code, partial(ResponseDecoder.decode, response.content)
+        )
+
+    @classmethod
+    async def _amake_request_with_reason(
+        cls,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Make an async HTTP request and return the JSON response.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters to include in the request.
+            headers: HTTP headers to include in the request.
+            client: The async HTTP client to use. Defaults to the shared client.
+
+        Returns:
+            A tuple of (parsed JSON response as a dict, error_reason).
+        """
+        import httpx
+
+        bucket = cls.get_rate_limit_bucket()
+        client = client or AsyncClientPool.get_client()
+
+        send = partial(client.get, url, params=params, headers=headers)
+
+        for attempt in range(cls.RATE_LIMIT_RETRIES + 1):
+            await bucket.aacquire()
+            started = time.perf_counter()
+            try:
+                response = await cls._asend_adaptively(send)
+            except httpx.HTTPError:
+                Metrics.emit("request", cls.SOURCE_NAME, seconds=time.perf_counter() - started)
+                return None, "request error"
+
+            cls._record_response(response.status_code, response.headers, started)
+            if response.status_code != 429 or not cls._back_off(
+                bucket, response.headers.get("Retry-After"), attempt
+            ):
+                break
+
+        return cls._interpret_response(
+            response.status_code, partial(ResponseDecoder.decode, response.content)
+        )
+
+    @classmethod
+    def _send_adaptively(cls, send: Callable[..., requests.Response]) -> requests.Response:
+        """Send a request with the adaptive timeout, hedging it if it runs long.
+
+        The latency of every attempt that gets an answer or times out is added to the source's
+        latency window, so the timeout grows again if the provider slows down.
+
+        Args:
+            send: Sends the request when called with a timeout.
+
+        Returns:
+            The first response received.
+        """
+        import requests
+
+        window = cls.get_latency_window()
+        window.count_request()
+        timeout = cls.get_timeout()
+
+        def timed_send() -> requests.Response:
+            started = time.perf_counter()
+            try:
+                response = send(timeout=timeout)
+            except requests.Timeout:
+                window.record(time.perf_counter() - started)
+                raise
+            window.record(time.perf_counter() - started)
+            return response
+
+        if (hedge_after := cls._get_hedge_delay(window)) is None:
+            return timed_send()
+
+        first = _start_daemon_thread(timed_send)
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=cls.TIMEOUT)
+            return first.result(timeout=hedge_after)
+        except TimeoutError:
+            if not window.try_hedge():
+                return first.result()
 
-            if response.status_code == 429:
-                return None, "rate limited"
+        # Take the first successful response, or the first error if both requests fail
+        second = _start_daemon_thread(timed_send)
+        for future in as_completed((first, second)):
+            if future.exception() is None:
+                return future.result()
+        return first.result()
 
-            if response.status_code == 200:
-                return response.json(), ""
+    @classmethod
+    async def _asend_adaptively(cls, send: Callable[..., Any]) -> httpx.Response:
+        """Send an async request with the adaptive timeout, hedging it if it runs long.
 
-            return None, f"API error: {response.status_code}"
+        Args:
+            send: Sends the request when called with a timeout, returning an awaitable response.
 
-        except requests.RequestException:
-            return None, "request error"
+        Returns:
+            The first response received.
+        """
+        import asyncio
+
+        import httpx
+
+        window = cls.get_latency_window()
+        window.count_request()
+        timeout = cls.get_timeout()
+
+        async def timed_send() -> httpx.Response:
+            started = time.perf_counter()
+            try:
+                response = await send(timeout=timeout)
+            except httpx.TimeoutException:
+                window.record(time.perf_counter() - started)
+                raise
+            window.record(time.perf_counter() - started)
+            return response
+
+        if (hedge_after := cls._get_hedge_delay(window)) is None:
+            return await timed_send()
+
+        first = asyncio.ensure_future(timed_send())
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done or not window.try_hedge():
+            return await first
+
+        # Take the first successful response, or the last error if both requests fail
+        pending = {first, asyncio.ensure_future(timed_send())}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded or not pending:
+                    return (succeeded or list(done))[0].result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @classmethod
+    def _get_hedge_delay(cls, window: LatencyWindow) -> float | None:
+        """Get how long to wait before hedging a request, or None if it shouldn't be hedged.
+
+        Sources with a rate limit are never hedged, since a duplicate would only queue behind it.
+        """
+        if not LatencyTracker.hedging_enabled() or cls.RATE_LIMIT is not None:
+            return None
+        return window.quantile(cls.HEDGE_QUANTILE)
+
+    @classmethod
+    def _record_response(cls, status_code: int, headers: Any, started: float) -> None:
+        """Report a response's status, latency, and any quota headers to metrics hooks."""
+        if Metrics.enabled():
+            seconds = time.perf_counter() - started
+            Metrics.emit("request", cls.SOURCE_NAME, seconds=seconds, status_code=status_code)
+            Metrics.emit_quota(cls.SOURCE_NAME, headers)
+
+    @classmethod
+    def _back_off(cls, bucket: TokenBucket, retry_after: str | None, attempt: int) -> bool:
+        """Pause the source's rate limit bucket after a 429 response, if it's worth retrying.
+
+        Args:
+            bucket: The source's shared token bucket.
+            retry_after: The value of the Retry-After header, if there was one.
+            attempt: The number of rate limit responses already received for this request.
+
+        Returns:
+            True if the request should be retried once the bucket allows it, False to give up.
+        """
+        if attempt >= cls.RATE_LIMIT_RETRIES:
+            return False
+
+        delay = RateLimiter.backoff_delay(retry_after, attempt)
+        if delay is None:
+            return False
+
+        bucket.pause(delay)
+        return True
+
+    @classmethod
+    def _interpret_response(
+        cls, status_code: int, decode: Callable[[], Any]
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Turn an HTTP status code and response body into data or a failure reason.
+
+        Args:
+            status_code: The HTTP status code of the response.
+            decode: A callable that decodes the response body as JSON, raising ValueError if it's
+                malformed.
+
+        Returns:
+            A tuple of (parsed JSON response as a dict, error_reason).
+        """
+        if status_code == 429:
+            return None, "rate limited"
+
+        if status_code != 200:
+            return None, f"API error: {status_code}"
+
+        try:
+            return decode(), ""
         except ValueError:
             return None, "JSON decode error"
 
     @classmethod
-    @abstractmethod
     def _parse_response(
         cls, data: dict[str, Any], ip_obj: IPv4Address | IPv6Address
     ) -> IPLookupResult | None:
-        """Parse the response into a LookupResult."""
-        msg = "Subclasses must implement this method"
-        raise NotImplementedError(msg)
+        """Parse the response into a LookupResult with the parser compiled from FIELD_MAP.
+
+        Sources whose responses can't be described by a field map override this instead.
+        """
+        # Sources without a field map must override this, which __init_subclass__() checks
+        extractor = cast("FieldExtractor", cls._field_extractor)
+        return extractor.extract(data, ip_obj, cls.SOURCE_NAME)
+
+    @classmethod
+    def _parse_responses(
+        cls, rows: list[tuple[dict[str, Any], IPv4Address | IPv6Address]]
+    ) -> list[IPLookupResult | None]:
+        """Parse many responses at once, as (data, ip_obj) pairs, into LookupResults."""
+        if cls._field_extractor is not None and not cls._overrides_parser():
+            return list(cls._field_extractor.extract_many(rows, cls.SOURCE_NAME))
+        return list(starmap(cls._parse_response, rows))
+
+    @classmethod
+    def _overrides_parser(cls) -> bool:
+        """Whether the source parses responses itself rather than only with its FIELD_MAP."""
+        for base in cls.__mro__:
+            if base is IPLookupSource:
+                return False
+            if "_parse_response" in vars(base):
+                return True
+        return False
 
     @classmethod
     def _validate_ip(cls, ip: str) -> IPv4Address | IPv6Address | None:
@@ -276,7 +1034,71 @@ class IPLookupSource(ABC):
             print(f"Invalid IP address: {ip}")
             return None
 
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Get the pooled HTTP session shared by all lookups for this source."""
+        return SessionPool.get_session(
+            cls.SOURCE_NAME, pool_size=cls.POOL_SIZE, max_retries=cls.MAX_RETRIES
+        )
+
+    @classmethod
+    def get_latency_window(cls) -> LatencyWindow:
+        """Get the window of recent request latencies for this source."""
+        return LatencyTracker.get_window(cls.SOURCE_NAME)
+
+    @classmethod
+    def get_circuit_breaker(cls) -> CircuitBreaker | None:
+        """Get the circuit breaker for this source, or None if circuit breakers are disabled."""
+        return CircuitBreakers.get(cls.SOURCE_NAME)
+
+    @classmethod
+    def get_timeout(cls) -> float:
+        """Get the timeout for a request to this source, adapted to its observed latency.
+
+        Until enough requests have been timed, or if ADAPTIVE_TIMEOUT is off, this is TIMEOUT.
+        """
+        if not cls.ADAPTIVE_TIMEOUT:
+            return cls.TIMEOUT
+
+        latency = cls.get_latency_window().quantile(cls.TIMEOUT_QUANTILE)
+        if latency is None:
+            return cls.TIMEOUT
+        return min(cls.TIMEOUT, max(cls.MIN_TIMEOUT, latency * cls.TIMEOUT_FACTOR))
+
+    @classmethod
+    def get_rate_limit_bucket(cls) -> TokenBucket:
+        """Get the token bucket that throttles requests to this source."""
+        return RateLimiter.get_bucket(
+            cls.SOURCE_NAME, rate=cls.RATE_LIMIT, burst=cls.RATE_LIMIT_BURST
+        )
+
+    @classmethod
+    def get_batch_bucket(cls) -> TokenBucket:
+        """Get the token bucket that throttles bulk requests to this source."""
+        if cls.BATCH_RATE_LIMIT is None:
+            return cls.get_rate_limit_bucket()
+        return RateLimiter.get_bucket(
+            f"{cls.SOURCE_NAME} (batch)",
+            rate=cls.BATCH_RATE_LIMIT,
+            burst=cls.BATCH_RATE_LIMIT_BURST,
+        )
+
     @classmethod
     def get_env_var_name(cls) -> str:
         """Get the environment variable name for this source's API key."""
         return f"IPLOOKER_API_KEY_{cls.SOURCE_NAME.upper().replace('.', '')}"
+
+
+def _start_daemon_thread(func: Callable[[], requests.Response]) -> Future[requests.Response]:
+    """Run a request on a daemon thread, so one that's abandoned never delays exiting."""
+    future: Future[requests.Response] = Future()
+
+    def run() -> None:
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=run, name="iplooker-hedge", daemon=True).start()
+    return future
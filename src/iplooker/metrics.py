@@ -0,0 +1,362 @@
+"""Per-source instrumentation for lookups, with pluggable hooks and built-in exporters.
+
+Lookup sources report what happens during each lookup as MetricEvent objects: every HTTP request
+with its status code and latency, time spent parsing responses, cache hits, rate limit responses,
+remaining quota reported by the provider, and the final outcome of each lookup. Events go to every
+registered hook, and nothing is recorded when no hooks are registered, so instrumentation costs
+almost nothing unless it's used.
+
+MetricsCollector is a built-in hook that aggregates events per source, with exporters for the
+Prometheus text format, JSON, and a human-readable summary:
+
+    collector = MetricsCollector()
+    Metrics.add_hook(collector)
+    ...
+    print(collector.to_prometheus())
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    MetricHook = Callable[["MetricEvent"], None]
+
+# Response headers that providers use to report how many requests are left in the current window
+QUOTA_HEADERS: tuple[str, ...] = ("X-RateLimit-Remaining", "RateLimit-Remaining", "X-Rl")
+
+
+@dataclass(slots=True, frozen=True)
+class MetricEvent:
+    """Something that happened during a lookup for one source.
+
+    Kinds of event:
+        request: An HTTP request completed, with its status_code (None if it failed to connect) and
+            latency in seconds.
+        parse: A response was validated and parsed, taking the given seconds.
+        cache_hit: A result was served from the result cache (reason "result"), the network
+            cache (reason "network"), or another caller's request in flight (reason "coalesced").
+        quota: The provider reported the number of requests remaining in value.
+        lookup: A lookup finished, with its failure reason (empty on success) and total seconds.
+    """
+
+    kind: str
+    source: str
+    seconds: float | None = None
+    status_code: int | None = None
+    reason: str = ""
+    value: float | None = None
+
+
+class Metrics:
+    """Dispatch lookup events to registered hooks."""
+
+    _hooks: ClassVar[tuple[MetricHook, ...]] = ()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def add_hook(cls, hook: MetricHook) -> None:
+        """Register a callable to receive every MetricEvent.
+
+        Hooks are called synchronously on the thread (or event loop) doing the lookup, so they
+        should be quick. Exceptions raised by a hook are not caught.
+        """
+        with cls._lock:
+            cls._hooks = (*cls._hooks, hook)
+
+    @classmethod
+    def remove_hook(cls, hook: MetricHook) -> None:
+        """Unregister a previously added hook."""
+        with cls._lock:
+            cls._hooks = tuple(registered for registered in cls._hooks if registered is not hook)
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """Whether any hooks are registered."""
+        return bool(cls._hooks)
+
+    @classmethod
+    def emit(
+        cls,
+        kind: str,
+        source: str,
+        seconds: float | None = None,
+        status_code: int | None = None,
+        reason: str = "",
+        value: float | None = None,
+    ) -> None:
+        """Send an event to every registered hook, if there are any."""
+        if hooks := cls._hooks:
+            event = MetricEvent(kind, source, seconds, status_code, reason, value)
+            for hook in hooks:
+                hook(event)
+
+    @classmethod
+    def emit_quota(cls, source: str, headers: Mapping[str, str]) -> None:
+        """Report the remaining quota from a provider's response headers, if it sent any."""
+        if not cls._hooks:
+            return
+
+        for name in QUOTA_HEADERS:
+            if (remaining := headers.get(name)) is not None:
+                try:
+                    cls.emit("quota", source, value=float(remaining))
+                except ValueError:
+                    continue
+                return
+
+
+@dataclass
+class _SourceStats:
+    """Aggregated metrics for a single source."""
+
+    requests: Counter[str] = field(default_factory=Counter)  # By status code or "error"
+    latency_buckets: list[int] = field(default_factory=list)
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    parse_sum: float = 0.0
+    parse_count: int = 0
+    cache_hits: Counter[str] = field(default_factory=Counter)  # By "result", "network", "coalesced"
+    outcomes: Counter[str] = field(default_factory=Counter)  # By failure reason ("ok" on success)
+    quota_remaining: float | None = None
+
+
+class MetricsCollector:
+    """Aggregate lookup events per source and export them."""
+
+    # Upper bounds of the request latency histogram buckets, in seconds
+    LATENCY_BUCKETS: ClassVar[tuple[float, ...]] = (
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self):
+        self.sources: dict[str, _SourceStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: MetricEvent) -> None:
+        """Add an event to the aggregated metrics for its source."""
+        with self._lock:
+            if (stats := self.sources.get(event.source)) is None:
+                stats = self.sources[event.source] = _SourceStats(
+                    latency_buckets=[0] * (len(self.LATENCY_BUCKETS) + 1)
+                )
+
+            if event.kind == "request":
+                self._record_request(stats, event)
+            elif event.kind == "parse" and event.seconds is not None:
+                stats.parse_sum += event.seconds
+                stats.parse_count += 1
+            elif event.kind == "cache_hit":
+                stats.cache_hits[event.reason] += 1
+            elif event.kind == "quota":
+                stats.quota_remaining = event.value
+            elif event.kind == "lookup":
+                stats.outcomes[event.reason or "ok"] += 1
+
+    def _record_request(self, stats: _SourceStats, event: MetricEvent) -> None:
+        """Count a request by status and add its latency to the histogram."""
+        stats.requests[str(event.status_code) if event.status_code else "error"] += 1
+        if event.seconds is None:
+            return
+
+        stats.latency_sum += event.seconds
+        stats.latency_count += 1
+        stats.latency_buckets[bisect_left(self.LATENCY_BUCKETS, event.seconds)] += 1
+
+    def latency_quantile(self, source: str, quantile: float) -> float | None:
+        """Estimate a request latency quantile for a source from its histogram.
+
+        Like Prometheus's histogram_quantile(), this interpolates linearly within the bucket the
+        quantile falls in, and reports the highest bucket bound for the overflow bucket.
+
+        Args:
+            source: The name of the source.
+            quantile: The quantile to estimate, between 0 and 1.
+
+        Returns:
+            The estimated latency in seconds, or None if the source has no timed requests.
+        """
+        stats = self.sources.get(source)
+        if stats is None or not stats.latency_count:
+            return None
+
+        rank = quantile * stats.latency_count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.LATENCY_BUCKETS, stats.latency_buckets, strict=False):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.LATENCY_BUCKETS[-1]
+
+    def to_json(self) -> dict[str, Any]:
+        """Export the metrics as a JSON-serializable dict keyed by source name."""
+        with self._lock:
+            return {
+                source: {
+                    "requests": dict(stats.requests),
+                    "rate_limited": stats.requests["429"],
+                    "latency": {
+                        "count": stats.latency_count,
+                        "sum": stats.latency_sum,
+                        "buckets": dict(
+                            zip(
+                                [*map(str, self.LATENCY_BUCKETS), "+Inf"],
+                                stats.latency_buckets,
+                                strict=True,
+                            )
+                        ),
+                    },
+                    "parse": {"count": stats.parse_count, "sum": stats.parse_sum},
+                    "cache_hits": dict(stats.cache_hits),
+                    "outcomes": dict(stats.outcomes),
+                    "quota_remaining": stats.quota_remaining,
+                }
+                for source, stats in sorted(self.sources.items())
+            }
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP iplooker_requests_total HTTP requests sent to each source, by status code.",
+            "# TYPE iplooker_requests_total counter",
+        ]
+        with self._lock:
+            sources = sorted(self.sources.items())
+
+            for source, stats in sources:
+                for status, count in sorted(stats.requests.items()):
+                    lines.append(
+                        f"iplooker_requests_total{_labels(source=source, status=status)} {count}"
+                    )
+
+            lines.extend((
+                "# HELP iplooker_request_duration_seconds Latency of HTTP requests to each source.",
+                "# TYPE iplooker_request_duration_seconds histogram",
+            ))
+            for source, stats in sources:
+                lines.extend(self._histogram_lines(source, stats))
+
+            lines.extend((
+                "# HELP iplooker_parse_duration_seconds Time spent parsing responses.",
+                "# TYPE iplooker_parse_duration_seconds summary",
+            ))
+            for source, stats in sources:
+                labels = _labels(source=source)
+                lines.extend((
+                    f"iplooker_parse_duration_seconds_sum{labels} {stats.parse_sum}",
+                    f"iplooker_parse_duration_seconds_count{labels} {stats.parse_count}",
+                ))
+
+            lines.extend(self._counter_lines(sources))
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, source: str, stats: _SourceStats) -> list[str]:
+        """Format the request latency histogram for a source."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(
+            [*map(str, self.LATENCY_BUCKETS), "+Inf"], stats.latency_buckets, strict=True
+        ):
+            cumulative += count
+            labels = _labels(source=source, le=bound)
+            lines.append(f"iplooker_request_duration_seconds_bucket{labels} {cumulative}")
+
+        labels = _labels(source=source)
+        lines.extend((
+            f"iplooker_request_duration_seconds_sum{labels} {stats.latency_sum}",
+            f"iplooker_request_duration_seconds_count{labels} {stats.latency_count}",
+        ))
+        return lines
+
+    @staticmethod
+    def _counter_lines(sources: list[tuple[str, _SourceStats]]) -> list[str]:
+        """Format the cache hit, lookup outcome, and quota metrics for every source."""
+        lines = [
+            "# HELP iplooker_cache_hits_total Lookups answered from a cache, by cache.",
+            "# TYPE iplooker_cache_hits_total counter",
+        ]
+        for source, stats in sources:
+            for cache, count in sorted(stats.cache_hits.items()):
+                labels = _labels(source=source, cache=cache)
+                lines.append(f"iplooker_cache_hits_total{labels} {count}")
+
+        lines.extend((
+            "# HELP iplooker_rate_limited_total Rate limit (HTTP 429) responses from each source.",
+            "# TYPE iplooker_rate_limited_total counter",
+        ))
+        lines.extend(
+            f"iplooker_rate_limited_total{_labels(source=source)} {stats.requests['429']}"
+            for source, stats in sources
+        )
+
+        lines.extend((
+            "# HELP iplooker_lookups_total Finished lookups, by outcome.",
+            "# TYPE iplooker_lookups_total counter",
+        ))
+        for source, stats in sources:
+            for outcome, count in sorted(stats.outcomes.items()):
+                labels = _labels(source=source, outcome=outcome)
+                lines.append(f"iplooker_lookups_total{labels} {count}")
+
+        lines.extend((
+            "# HELP iplooker_quota_remaining Requests remaining as last reported by the source.",
+            "# TYPE iplooker_quota_remaining gauge",
+        ))
+        lines.extend(
+            f"iplooker_quota_remaining{_labels(source=source)} {stats.quota_remaining}"
+            for source, stats in sources
+            if stats.quota_remaining is not None
+        )
+        return lines
+
+    def format_summary(self) -> str:
+        """Format a table summarizing requests, failures, caching, and latency per source."""
+        header = (
+            f"{'Source':<18} {'Lookups':>7} {'Failed':>6} {'Cached':>6} {'Requests':>8} "
+            f"{'429s':>5} {'Mean ms':>8} {'p95 ms':>7} {'Quota':>6}"
+        )
+        lines = [header, "-" * len(header)]
+
+        for source, stats in sorted(self.sources.items()):
+            lookups = sum(stats.outcomes.values())
+            failed = lookups - stats.outcomes["ok"]
+            mean = stats.latency_sum / stats.latency_count if stats.latency_count else None
+            p95 = self.latency_quantile(source, 0.95)
+            quota = "" if stats.quota_remaining is None else f"{stats.quota_remaining:.0f}"
+            lines.append(
+                f"{source:<18} {lookups:>7} {failed:>6} {sum(stats.cache_hits.values()):>6} "
+                f"{stats.requests.total():>8} {stats.requests['429']:>5} "
+                f"{_format_ms(mean):>8} {_format_ms(p95):>7} {quota:>6}"
+            )
+
+        return "\n".join(lines)
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping values as the text format requires."""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_ms(seconds: float | None) -> str:
+    """Format a duration in milliseconds for the summary table."""
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
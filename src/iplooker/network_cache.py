@@ -0,0 +1,168 @@
+"""In-memory cache of network-level details per returned IP block.
+
+Many sources return the network block an address belongs to (in IPLookupResult.ip_range) along
+with details that apply to the whole block, such as the ASN and the organization that owns it. This
+cache remembers those details per source and block, so any later address inside the same block can
+be answered without a request. That's a big win for logs where thousands of addresses come from the
+same scanner or cloud tenant.
+
+Only network-level fields are reused, since location can vary within a block, so the cache is
+opt-in via NetworkCache.configure().
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from ipaddress import ip_network
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from iplooker.lookup_result import IPLookupResult
+
+if TYPE_CHECKING:
+    from ipaddress import IPv4Address, IPv6Address
+
+# Fields that describe the network block rather than the individual address
+NETWORK_FIELDS: tuple[str, ...] = ("asn", "asn_name", "isp", "org", "is_datacenter")
+
+
+class _PrefixTable:
+    """Longest-prefix-match table for one source and address family.
+
+    Networks are kept in one hash table per prefix length, keyed by the network's address bits.
+    A lookup probes each known prefix length from longest to shortest, so it costs one dict lookup
+    per distinct prefix length in the table (usually only a handful) rather than one per bit.
+    """
+
+    def __init__(self, max_bits: int):
+        self.max_bits = max_bits
+        self.by_length: dict[int, dict[int, tuple[Any, ...]]] = {}
+        self.lengths: list[int] = []  # Sorted longest first
+
+    def find(self, address: int) -> tuple[int, int, tuple[Any, ...]] | None:
+        """Find the longest matching prefix, returning (network bits, prefix length, fields)."""
+        for length in self.lengths:
+            key = address >> (self.max_bits - length)
+            if (fields := self.by_length[length].get(key)) is not None:
+                return key, length, fields
+        return None
+
+    def add(self, key: int, length: int, fields: tuple[Any, ...]) -> bool:
+        """Add a network, returning whether it was new."""
+        if length not in self.by_length:
+            self.by_length[length] = {}
+            self.lengths = sorted(self.by_length, reverse=True)
+
+        table = self.by_length[length]
+        is_new = key not in table
+        table[key] = fields
+        return is_new
+
+    def remove(self, key: int, length: int) -> None:
+        """Remove a network if it's present."""
+        if (table := self.by_length.get(length)) is None:
+            return
+
+        table.pop(key, None)
+        if not table:
+            del self.by_length[length]
+            self.lengths = sorted(self.by_length, reverse=True)
+
+
+class NetworkCache:
+    """Cache network-level details per source and IP block for reuse across addresses."""
+
+    # Maximum number of cached blocks across all sources before the oldest are evicted
+    MAX_ENTRIES: ClassVar[int] = 100_000
+
+    # Ignore blocks broader than this, which are too coarse to say anything about an address
+    MIN_PREFIX_LENGTH: ClassVar[dict[int, int]] = {4: 8, 6: 16}
+
+    _shared: ClassVar[NetworkCache | None] = None
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries: int = max_entries or self.MAX_ENTRIES
+        self._tables: dict[tuple[str, int], _PrefixTable] = {}
+        self._order: deque[tuple[str, int, int, int]] = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, enabled: bool = True, max_entries: int | None = None) -> None:
+        """Enable or disable the shared network cache used by all lookup sources.
+
+        Args:
+            enabled: Whether to answer addresses from cached network blocks.
+            max_entries: The maximum number of blocks to keep. Defaults to MAX_ENTRIES.
+        """
+        cls._shared = cls(max_entries) if enabled else None
+
+    @classmethod
+    def get_shared(cls) -> NetworkCache | None:
+        """Get the shared network cache, or None if it's disabled."""
+        return cls._shared
+
+    def get(self, source: str, ip_obj: IPv4Address | IPv6Address) -> IPLookupResult | None:
+        """Build a result from the cached block containing an address, if there is one.
+
+        Args:
+            source: The name of the source to look up cached blocks for.
+            ip_obj: The IP address to look up.
+
+        Returns:
+            An IPLookupResult with the network-level fields and ip_range filled in, or None if no
+            cached block from this source contains the address.
+        """
+        with self._lock:
+            table = self._tables.get((source, ip_obj.version))
+            match = table.find(int(ip_obj)) if table else None
+
+        if match is None:
+            return None
+
+        key, length, fields = match
+        network = ip_network((key << (ip_obj.max_prefixlen - length), length))
+        result = IPLookupResult(ip=ip_obj, source=source, ip_range=str(network))
+        for name, value in zip(NETWORK_FIELDS, fields, strict=True):
+            setattr(result, name, value)
+        return result
+
+    def add(self, result: IPLookupResult) -> None:
+        """Remember the network-level fields of a result for its ip_range, if it has one.
+
+        Args:
+            result: The result to remember. Results without a usable ip_range are ignored.
+        """
+        if not result.ip_range:
+            return
+
+        try:
+            network = ip_network(result.ip_range.strip(), strict=False)
+        except ValueError:
+            return
+
+        if network.prefixlen < self.MIN_PREFIX_LENGTH[network.version]:
+            return
+        if result.ip not in network:
+            return
+
+        fields = tuple(getattr(result, name) for name in NETWORK_FIELDS)
+        key = int(network.network_address) >> (network.max_prefixlen - network.prefixlen)
+        table_key = (result.source, network.version)
+
+        with self._lock:
+            if (table := self._tables.get(table_key)) is None:
+                table = self._tables[table_key] = _PrefixTable(network.max_prefixlen)
+
+            if table.add(key, network.prefixlen, fields):
+                self._order.append((result.source, network.version, key, network.prefixlen))
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest blocks until the cache is within its size cap."""
+        while len(self._order) > self.max_entries:
+            source, version, key, length = self._order.popleft()
+            if table := self._tables.get((source, version)):
+                table.remove(key, length)
+
+    def __len__(self) -> int:
+        return len(self._order)
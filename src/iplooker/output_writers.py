@@ -0,0 +1,257 @@
+"""Streaming writers for structured lookup output.
+
+Writers serialize IPLookupResult records, either one per source or one merged result per IP, as
+JSON Lines, CSV, or columnar Parquet or Arrow. Records are buffered in a columnar
+IPLookupResultBatch of fixed size, and each chunk is written out as soon as it fills up, so memory
+use stays bounded no matter how many addresses a batch covers. Parquet and Arrow chunks are exported
+from the batch's arrays without copying them.
+
+Parquet and Arrow output need the optional pyarrow dependency, which can be installed with
+`pip install iplooker[arrow]`.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, ClassVar
+
+from iplooker.result_batch import FLAG_FIELDS, OUTPUT_FIELDS, IPLookupResultBatch
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from iplooker.lookup_result import IPLookupResult
+    from iplooker.result_merger import ResultMerger
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class ResultWriter(ABC):
+    """Base class for writers that stream lookup results to a file or stream in chunks."""
+
+    # Short name used to select the writer on the command line
+    FORMAT_NAME: ClassVar[str]
+
+    # Whether the output is binary rather than text
+    BINARY: ClassVar[bool] = False
+
+    # Number of records to buffer before writing them out
+    CHUNK_SIZE: ClassVar[int] = 256
+
+    def __init__(self, output: Path | str | IO[Any] | None = None, chunk_size: int | None = None):
+        """Open a writer.
+
+        Args:
+            output: The path or open file to write to. Defaults to stdout, as does "-".
+            chunk_size: The number of records to buffer before writing. Defaults to CHUNK_SIZE.
+        """
+        self.chunk_size: int = max(1, chunk_size or self.CHUNK_SIZE)
+        self._pending = IPLookupResultBatch()
+        self._owns_stream = isinstance(output, (str, Path)) and str(output) != "-"
+
+        if isinstance(output, (str, Path)) and self._owns_stream:
+            self.stream: IO[Any] = self._open(Path(output))
+        elif output is None or isinstance(output, (str, Path)):
+            self.stream = sys.stdout.buffer if self.BINARY else sys.stdout
+        else:
+            self.stream = output
+
+    def _open(self, path: Path) -> IO[Any]:
+        """Open an output file in binary or text mode, depending on the format."""
+        if self.BINARY:
+            return path.open("wb")
+        return path.open("w", encoding="utf-8", newline="")
+
+    def write(self, result: IPLookupResult, confidence: float | None = None) -> None:
+        """Add a result to the output.
+
+        Args:
+            result: The result to write.
+            confidence: The confidence score, for merged results.
+        """
+        self._pending.append(result, confidence)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def write_results(
+        self, results: Iterable[IPLookupResult], merger: ResultMerger | None = None
+    ) -> None:
+        """Add the results from every source for one IP address.
+
+        Args:
+            results: The results for the IP address.
+            merger: A merger to combine the results into one record. If not provided, each source's
+                result is written as its own record.
+        """
+        if merger is None:
+            for result in results:
+                self.write(result)
+        elif merged := merger.merge(results):
+            self.write(merged.result, merged.confidence)
+
+    def write_batch(self, batch: IPLookupResultBatch) -> None:
+        """Write out a whole batch of results, after any records already buffered."""
+        self.flush()
+        if batch:
+            self._write_chunk(batch)
+            self.stream.flush()
+
+    def flush(self) -> None:
+        """Write out any buffered records."""
+        if self._pending:
+            self._write_chunk(self._pending)
+            self._pending.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Write out any buffered records and finish the output."""
+        self.flush()
+        self._finish()
+        if self._owns_stream:
+            self.stream.close()
+
+    @abstractmethod
+    def _write_chunk(self, batch: IPLookupResultBatch) -> None:
+        """Serialize a chunk of results."""
+
+    def _finish(self) -> None:  # noqa: B027
+        """Write anything needed to end the output after the last chunk."""
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class JSONLinesWriter(ResultWriter):
+    """Write one JSON object per line (NDJSON)."""
+
+    FORMAT_NAME: ClassVar[str] = "jsonl"
+
+    def _write_chunk(self, batch: IPLookupResultBatch) -> None:
+        self.stream.write(
+            "".join(
+                f"{_encode_json(dict(zip(OUTPUT_FIELDS, row, strict=True)))}\n"
+                for row in batch.iter_rows()
+            )
+        )
+
+
+class CSVWriter(ResultWriter):
+    """Write comma-separated values with a header row."""
+
+    FORMAT_NAME: ClassVar[str] = "csv"
+
+    def __init__(self, output: Path | str | IO[Any] | None = None, chunk_size: int | None = None):
+        super().__init__(output, chunk_size)
+        self._writer = csv.writer(self.stream)
+        self._writer.writerow(OUTPUT_FIELDS)
+
+    def _write_chunk(self, batch: IPLookupResultBatch) -> None:
+        self._writer.writerows(batch.iter_rows())
+
+
+class ParquetWriter(ResultWriter):
+    """Write a Parquet file with one row group per chunk."""
+
+    FORMAT_NAME: ClassVar[str] = "parquet"
+    BINARY: ClassVar[bool] = True
+    CHUNK_SIZE: ClassVar[int] = 65536
+
+    def __init__(self, output: Path | str | IO[Any] | None = None, chunk_size: int | None = None):
+        self._pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        super().__init__(output, chunk_size)
+        self._schema = _arrow_schema(self._pa)
+        self._writer = pq.ParquetWriter(self.stream, self._schema)
+
+    def _write_chunk(self, batch: IPLookupResultBatch) -> None:
+        self._writer.write_table(batch.to_arrow(self._pa).cast(self._schema))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+class ArrowWriter(ResultWriter):
+    """Write an Arrow IPC stream with one record batch per chunk."""
+
+    FORMAT_NAME: ClassVar[str] = "arrow"
+    BINARY: ClassVar[bool] = True
+    CHUNK_SIZE: ClassVar[int] = 65536
+
+    def __init__(self, output: Path | str | IO[Any] | None = None, chunk_size: int | None = None):
+        self._pa = _import_pyarrow()
+
+        super().__init__(output, chunk_size)
+        self._schema = _arrow_schema(self._pa)
+        self._writer = self._pa.ipc.new_stream(self.stream, self._schema)
+
+    def _write_chunk(self, batch: IPLookupResultBatch) -> None:
+        self._writer.write_table(batch.to_arrow(self._pa).cast(self._schema))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+# Writer class for each output format name
+WRITERS: dict[str, type[ResultWriter]] = {
+    writer.FORMAT_NAME: writer
+    for writer in (JSONLinesWriter, CSVWriter, ParquetWriter, ArrowWriter)
+}
+
+
+def open_writer(format_name: str, output: Path | str | IO[Any] | None = None) -> ResultWriter:
+    """Open a writer for an output format.
+
+    Args:
+        format_name: The name of the format, as listed in WRITERS.
+        output: The path or open file to write to. Defaults to stdout.
+
+    Returns:
+        A writer for the format, ready to use as a context manager.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if (writer_class := WRITERS.get(format_name)) is None:
+        msg = f"Unsupported output format: {format_name}"
+        raise ValueError(msg)
+    return writer_class(output)
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, with a helpful message if it isn't installed.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError as e:
+        msg = (
+            "Parquet and Arrow output require pyarrow. Install it with: pip install iplooker[arrow]"
+        )
+        raise ImportError(msg) from e
+    return pa
+
+
+def _arrow_schema(pa: Any) -> Any:
+    """Build the Arrow schema for OUTPUT_FIELDS, matching IPLookupResultBatch.to_arrow()."""
+    columns = []
+    for name in OUTPUT_FIELDS:
+        if name == "ip":
+            columns.append(pa.field(name, pa.string()))
+        elif name in FLAG_FIELDS:
+            columns.append(pa.field(name, pa.bool_()))
+        elif name == "confidence":
+            columns.append(pa.field(name, pa.float64()))
+        else:
+            columns.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+    return pa.schema(columns)
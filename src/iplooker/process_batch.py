@@ -0,0 +1,160 @@
+"""Look up very large numbers of IP addresses across several worker processes.
+
+The thread-based BatchLookup keeps many requests in flight, but decoding responses, parsing them,
+and everything else done with the results all run in one interpreter, so at millions of addresses
+the GIL becomes the limit. ProcessBatchLookup splits the input into shards and runs a BatchLookup
+for each shard in a pool of worker processes, each with its own HTTP connections, rate limiters,
+and cache handle. Results come back as one stream in input order, and only a bounded number of
+shards are in flight at once, so a slow consumer holds up the workers rather than letting finished
+results pile up in memory.
+
+Each worker gets an equal share of every source's rate limit, so the pool as a whole stays within
+it. While metrics hooks are registered, workers record the metric events for each shard and send
+them back with its results, where they're passed on to the hooks in this process.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, ClassVar
+
+from iplooker.batch_lookup import BatchLookup
+from iplooker.ip_looker import IPLooker
+from iplooker.metrics import Metrics
+from iplooker.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+
+    from iplooker.batch_lookup import BatchLookupResult
+    from iplooker.lookup_source import IPLookupSource
+    from iplooker.metrics import MetricEvent
+
+    # The results of a shard in shard order, and the metric events recorded while looking it up
+    _ShardOutcome = tuple[list[BatchLookupResult], list[MetricEvent]]
+
+
+class ProcessBatchLookup:
+    """Look up many IP addresses by sharding them across a pool of worker processes."""
+
+    # Number of addresses sent to a worker process at a time
+    SHARD_SIZE: ClassVar[int] = 500
+
+    # Maximum number of shards in flight per worker process
+    SHARDS_PER_PROCESS: ClassVar[int] = 2
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        max_workers: int | None = None,
+        shard_size: int | None = None,
+        sources: list[type[IPLookupSource]] | None = None,
+        initializer: Callable[[], object] | None = None,
+    ):
+        """Set up a process-based batch lookup.
+
+        Args:
+            processes: The number of worker processes. Defaults to the number of CPUs available.
+            max_workers: The maximum number of concurrent source lookups in each worker process.
+            shard_size: The number of addresses sent to a worker process at a time.
+            sources: The sources to query. Defaults to IPLooker's sources.
+            initializer: A picklable function each worker process calls before its first lookup,
+                to apply settings such as the cache configuration that aren't inherited.
+        """
+        self.processes: int = max(1, processes or _available_cpus())
+        self.max_workers: int | None = max_workers
+        self.shard_size: int = max(1, shard_size or self.SHARD_SIZE)
+        self.sources: list[type[IPLookupSource]] = list(sources or IPLooker.get_lookup_sources())
+        self.initializer: Callable[[], object] | None = initializer
+
+    def run(self, lines: Iterable[str]) -> Iterator[BatchLookupResult]:
+        """Look up every unique IP address in the input and yield results in input order.
+
+        Args:
+            lines: An iterable of lines, each containing an IP address.
+
+        Yields:
+            A BatchLookupResult for each unique, valid IP address in the input.
+        """
+        ip_addresses = BatchLookup.iter_unique_ips(lines)
+        shards = iter(lambda: list(islice(ip_addresses, self.shard_size)), [])
+        max_pending = self.processes * self.SHARDS_PER_PROCESS
+        pending: deque[Future[_ShardOutcome]] = deque()
+        record_metrics = Metrics.enabled()
+
+        # Start workers fresh rather than forking, since this process may have threads running
+        executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.processes, self.initializer),
+        )
+        try:
+            for shard in shards:
+                pending.append(
+                    executor.submit(
+                        _lookup_shard, shard, self.sources, self.max_workers, record_metrics
+                    )
+                )
+                if len(pending) >= max_pending:
+                    yield from _collect_shard(pending.popleft())
+
+            while pending:
+                yield from _collect_shard(pending.popleft())
+        finally:
+            executor.shutdown(wait=not pending, cancel_futures=True)
+
+
+def _init_worker(processes: int, initializer: Callable[[], object] | None) -> None:
+    """Set up a worker process, giving it its share of every source's rate limit."""
+    if initializer is not None:
+        initializer()
+    RateLimiter.configure(share=1 / processes)
+
+
+def _lookup_shard(
+    ips: list[str],
+    sources: list[type[IPLookupSource]],
+    max_workers: int | None,
+    record_metrics: bool,
+) -> _ShardOutcome:
+    """Look up a shard of addresses in a worker process.
+
+    Returns:
+        The results in shard order, and the metric events recorded while looking them up, if
+        record_metrics is set.
+    """
+    events: list[MetricEvent] = []
+    record = events.append
+    if record_metrics:
+        Metrics.add_hook(record)
+
+    try:
+        batch = BatchLookup(max_workers=max_workers, sources=sources)
+        lookups = {item.ip_address: item for item in batch.run(ips)}
+    finally:
+        Metrics.remove_hook(record)
+    return [lookups[ip] for ip in ips], events
+
+
+def _collect_shard(future: Future[_ShardOutcome]) -> list[BatchLookupResult]:
+    """Wait for a shard, pass its metric events on to this process's hooks, and get its results."""
+    results, events = future.result()
+    for event in events:
+        Metrics.emit(
+            event.kind, event.source, event.seconds, event.status_code, event.reason, event.value
+        )
+    return results
+
+
+def _available_cpus() -> int:
+    """Get the number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS or Windows
+        return os.cpu_count() or 1
@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+
+"""Compact, memory-mapped IP range database for offline lookups.
+
+A range database is built once from a CSV file of IP ranges and their network and location details,
+then opened with mmap for lookups. Opening is near-instant regardless of size because nothing is
+read up front, and multiple processes using the same file share it through the OS page cache.
+
+The CSV needs a header row with either a `network` column (CIDR notation) or `start_ip` and `end_ip`
+columns, plus any of: country, region, city, isp, org, asn, asn_name.
+
+File layout (all integers little-endian):
+    header: magic, version, IPv4 range count, IPv6 range count, string count, record count,
+            then the byte offset of each section below
+    per address family: sorted range starts, range ends (big-endian packed addresses, which
+            compare correctly as bytes), and a record index for each range
+    records: a fixed-size row of string indexes for each distinct set of field values
+    strings: an offset table followed by the UTF-8 string data
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from ipaddress import (
+    IPv4Address,
+    IPv6Address,
+    ip_address,
+    ip_network,
+    summarize_address_range,
+)
+from itertools import starmap
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+# Fields stored for each range, in on-disk order
+RECORD_FIELDS: tuple[str, ...] = ("country", "region", "city", "isp", "org", "asn", "asn_name")
+
+_MAGIC = b"IPLRDB\x00\x01"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIIIIQQQQ")
+_INDEX = struct.Struct("<I")
+_RECORD = struct.Struct(f"<{len(RECORD_FIELDS)}I")
+_NO_STRING = 0xFFFFFFFF
+
+
+class _KeyView:
+    """Expose a packed array of fixed-width keys in the mapped file as a sequence for bisect."""
+
+    def __init__(self, buffer: memoryview, offset: int, count: int, width: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._width = width
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._offset + index * self._width
+        return bytes(self._buffer[start : start + self._width])
+
+
+class _RangeTable:
+    """Sorted, non-overlapping ranges for a single address family."""
+
+    def __init__(self, buffer: memoryview, offset: int, count: int, width: int):
+        self.starts = _KeyView(buffer, offset, count, width)
+        self.ends = _KeyView(buffer, offset + count * width, count, width)
+        self._buffer = buffer
+        self._index_offset = offset + 2 * count * width
+
+    def find(self, packed: bytes) -> tuple[int, bytes, bytes] | None:
+        """Find the range containing an address, returning (record index, start, end)."""
+        position = bisect.bisect_right(self.starts, packed) - 1
+        if position < 0:
+            return None
+
+        end = self.ends[position]
+        if packed > end:
+            return None
+
+        (record_index,) = _INDEX.unpack_from(self._buffer, self._index_offset + position * 4)
+        return record_index, self.starts[position], end
+
+
+class RangeDatabase:
+    """Look up IP addresses in a memory-mapped range database with binary search."""
+
+    # Number of decoded records to keep in memory
+    RECORD_CACHE_SIZE: ClassVar[int] = 4096
+
+    def __init__(self, path: Path | str):
+        self.path: Path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        try:
+            (
+                magic,
+                version,
+                v4_count,
+                v6_count,
+                string_count,
+                _record_count,
+                v4_offset,
+                v6_offset,
+                records_offset,
+                strings_offset,
+            ) = _HEADER.unpack_from(self._buffer, 0)
+        except struct.error as e:
+            self.close()
+            msg = f"{self.path} is not a valid range database."
+            raise ValueError(msg) from e
+
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            msg = f"{self.path} is not a valid range database."
+            raise ValueError(msg)
+
+        self._v4 = _RangeTable(self._buffer, v4_offset, v4_count, 4)
+        self._v6 = _RangeTable(self._buffer, v6_offset, v6_count, 16)
+        self._records_offset = records_offset
+        self._string_count = string_count
+        self._strings_offset = strings_offset
+        self._string_data_offset = strings_offset + (string_count + 1) * 4
+        self._read_record = lru_cache(maxsize=self.RECORD_CACHE_SIZE)(self._read_record_uncached)
+
+    def lookup(self, ip: IPv4Address | IPv6Address | str) -> dict[str, str | None] | None:
+        """Find the record for the range containing an IP address.
+
+        Args:
+            ip: The IP address to look up.
+
+        Returns:
+            A dict of the record fields plus the containing ip_range in CIDR notation, or None if
+            the address is not in any range.
+        """
+        ip_obj = ip_address(ip) if isinstance(ip, str) else ip
+        table = self._v4 if ip_obj.version == 4 else self._v6
+
+        match = table.find(ip_obj.packed)
+        if match is None:
+            return None
+
+        record_index, start, end = match
+        record = dict(self._read_record(record_index))
+        record["ip_range"] = self._containing_network(ip_obj, start, end)
+        return record
+
+    def _read_record_uncached(self, record_index: int) -> tuple[tuple[str, str | None], ...]:
+        """Decode the field values for a record."""
+        string_indexes = _RECORD.unpack_from(
+            self._buffer, self._records_offset + record_index * _RECORD.size
+        )
+        return tuple(
+            (name, None if index == _NO_STRING else self._read_string(index))
+            for name, index in zip(RECORD_FIELDS, string_indexes, strict=True)
+        )
+
+    def _read_string(self, index: int) -> str:
+        """Decode a string from the string table."""
+        start, end = struct.unpack_from("<II", self._buffer, self._strings_offset + index * 4)
+        base = self._string_data_offset
+        return str(self._buffer[base + start : base + end], "utf-8")
+
+    @staticmethod
+    def _containing_network(ip_obj: IPv4Address | IPv6Address, start: bytes, end: bytes) -> str:
+        """Get the CIDR block within a range that contains the address."""
+        first, last = ip_address(start), ip_address(end)
+        for network in summarize_address_range(first, last):  # type: ignore[type-var]
+            if ip_obj in network:
+                return str(network)
+        return f"{first}-{last}"
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if hasattr(self, "_read_record"):
+            self._read_record.cache_clear()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> RangeDatabase:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def build_range_database(csv_path: Path | str, output_path: Path | str) -> int:
+    """Build a range database from a CSV file.
+
+    Args:
+        csv_path: The path of the CSV file to read.
+        output_path: The path to write the database to.
+
+    Returns:
+        The number of ranges written.
+
+    Raises:
+        ValueError: If the CSV is missing required columns or contains overlapping ranges.
+    """
+    with Path(csv_path).open(encoding="utf-8", newline="") as f:
+        ranges = sorted(_read_ranges(csv.DictReader(f)), key=itemgetter(slice(3)))
+
+    strings: dict[str, int] = {}
+    records: dict[tuple[int, ...], int] = {}
+    tables: dict[int, list[tuple[bytes, bytes, int]]] = {4: [], 6: []}
+
+    for version, start, end, values in ranges:
+        table = tables[version]
+        if table and start <= table[-1][1]:
+            msg = f"Overlapping ranges starting at {ip_address(start)}."
+            raise ValueError(msg)
+
+        string_indexes = tuple(
+            _NO_STRING if value is None else strings.setdefault(value, len(strings))
+            for value in values
+        )
+        record_index = records.setdefault(string_indexes, len(records))
+        table.append((start, end, record_index))
+
+    _write_database(Path(output_path), tables, records, strings)
+    return len(ranges)
+
+
+def _read_ranges(
+    rows: Iterable[dict[str, str]],
+) -> Iterator[tuple[int, bytes, bytes, tuple[str | None, ...]]]:
+    """Parse CSV rows into (version, packed start, packed end, field values) tuples.
+
+    Raises:
+        ValueError: If a row has neither a network column nor start_ip and end_ip columns.
+    """
+    for row in rows:
+        if network := row.get("network"):
+            parsed = ip_network(network.strip(), strict=False)
+            first, last = parsed.network_address, parsed.broadcast_address
+        elif row.get("start_ip") and row.get("end_ip"):
+            first, last = ip_address(row["start_ip"].strip()), ip_address(row["end_ip"].strip())
+        else:
+            msg = "Each row needs either a network column or start_ip and end_ip columns."
+            raise ValueError(msg)
+
+        values = tuple((row.get(name) or "").strip() or None for name in RECORD_FIELDS)
+        yield first.version, first.packed, last.packed, _normalize_asn(values)
+
+
+def _normalize_asn(values: tuple[str | None, ...]) -> tuple[str | None, ...]:
+    """Make sure the ASN field always has the "AS" prefix used by the other sources."""
+    asn_position = RECORD_FIELDS.index("asn")
+    asn = values[asn_position]
+    if asn is None or asn.upper().startswith("AS"):
+        return values
+    return (*values[:asn_position], f"AS{asn}", *values[asn_position + 1 :])
+
+
+def _write_database(
+    path: Path,
+    tables: dict[int, list[tuple[bytes, bytes, int]]],
+    records: dict[tuple[int, ...], int],
+    strings: dict[str, int],
+) -> None:
+    """Write the sections of a range database to disk."""
+    encoded_strings = [value.encode("utf-8") for value in strings]
+    string_offsets = [0]
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    sections: list[bytes] = []
+    for version in (4, 6):
+        table = tables[version]
+        sections.append(
+            b"".join(start for start, _, _ in table)
+            + b"".join(end for _, end, _ in table)
+            + b"".join(_INDEX.pack(index) for _, _, index in table)
+        )
+    sections.extend((
+        b"".join(starmap(_RECORD.pack, records)),
+        struct.pack(f"<{len(string_offsets)}I", *string_offsets) + b"".join(encoded_strings),
+    ))
+
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(tables[4]),
+        len(tables[6]),
+        len(strings),
+        len(records),
+        *offsets,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f"{path.suffix}.tmp")
+    with temp_path.open("wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    temp_path.replace(path)
+
+
+def main() -> None:
+    """Build a range database from the command line."""
+    if len(sys.argv) != 3:
+        print("Usage: python -m iplooker.range_db <input.csv> <output.db>")
+        sys.exit(1)
+
+    count = build_range_database(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} range{'s' if count != 1 else ''} to {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
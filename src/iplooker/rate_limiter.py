@@ -0,0 +1,181 @@
+"""Per-source rate limiting with token buckets and backoff on HTTP 429.
+
+Each lookup source gets a token bucket shared by every thread and coroutine in the process. Sources
+with a known limit (set via RATE_LIMIT and RATE_LIMIT_BURST on the source class) are throttled to
+that rate, and callers queue for their turn instead of failing. When a provider still answers with
+HTTP 429, the bucket is paused for the duration of its Retry-After header (or an exponential,
+jittered backoff when there isn't one), so every pending request for that source waits together.
+
+When several processes look up in parallel, each one is configured with its share of every limit,
+so that together they stay within it.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import ClassVar
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations in arrival order.
+
+    Rather than polling for tokens, each caller reserves the next available token and is told how
+    long to wait for it. The bucket can go into debt, which naturally queues callers behind each
+    other at the configured rate.
+    """
+
+    def __init__(self, rate: float | None, capacity: float = 1):
+        self.rate: float | None = rate
+        self.capacity: float = max(1.0, capacity)
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+        self._generation: int = 0  # Incremented on every pause
+        self._lock = threading.Lock()
+
+    def reserve(self) -> tuple[float, int]:
+        """Reserve a token.
+
+        Returns:
+            A tuple of (seconds to wait before using the token, pause generation). If the bucket
+            is paused again before the wait is over, the generation changes and the reservation
+            should be made again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is None:
+                # Unlimited, apart from any pause after a rate limit response
+                return max(0.0, self._updated - now), self._generation
+
+            if now > self._updated:
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._updated = now
+
+            self._tokens -= 1
+            wait = self._updated - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return max(0.0, wait), self._generation
+
+    def acquire(self) -> None:
+        """Wait until a token is available, re-queueing if the bucket is paused meanwhile."""
+        while True:
+            wait, generation = self.reserve()
+            if wait:
+                time.sleep(wait)
+            if generation == self._generation:
+                return
+
+    async def aacquire(self) -> None:
+        """Wait until a token is available without blocking the event loop."""
+        import asyncio
+
+        while True:
+            wait, generation = self.reserve()
+            if wait:
+                await asyncio.sleep(wait)
+            if generation == self._generation:
+                return
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds.
+
+        Outstanding reservations are forgiven, and anyone still waiting on one queues again behind
+        the pause.
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._updated:
+                self._updated = until
+                self._tokens = 0.0
+                self._generation += 1
+
+
+class RateLimiter:
+    """Keep a shared token bucket per lookup source and compute backoff for rate limit responses."""
+
+    # Base delay for exponential backoff when a 429 response has no Retry-After header
+    BASE_BACKOFF: ClassVar[float] = 1.0
+
+    # Longest backoff to honor; longer Retry-After values give up instead of waiting
+    MAX_BACKOFF: ClassVar[float] = 60.0
+
+    # Fraction of each delay to add as random jitter so callers don't retry in lockstep
+    JITTER: ClassVar[float] = 0.25
+
+    _buckets: ClassVar[dict[str, TokenBucket]] = {}
+    _share: ClassVar[float] = 1.0
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def configure(cls, share: float = 1.0) -> None:
+        """Configure the fraction of each source's rate limit this process may use.
+
+        Args:
+            share: The fraction of each limit to allow, such as 1/4 in each of four processes that
+                look up at the same time. Bursts are split as well, down to one request.
+        """
+        with cls._lock:
+            cls._share = share
+            cls._buckets = {}
+
+    @classmethod
+    def get_bucket(cls, name: str, rate: float | None = None, burst: int = 1) -> TokenBucket:
+        """Get the shared token bucket for a source, creating it on first use.
+
+        Args:
+            name: The name of the source.
+            rate: The number of requests allowed per second across all processes, or None for no
+                limit.
+            burst: The number of requests that may be sent back to back across all processes.
+
+        Returns:
+            The token bucket shared by all lookups for the source.
+        """
+        if bucket := cls._buckets.get(name):
+            return bucket
+
+        with cls._lock:
+            if (bucket := cls._buckets.get(name)) is None:
+                if rate is not None:
+                    rate *= cls._share
+                bucket = cls._buckets[name] = TokenBucket(rate, burst * cls._share)
+            return bucket
+
+    @classmethod
+    def backoff_delay(cls, retry_after: str | None, attempt: int) -> float | None:
+        """Work out how long to back off after a rate limit response.
+
+        Args:
+            retry_after: The value of the Retry-After header, if there was one.
+            attempt: The number of rate limit responses already received for this request.
+
+        Returns:
+            The number of seconds to wait, including jitter, or None if the provider asked for a
+            longer wait than MAX_BACKOFF.
+        """
+        delay = cls._parse_retry_after(retry_after)
+        if delay is None:
+            delay = cls.BASE_BACKOFF * (2**attempt)
+        if delay > cls.MAX_BACKOFF:
+            return None
+        return delay + random.uniform(0, delay * cls.JITTER)
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,140 @@
+"""Pluggable JSON decoding for provider responses.
+
+Sources decode every response body straight from the raw bytes, without first copying it into a
+text string, using the fastest JSON library that's installed: orjson, then msgspec, then the
+standard library. Install orjson with `pip install iplooker[fast-json]` to use it. Some providers
+return large nested documents of which the parsers read only a handful of fields, so decoding is
+one of the larger CPU costs of a batch.
+
+Faster decoders are stricter about some inputs the standard library accepts (such as NaN), so a
+response they reject is decoded again with the standard library before it's treated as malformed.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    # Decodes a JSON document from bytes, raising ValueError if it's malformed
+    Decoder = Callable[[bytes], Any]
+
+
+def _load_orjson() -> Decoder:
+    """Get the orjson decoder."""
+    import orjson
+
+    return orjson.loads
+
+
+def _load_msgspec() -> Decoder:
+    """Get a msgspec decoder, converting its errors to ValueError like the other decoders."""
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+
+    def decode(content: bytes) -> Any:
+        try:
+            return decoder.decode(content)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decode
+
+
+def _load_stdlib() -> Decoder:
+    """Get the standard library decoder, which detects the encoding of bytes itself."""
+    return json.loads
+
+
+# Loader for each decoder backend by name
+BACKENDS: dict[str, Callable[[], Decoder]] = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": _load_stdlib,
+}
+
+
+class ResponseDecoder:
+    """Decode JSON response bodies with the fastest available backend."""
+
+    # Backends to try when none is configured, fastest first
+    PREFERRED: ClassVar[tuple[str, ...]] = ("orjson", "msgspec", "json")
+
+    _decode: ClassVar[Decoder | None] = None
+    _backend: ClassVar[str] = ""
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def configure(cls, backend: str | Decoder | None = None) -> None:
+        """Choose the decoder used for every provider response.
+
+        A named backend is imported right away, so if it isn't installed, the ImportError from
+        importing it propagates from here rather than from the first lookup.
+
+        Args:
+            backend: The name of a backend in BACKENDS, any callable that decodes JSON from bytes
+                and raises ValueError for malformed input, or None to pick the fastest installed.
+
+        Raises:
+            ValueError: If the backend name is unknown.
+        """
+        with cls._lock:
+            if backend is None:
+                cls._decode, cls._backend = None, ""
+            elif callable(backend):
+                cls._decode, cls._backend = backend, getattr(backend, "__module__", "custom")
+            elif backend in BACKENDS:
+                cls._decode, cls._backend = BACKENDS[backend](), backend
+            else:
+                msg = f"Unknown JSON backend: {backend}. Choose from: {', '.join(BACKENDS)}"
+                raise ValueError(msg)
+
+    @classmethod
+    def get_backend(cls) -> str:
+        """Get the name of the backend in use, choosing one first if needed."""
+        cls._get_decoder()
+        return cls._backend
+
+    @classmethod
+    def decode(cls, content: bytes) -> Any:
+        """Decode a JSON response body.
+
+        Args:
+            content: The raw response body.
+
+        Returns:
+            The decoded document.
+
+        Raises:
+            ValueError: If the body isn't valid JSON.
+        """
+        decode = cls._decode or cls._get_decoder()
+        try:
+            return decode(content)
+        except ValueError:
+            if decode is json.loads:
+                raise
+            return json.loads(content)
+
+    @classmethod
+    def _get_decoder(cls) -> Decoder:
+        """Get the configured decoder, or the fastest installed one if none is configured."""
+        if cls._decode is not None:
+            return cls._decode
+
+        with cls._lock:
+            if cls._decode is None:
+                for name in cls.PREFERRED:
+                    try:
+                        cls._decode = BACKENDS[name]()
+                    except ImportError:
+                        continue
+                    cls._backend = name
+                    break
+                else:
+                    cls._decode, cls._backend = json.loads, "json"
+            return cls._decode
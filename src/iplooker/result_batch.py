@@ -0,0 +1,198 @@
+"""Columnar storage for large numbers of lookup results.
+
+IPLookupResultBatch keeps results as parallel typed arrays instead of one object per result. IP
+addresses are stored as packed integers, and every string value (source names, countries, ASNs, and
+so on) is interned once in a shared string pool that the string columns index into. With many
+results per address and heavily repeated values, this takes a fraction of the memory of the
+equivalent IPLookupResult objects.
+
+The string columns' index arrays can be handed to pyarrow without copying, which is how the Parquet
+and Arrow output writers export a batch.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from ipaddress import IPv4Address, IPv6Address
+from typing import TYPE_CHECKING, Any, get_type_hints
+
+from iplooker.lookup_result import RESULT_FIELDS, IPLookupResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# Output columns: every result field, plus the confidence score for merged results
+OUTPUT_FIELDS: tuple[str, ...] = (*RESULT_FIELDS, "confidence")
+
+# Optional boolean fields, stored as -1 (unknown), 0 (false), or 1 (true)
+FLAG_FIELDS: tuple[str, ...] = tuple(
+    name for name, hint in get_type_hints(IPLookupResult).items() if hint == bool | None
+)
+
+# Optional string fields, stored as indexes into the string pool (0 means None)
+STRING_FIELDS: tuple[str, ...] = tuple(
+    name for name in RESULT_FIELDS if name != "ip" and name not in FLAG_FIELDS
+)
+
+_LOW_MASK = (1 << 64) - 1
+_FLAG_CODES: dict[bool | None, int] = {None: -1, False: 0, True: 1}
+_FLAG_VALUES: dict[int, bool | None] = {code: value for value, code in _FLAG_CODES.items()}
+
+
+class IPLookupResultBatch:
+    """Store many lookup results column by column with interned strings and packed addresses."""
+
+    def __init__(self, results: Iterable[IPLookupResult] = ()):
+        self._reset()
+        self.extend(results)
+
+    def _reset(self) -> None:
+        """Start over with empty columns and an empty string pool."""
+        self._versions = array("B")
+        self._ip_high = array("Q")  # Upper 64 bits of IPv6 addresses (0 for IPv4)
+        self._ip_low = array("Q")
+        self._strings: dict[str, array[int]] = {name: array("i") for name in STRING_FIELDS}
+        self._flags: dict[str, array[int]] = {name: array("b") for name in FLAG_FIELDS}
+        self._confidence = array("d")  # NaN when there's no confidence score
+
+        self._pool: list[str | None] = [None]
+        self._pool_index: dict[str, int] = {}
+
+    def append(self, result: IPLookupResult, confidence: float | None = None) -> None:
+        """Add a result to the batch.
+
+        Args:
+            result: The result to add.
+            confidence: The confidence score, for merged results.
+        """
+        packed = int(result.ip)
+        self._versions.append(result.ip.version)
+        self._ip_high.append(packed >> 64)
+        self._ip_low.append(packed & _LOW_MASK)
+
+        for name, column in self._strings.items():
+            column.append(self._intern(getattr(result, name)))
+        for name, column in self._flags.items():
+            flag = getattr(result, name)
+            column.append(_FLAG_CODES[None if flag is None else bool(flag)])
+
+        self._confidence.append(math.nan if confidence is None else confidence)
+
+    def extend(self, results: Iterable[IPLookupResult]) -> None:
+        """Add several results to the batch."""
+        for result in results:
+            self.append(result)
+
+    def _intern(self, value: Any) -> int:
+        """Get the pool index for a string, adding it to the pool if it's new.
+
+        Providers sometimes give non-string values for string fields, such as an integer ASN, so
+        those are stored as strings to keep every string column a valid Arrow string column.
+        """
+        if value is None:
+            return 0
+        if not isinstance(value, str):
+            value = str(value)
+        if (index := self._pool_index.get(value)) is None:
+            index = self._pool_index[value] = len(self._pool)
+            self._pool.append(value)
+        return index
+
+    def ip_at(self, index: int) -> IPv4Address | IPv6Address:
+        """Get the IP address of the result at an index."""
+        if self._versions[index] == 4:
+            return IPv4Address(self._ip_low[index])
+        return IPv6Address((self._ip_high[index] << 64) | self._ip_low[index])
+
+    def confidence_at(self, index: int) -> float | None:
+        """Get the confidence score of the result at an index, if it has one."""
+        confidence = self._confidence[index]
+        return None if math.isnan(confidence) else confidence
+
+    def iter_rows(self) -> Iterator[tuple[Any, ...]]:
+        """Iterate over the results as tuples of values in OUTPUT_FIELDS order.
+
+        The IP address is given as a string, so rows can be serialized directly.
+        """
+        pool = self._pool
+        columns: list[Any] = []
+        for name in OUTPUT_FIELDS[1:-1]:
+            if name in self._strings:
+                columns.append([pool[index] for index in self._strings[name]])
+            else:
+                columns.append([_FLAG_VALUES[code] for code in self._flags[name]])
+
+        ips = (str(self.ip_at(index)) for index in range(len(self)))
+        confidence = (None if math.isnan(value) else value for value in self._confidence)
+        return zip(ips, *columns, confidence, strict=True)
+
+    def to_arrow(self, pa: Any) -> Any:
+        """Export the batch as a pyarrow Table.
+
+        String columns become dictionary arrays whose index buffers are wrapped without copying,
+        with the string pool converted once into their shared dictionary. Their validity bitmaps,
+        the flag and confidence columns, and the IP address column are new arrays built from the
+        batch. The batch must not be modified while the table is in use.
+
+        Args:
+            pa: The imported pyarrow module.
+
+        Returns:
+            A table with a column for each name in OUTPUT_FIELDS.
+        """
+        import pyarrow.compute as pc
+
+        size = len(self)
+        dictionary = pa.array(["", *self._pool[1:]], type=pa.string())
+        columns = [pa.array([str(self.ip_at(index)) for index in range(size)], type=pa.string())]
+
+        for name in OUTPUT_FIELDS[1:-1]:
+            if name in self._strings:
+                buffer = pa.py_buffer(self._strings[name])
+                indices = pa.Array.from_buffers(pa.int32(), size, [None, buffer])
+
+                # Index 0 stands for None, so use the nonzero bitmap as the validity bitmap
+                valid = pc.not_equal(indices, 0).buffers()[1]
+                indices = pa.Array.from_buffers(pa.int32(), size, [valid, buffer])
+                columns.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                codes = _wrap_array(pa, pa.int8(), self._flags[name], size)
+                columns.append(
+                    pc.if_else(pc.less(codes, 0), pa.scalar(None, pa.bool_()), pc.equal(codes, 1))
+                )
+
+        confidence = _wrap_array(pa, pa.float64(), self._confidence, size)
+        columns.append(pc.if_else(pc.is_nan(confidence), pa.scalar(None, pa.float64()), confidence))
+        return pa.Table.from_arrays(columns, names=list(OUTPUT_FIELDS))
+
+    def clear(self) -> None:
+        """Remove every result and release the string pool.
+
+        The arrays are replaced rather than emptied, so tables exported with to_arrow() stay valid.
+        """
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def __getitem__(self, index: int) -> IPLookupResult:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "batch index out of range"
+            raise IndexError(msg)
+
+        values: dict[str, Any] = {
+            name: self._pool[column[index]] for name, column in self._strings.items()
+        }
+        values.update((name, _FLAG_VALUES[column[index]]) for name, column in self._flags.items())
+        return IPLookupResult(ip=self.ip_at(index), **values)
+
+    def __iter__(self) -> Iterator[IPLookupResult]:
+        return (self[index] for index in range(len(self)))
+
+
+def _wrap_array(pa: Any, arrow_type: Any, values: array[Any], size: int) -> Any:
+    """Wrap a Python array's buffer as a pyarrow array without copying it."""
+    return pa.Array.from_buffers(arrow_type, size, [None, pa.py_buffer(values)])
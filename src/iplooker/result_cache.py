@@ -0,0 +1,208 @@
+"""Persistent on-disk cache of lookup results.
+
+Results are stored per (source, IP address) in a small SQLite database under the user cache
+directory, so looking up the same address again within a source's TTL skips both the HTTP request
+and response parsing. The cache is capped in size and evicts the least recently used entries first.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import ClassVar
+
+from iplooker.lookup_result import IPLookupResult
+
+
+class ResultCache:
+    """Cache lookup results on disk with per-source TTLs and LRU eviction."""
+
+    # Maximum number of cached results before the least recently used are evicted
+    MAX_ENTRIES: ClassVar[int] = 50_000
+
+    # How many writes to allow between checks of the size cap
+    EVICTION_INTERVAL: ClassVar[int] = 100
+
+    # Environment variable that overrides the cache directory
+    CACHE_DIR_VAR: ClassVar[str] = "IPLOOKER_CACHE_DIR"
+
+    _shared: ClassVar[ResultCache | None] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    _enabled: ClassVar[bool] = True
+    _refresh: ClassVar[bool] = False
+
+    def __init__(self, path: Path, max_entries: int | None = None, refresh: bool = False):
+        self.path: Path = path
+        self.max_entries: int = max_entries or self.MAX_ENTRIES
+        self.refresh: bool = refresh
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                source TEXT NOT NULL,
+                ip TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (source, ip)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)"
+        )
+
+    @classmethod
+    def configure(
+        cls, enabled: bool = True, refresh: bool = False, path: Path | None = None
+    ) -> None:
+        """Configure the shared cache used by all lookup sources.
+
+        Args:
+            enabled: Whether to use the cache at all.
+            refresh: Whether to ignore cached results and overwrite them with fresh lookups.
+            path: The path of the cache database. Defaults to the user cache directory.
+        """
+        with cls._shared_lock:
+            cls._enabled = enabled
+            cls._refresh = refresh
+            if cls._shared:
+                cls._shared.close()
+            cls._shared = None
+            if enabled and path:
+                cls._shared = cls._open(path)
+
+    @classmethod
+    def get_shared(cls) -> ResultCache | None:
+        """Get the shared cache, opening it on first use, or None if caching is disabled."""
+        if cls._shared or not cls._enabled:
+            return cls._shared
+
+        with cls._shared_lock:
+            if cls._shared is None and cls._enabled:
+                cls._shared = cls._open(cls.default_path())
+                cls._enabled = cls._shared is not None
+            return cls._shared
+
+    @classmethod
+    def _open(cls, path: Path) -> ResultCache | None:
+        """Open a cache at the given path, or return None if it can't be opened."""
+        try:
+            return cls(path, refresh=cls._refresh)
+        except (OSError, sqlite3.Error):
+            return None
+
+    @classmethod
+    def default_path(cls) -> Path:
+        """Get the default location of the cache database."""
+        if cache_dir := os.environ.get(cls.CACHE_DIR_VAR):
+            return Path(cache_dir) / "results.sqlite3"
+
+        base_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(base_dir) / "iplooker" / "results.sqlite3"
+
+    def get(self, source: str, ip: str, ttl: float) -> IPLookupResult | None:
+        """Get a cached result if one exists and is younger than the TTL.
+
+        Args:
+            source: The name of the source the result came from.
+            ip: The normalized IP address that was looked up.
+            ttl: The maximum age of the result in seconds.
+
+        Returns:
+            The cached IPLookupResult, or None on a miss or when refreshing.
+        """
+        if self.refresh:
+            return None
+
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT data, created_at FROM results WHERE source = ? AND ip = ?",
+                    (source, ip),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+
+            data, created_at = row
+            try:
+                if now - created_at > ttl:
+                    self._conn.execute(
+                        "DELETE FROM results WHERE source = ? AND ip = ?", (source, ip)
+                    )
+                    return None
+
+                # Mark the entry as recently used so it survives eviction
+                self._conn.execute(
+                    "UPDATE results SET accessed_at = ? WHERE source = ? AND ip = ?",
+                    (now, source, ip),
+                )
+            except sqlite3.Error:
+                return None
+
+        try:
+            return IPLookupResult.from_dict(json.loads(data))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, source: str, ip: str, result: IPLookupResult) -> None:
+        """Store a result in the cache, evicting old entries if the cache is over its cap.
+
+        Args:
+            source: The name of the source the result came from.
+            ip: The normalized IP address that was looked up.
+            result: The result to store.
+        """
+        now = time.time()
+        data = json.dumps(result.to_dict(), separators=(",", ":"))
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (source, ip, data, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (source, ip, data, now, now),
+                )
+            except sqlite3.Error:
+                return
+
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                with contextlib.suppress(sqlite3.Error):
+                    self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond the size cap."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count <= self.max_entries:
+            return
+
+        self._conn.execute(
+            "DELETE FROM results WHERE (source, ip) IN "
+            "(SELECT source, ip FROM results ORDER BY accessed_at LIMIT ?)",
+            (count - self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        """Delete every cached result."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,179 @@
+"""Merge per-source lookup results into a single consensus result.
+
+Each field is normalized with the same standardization used for display, then decided by a weighted
+vote across the sources that reported it. The merged result records how confident the vote was and
+which sources agreed with each field, so callers don't need to re-implement voting over every
+source's result.
+
+Merging is meant to run over every IP in batch mode, so normalization is memoized per distinct raw
+value and each merge is a single pass over the results with no per-call setup.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from iplooker.ip_formatter import IPFormatter
+from iplooker.lookup_result import IPLookupResult
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+# Name used as the source of merged results
+MERGED_SOURCE_NAME = "consensus"
+
+# Formatter used only for its standardize_* methods, which don't depend on the IP address
+_formatter = IPFormatter("")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_country(value: str) -> str | None:
+    return _formatter.standardize_country(value.strip()) or None
+
+
+@lru_cache(maxsize=16384)
+def _normalize_region(value: str) -> str | None:
+    return _formatter.standardize_region_and_city(value.strip(), "")[0] or None
+
+
+@lru_cache(maxsize=65536)
+def _normalize_city(value: str) -> str | None:
+    return _formatter.standardize_region_and_city("", value.strip())[1] or None
+
+
+@lru_cache(maxsize=65536)
+def _normalize_isp(value: str) -> str | None:
+    return _formatter.standardize_isp_and_org(value.strip(), "")
+
+
+@lru_cache(maxsize=65536)
+def _normalize_org(value: str) -> str | None:
+    return _formatter.standardize_isp_and_org("", value.strip())
+
+
+@lru_cache(maxsize=65536)
+def _normalize_asn(value: str) -> str | None:
+    asn = value.strip().upper()
+    if not asn:
+        return None
+    return asn if asn.startswith("AS") else f"AS{asn}"
+
+
+@lru_cache(maxsize=65536)
+def _normalize_text(value: str) -> str | None:
+    return value.strip() or None
+
+
+def _normalize_flag(value: Any) -> Any:
+    return value
+
+
+# Normalizer for each merged field. Values that normalize to None are treated as not reported.
+_NORMALIZERS: dict[str, Callable[[Any], Any]] = {
+    "country": _normalize_country,
+    "region": _normalize_region,
+    "city": _normalize_city,
+    "isp": _normalize_isp,
+    "org": _normalize_org,
+    "asn": _normalize_asn,
+    "asn_name": _normalize_text,
+    "ip_range": _normalize_text,
+    "is_vpn": _normalize_flag,
+    "vpn_service": _normalize_text,
+    "is_proxy": _normalize_flag,
+    "is_tor": _normalize_flag,
+    "is_datacenter": _normalize_flag,
+    "is_anonymous": _normalize_flag,
+}
+
+
+@dataclass
+class MergedResult:
+    """A consensus result for one IP address, with the confidence and sources behind each field."""
+
+    result: IPLookupResult
+    confidence: float = 0.0
+    field_confidence: dict[str, float] = field(default_factory=dict)
+    provenance: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+
+class ResultMerger:
+    """Vote on each field across the results from every source to build one merged result."""
+
+    # Default vote weight per source name; sources not listed get a weight of 1
+    SOURCE_WEIGHTS: ClassVar[dict[str, float]] = {}
+
+    # Fields that count towards the overall confidence score
+    CONFIDENCE_FIELDS: ClassVar[tuple[str, ...]] = ("country", "region", "city", "isp", "asn")
+
+    def __init__(self, weights: Mapping[str, float] | None = None):
+        self.weights: dict[str, float] = {**self.SOURCE_WEIGHTS, **(weights or {})}
+
+    def merge(self, results: Iterable[IPLookupResult]) -> MergedResult | None:
+        """Merge the results from each source for a single IP address.
+
+        Each field takes the normalized value with the highest total weight among the sources that
+        reported it. Ties go to the value reported first, so results in LOOKUP_SOURCES order favor
+        earlier sources.
+
+        Args:
+            results: The results to merge, all for the same IP address.
+
+        Returns:
+            The merged result, or None if there were no results.
+        """
+        results = list(results)
+        if not results:
+            return None
+
+        merged = MergedResult(IPLookupResult(ip=results[0].ip, source=MERGED_SOURCE_NAME))
+        source_weights = [self.weights.get(result.source, 1.0) for result in results]
+
+        for name, normalize in _NORMALIZERS.items():
+            if vote := self._vote(results, source_weights, name, normalize):
+                value, confidence, sources = vote
+                setattr(merged.result, name, value)
+                merged.field_confidence[name] = confidence
+                merged.provenance[name] = sources
+
+        scores = [merged.field_confidence.get(name, 0.0) for name in self.CONFIDENCE_FIELDS]
+        merged.confidence = sum(scores) / len(scores)
+        return merged
+
+    @staticmethod
+    def _vote(
+        results: list[IPLookupResult],
+        source_weights: list[float],
+        name: str,
+        normalize: Callable[[Any], Any],
+    ) -> tuple[Any, float, tuple[str, ...]] | None:
+        """Pick the winning value for one field.
+
+        Returns:
+            A tuple of (value, share of the reporting weight that agreed, agreeing source names),
+            or None if no source reported the field or every reporting source had a weight of zero.
+        """
+        # Normalized values compare case-insensitively; keep the first spelling seen for display
+        tallies: dict[Any, list[Any]] = {}
+        total = 0.0
+
+        for result, weight in zip(results, source_weights, strict=True):
+            raw = getattr(result, name)
+            if raw is None or (value := normalize(raw)) is None:
+                continue
+
+            key = value.casefold() if isinstance(value, str) else value
+            if (tally := tallies.get(key)) is None:
+                tally = tallies[key] = [0.0, value, []]
+            tally[0] += weight
+            tally[2].append(result.source)
+            total += weight
+
+        if not tallies or total <= 0:
+            return None
+
+        weight, value, sources = max(tallies.values(), key=itemgetter(0))
+        return value, weight / total, tuple(sources)
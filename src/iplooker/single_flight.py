@@ -0,0 +1,181 @@
+"""Request coalescing for duplicate lookups that are in flight at the same time.
+
+When the same address is looked up by several threads or coroutines at once, as happens with
+repeated addresses in web logs or with many clients of the lookup server, only the first caller
+for each (source, address) pair sends a request. Everyone else who asks before it finishes waits
+for that request and gets the same outcome. Nothing is kept once the request finishes, so this
+never serves stale data: it only removes duplicate work that would otherwise overlap.
+
+Threads and coroutines share the same in-flight calls, so a coroutine can wait on a lookup that
+a thread started and the other way around.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class _AbandonedError(Exception):
+    """Raised to waiters when the caller running a call gave up without an outcome."""
+
+
+class SingleFlight:
+    """Share one in-flight call between every concurrent caller with the same key."""
+
+    _shared: ClassVar[SingleFlight | None] = None
+    _enabled: ClassVar[bool] = True
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, enabled: bool = True) -> None:
+        """Configure whether lookup sources coalesce duplicate in-flight lookups.
+
+        Args:
+            enabled: Whether concurrent lookups of the same address by a source share one request.
+        """
+        with cls._shared_lock:
+            cls._enabled = enabled
+            cls._shared = None
+
+    @classmethod
+    def get_shared(cls) -> SingleFlight | None:
+        """Get the instance shared by all lookup sources, or None if coalescing is disabled."""
+        if cls._shared or not cls._enabled:
+            return cls._shared
+
+        with cls._shared_lock:
+            if cls._shared is None and cls._enabled:
+                cls._shared = cls()
+            return cls._shared
+
+    def do[T](self, key: Hashable, func: Callable[[], T]) -> tuple[T, bool]:
+        """Call a function, or wait for the call already in flight for the same key.
+
+        If the function raises, the exception propagates to the caller that made the call and to
+        every caller that waited on it.
+
+        Args:
+            key: The key identifying duplicate calls.
+            func: The function to call if no call for the key is in flight.
+
+        Returns:
+            A tuple of (return value, shared), where shared is True if the value came from a call
+            made by another caller.
+        """
+        future, is_owner = self.claim(key)
+        if is_owner:
+            return self._run(key, future, func), False
+        return self.join(key, future, func), True
+
+    def join[T](self, key: Hashable, future: Future[Any], func: Callable[[], T]) -> T:
+        """Wait for a call claimed by another caller, making it ourselves if that caller gives up.
+
+        Args:
+            key: The key the call was claimed with.
+            future: The future returned by claim().
+            func: The function to call if the other caller abandons the call.
+
+        Returns:
+            The call's return value.
+        """
+        try:
+            return future.result()
+        except _AbandonedError:
+            return self.do(key, func)[0]
+
+    async def ado[T](self, key: Hashable, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Await a coroutine function, or wait for the call already in flight for the same key.
+
+        This is the asyncio counterpart of do(), and shares its in-flight calls. A caller that's
+        cancelled while waiting leaves the call running for everyone else, and if the caller
+        running the call is cancelled, the next waiter makes the call instead.
+
+        Args:
+            key: The key identifying duplicate calls.
+            func: The coroutine function to await if no call for the key is in flight.
+
+        Returns:
+            A tuple of (return value, shared), where shared is True if the value came from a call
+            made by another caller.
+        """
+        import asyncio
+
+        while True:
+            future, is_owner = self.claim(key)
+            if not is_owner:
+                try:
+                    return await asyncio.shield(asyncio.wrap_future(future)), True
+                except _AbandonedError:
+                    continue
+
+            try:
+                value = await func()
+            except BaseException as e:
+                self.settle(key, future, error=e)
+                raise
+            self.settle(key, future, value)
+            return value, False
+
+    def claim(self, key: Hashable) -> tuple[Future[Any], bool]:
+        """Get the call in flight for a key, or start one that the caller must settle().
+
+        Args:
+            key: The key identifying duplicate calls.
+
+        Returns:
+            A tuple of (future, is_owner). If is_owner is True, the caller must make the call and
+            pass its outcome to settle(); otherwise the future resolves once the owner does.
+        """
+        with self._lock:
+            if (future := self._calls.get(key)) is not None:
+                return future, False
+
+            future = self._calls[key] = Future()
+            future.set_running_or_notify_cancel()  # Waiters can't cancel it for each other
+            return future, True
+
+    def settle(
+        self,
+        key: Hashable,
+        future: Future[Any],
+        value: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Hand the outcome of a claimed call to its waiters and stop tracking it.
+
+        Args:
+            key: The key the call was claimed with.
+            future: The future returned by claim().
+            value: The call's return value.
+            error: The exception the call raised, if it failed. Waiters get the same exception,
+                except for cancellation and interrupts, which make them try again instead.
+        """
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+        if error is None:
+            future.set_result(value)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_exception(_AbandonedError())
+
+    def _run[T](self, key: Hashable, future: Future[Any], func: Callable[[], T]) -> T:
+        """Make a claimed call and settle it with the outcome."""
+        try:
+            value = func()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            raise
+        self.settle(key, future, value)
+        return value
@@ -0,0 +1,60 @@
+"""Import lookup sources on first use.
+
+Each source is only imported when it's first accessed (as an attribute of iplooker.sources or
+through load_sources()), so importing iplooker stays fast for code paths that never query a
+provider.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from iplooker.lookup_source import IPLookupSource
+
+# Module in iplooker.sources that defines each source class, in the default lookup order
+SOURCE_MODULES: dict[str, str] = {
+    "IPAPICoLookup": "ipapi_co",
+    "IPAPIIsLookup": "ipapi_is",
+    "IPAPILookup": "ip_api_com",
+    "IPDataLookup": "ipdata_co",
+    "IPGeolocationLookup": "ipgeolocation_io",
+    "IPInfoLookup": "ipinfo_io",
+    "IPLocateLookup": "iplocate_io",
+    "IPRegistryLookup": "ipregistry_co",
+    "LocalDBLookup": "local_db",
+}
+
+
+def load_sources(names: Iterable[str] | None = None) -> list[type[IPLookupSource]]:
+    """Import and return source classes by name.
+
+    Args:
+        names: The class names of the sources to load. Defaults to every source, in the default
+            lookup order.
+
+    Returns:
+        The source classes, in the order given.
+    """
+    return [load_source(name) for name in (names or SOURCE_MODULES)]
+
+
+def load_source(name: str) -> type[IPLookupSource]:
+    """Import and return a source class by name.
+
+    Args:
+        name: The class name of the source.
+
+    Returns:
+        The source class.
+
+    Raises:
+        AttributeError: If the name isn't a known source class.
+    """
+    if (module_name := SOURCE_MODULES.get(name)) is None:
+        msg = f"module 'iplooker.sources' has no attribute {name!r}"
+        raise AttributeError(msg)
+    return getattr(import_module(f"iplooker.sources.{module_name}"), name)
@@ -1,10 +1,44 @@
+"""Lookup sources, imported on first use.
+
+Each source is only imported when it's first accessed as an attribute of this package or through
+load_sources(), so importing iplooker stays fast for code paths that never query a provider. The
+source classes and their modules are listed in iplooker.source_loader.
+"""
+
 from __future__ import annotations
 
-from .ip_api_com import IPAPILookup
-from .ipapi_co import IPAPICoLookup
-from .ipapi_is import IPAPIIsLookup
-from .ipdata_co import IPDataLookup
-from .ipgeolocation_io import IPGeolocationLookup
-from .ipinfo_io import IPInfoLookup
-from .iplocate_io import IPLocateLookup
-from .ipregistry_co import IPRegistryLookup
+from typing import TYPE_CHECKING
+
+from iplooker.source_loader import load_source, load_sources
+
+if TYPE_CHECKING:
+    from iplooker.lookup_source import IPLookupSource
+
+    from .ip_api_com import IPAPILookup
+    from .ipapi_co import IPAPICoLookup
+    from .ipapi_is import IPAPIIsLookup
+    from .ipdata_co import IPDataLookup
+    from .ipgeolocation_io import IPGeolocationLookup
+    from .ipinfo_io import IPInfoLookup
+    from .iplocate_io import IPLocateLookup
+    from .ipregistry_co import IPRegistryLookup
+    from .local_db import LocalDBLookup
+
+__all__ = [  # noqa: F822
+    "IPAPICoLookup",
+    "IPAPIIsLookup",
+    "IPAPILookup",
+    "IPDataLookup",
+    "IPGeolocationLookup",
+    "IPInfoLookup",
+    "IPLocateLookup",
+    "IPRegistryLookup",
+    "LocalDBLookup",
+    "load_sources",
+]
+
+
+def __getattr__(name: str) -> type[IPLookupSource]:
+    source_class = load_source(name)
+    globals()[name] = source_class
+    return source_class
@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import Any, ClassVar
 
-from iplooker.lookup_result import IPLookupResult
 from iplooker.lookup_source import IPLookupSource
 
-if TYPE_CHECKING:
-    from ipaddress import IPv4Address, IPv6Address
-
 
 class IPAPILookup(IPLookupSource):
     """Perform IP lookups using the IP-API.com service."""
@@ -18,29 +14,24 @@ class IPAPILookup(IPLookupSource):
     SUCCESS_VALUES: ClassVar[dict[str, Any]] = {"status": "success"}
     ERROR_MSG_KEYS: ClassVar[list[str]] = ["message"]
 
-    @classmethod
-    def _parse_response(
-        cls, data: dict[str, Any], ip_obj: IPv4Address | IPv6Address
-    ) -> IPLookupResult | None:
-        """Parse the IP-API response into a LookupResult."""
-        result = IPLookupResult(
-            ip=ip_obj,
-            source=cls.SOURCE_NAME,
-            country=data.get("country"),
-            region=data.get("regionName"),
-            city=data.get("city"),
-            isp=data.get("isp"),
-            org=data.get("org"),
-        )
-
-        # Extract ASN information if available
-        if as_info := data.get("as"):
-            # Format is typically "AS#### Organization Name"
-            if " " in as_info:
-                asn_part, org_name = as_info.split(" ", 1)
-                result.asn = asn_part
-                result.asn_name = org_name
-            else:
-                result.asn = as_info
-
-        return result
+    # The free tier allows 45 requests per minute, so stay safely below that
+    RATE_LIMIT: ClassVar[float | None] = 40 / 60
+    RATE_LIMIT_BURST: ClassVar[int] = 5
+
+    # The batch endpoint takes up to 100 IPs per request, 15 requests per minute
+    BATCH_SIZE: ClassVar[int] = 100
+    BATCH_URL: ClassVar[str | None] = "http://ip-api.com/batch"
+    BATCH_IP_KEY: ClassVar[str] = "query"
+    BATCH_RATE_LIMIT: ClassVar[float | None] = 12 / 60
+    BATCH_RATE_LIMIT_BURST: ClassVar[int] = 3
+
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {
+        "country": "country",
+        "region": "regionName",
+        "city": "city",
+        "isp": "isp",
+        "org": "org",
+        # Format is typically "AS#### Organization Name"
+        "asn": "as|asn_number",
+        "asn_name": "as|asn_name",
+    }
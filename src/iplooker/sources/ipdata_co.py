@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import ClassVar
 
-from iplooker.lookup_result import IPLookupResult
 from iplooker.lookup_source import IPLookupSource
 
-if TYPE_CHECKING:
-    from ipaddress import IPv4Address, IPv6Address
-
 
 class IPDataLookup(IPLookupSource):
     """Perform IP lookups using the ipdata.co service."""
@@ -17,35 +13,20 @@ class IPDataLookup(IPLookupSource):
     API_KEY_PARAM: ClassVar[str | None] = "api-key"
     ERROR_KEYS: ClassVar[list[str]] = ["error"]
     ERROR_MSG_KEYS: ClassVar[list[str]] = ["message"]
-
-    @classmethod
-    def _parse_response(
-        cls, data: dict[str, Any], ip_obj: IPv4Address | IPv6Address
-    ) -> IPLookupResult:
-        """Parse the ipdata.co response into a LookupResult."""
-        result = IPLookupResult(
-            ip=ip_obj,
-            source=cls.SOURCE_NAME,
-            country=data.get("country_name"),
-            region=data.get("region"),
-            city=data.get("city"),
-        )
-
-        # Extract ASN information for ISP/org
-        if asn_data := data.get("asn"):
-            result.isp = asn_data.get("domain")
-            result.org = asn_data.get("name")
-            if asn_num := asn_data.get("asn"):
-                result.asn = f"AS{asn_num}" if not str(asn_num).startswith("AS") else str(asn_num)
-            result.asn_name = asn_data.get("name")
-            if route := asn_data.get("route"):
-                result.ip_range = route
-
-        # Security information
-        if threat := data.get("threat", {}):
-            result.is_tor = threat.get("is_tor")
-            result.is_proxy = threat.get("is_proxy")
-            result.is_datacenter = threat.get("is_datacenter")
-            result.is_anonymous = threat.get("is_anonymous")
-
-        return result
+    BATCH_SIZE: ClassVar[int] = 100
+    BATCH_URL: ClassVar[str | None] = "https://api.ipdata.co/bulk"
+
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {
+        "country": "country_name",
+        "region": "region",
+        "city": "city",
+        "isp": "asn.domain",
+        "org": "asn.name",
+        "asn": "asn.asn|asn",
+        "asn_name": "asn.name",
+        "ip_range": "asn.route|or_none",
+        "is_tor": "threat.is_tor",
+        "is_proxy": "threat.is_proxy",
+        "is_datacenter": "threat.is_datacenter",
+        "is_anonymous": "threat.is_anonymous",
+    }
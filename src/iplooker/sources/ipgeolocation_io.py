@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import Any, ClassVar
 
-from iplooker.lookup_result import IPLookupResult
 from iplooker.lookup_source import IPLookupSource
 
-if TYPE_CHECKING:
-    from ipaddress import IPv4Address, IPv6Address
-
 
 class IPGeolocationLookup(IPLookupSource):
     """Perform IP lookups using the ipgeolocation.io service."""
@@ -19,6 +15,12 @@ class IPGeolocationLookup(IPLookupSource):
     ERROR_MSG_KEYS: ClassVar[list[str]] = ["message"]
     SUCCESS_VALUES: ClassVar[dict[str, Any]] = {"status": 200}
 
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {
+        "country": "location.country_name",
+        "region": "location.state_prov",
+        "city": "location.city",
+    }
+
     @classmethod
     def _prepare_request(cls, ip: str, key: str) -> tuple[str, dict[str, Any], dict[str, str]]:
         """Prepare request for ipgeolocation.io API which expects IP as a query parameter."""
@@ -31,18 +33,3 @@ class IPGeolocationLookup(IPLookupSource):
             params[cls.API_KEY_PARAM] = key
 
         return url, params, headers
-
-    @classmethod
-    def _parse_response(
-        cls, data: dict[str, Any], ip_obj: IPv4Address | IPv6Address
-    ) -> IPLookupResult:
-        """Parse the ipgeolocation.io response into a LookupResult."""
-        result = IPLookupResult(ip=ip_obj, source=cls.SOURCE_NAME)
-
-        # Extract location information
-        if location := data.get("location", {}):
-            result.country = location.get("country_name")
-            result.region = location.get("state_prov")
-            result.city = location.get("city")
-
-        return result
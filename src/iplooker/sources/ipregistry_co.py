@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, ClassVar
 
-from iplooker.lookup_result import IPLookupResult
 from iplooker.lookup_source import IPLookupSource
 
 if TYPE_CHECKING:
     from ipaddress import IPv4Address, IPv6Address
 
+    from iplooker.lookup_result import IPLookupResult
+
 
 class IPRegistryLookup(IPLookupSource):
     """Perform IP lookups using the IPRegistry API."""
@@ -16,60 +17,38 @@ class IPRegistryLookup(IPLookupSource):
     API_URL: ClassVar[str] = "https://api.ipregistry.co/{ip}"
     REQUIRES_USER_KEY: ClassVar[bool] = True
     API_KEY_PARAM: ClassVar[str | None] = "key"
+    BATCH_SIZE: ClassVar[int] = 256
+    BATCH_URL: ClassVar[str | None] = "https://api.ipregistry.co/{ips}"
+
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {
+        "country": "location.country.name",
+        "region": "location.region.name",
+        "city": "location.city",
+        "isp": "connection.domain",
+        "org": ("connection.organization", "company.name"),
+        "asn": "connection.asn|asn",
+        "asn_name": "connection.organization",
+        "ip_range": "connection.route|or_none",
+        "is_vpn": "security.is_vpn",
+        "is_proxy": "security.is_proxy",
+        "is_tor": "security.is_tor",
+        "is_datacenter": "security.is_cloud_provider",
+        "is_anonymous": "security.is_anonymous",
+    }
+
+    @classmethod
+    def _prepare_batch_request(
+        cls, ips: list[str], key: str
+    ) -> tuple[str, dict[str, Any], dict[str, str], Any]:
+        """Prepare a bulk request, which IPRegistry takes as a comma-separated list in the URL."""
+        _, params, headers = cls._prepare_request("", key)
+        return (cls.BATCH_URL or "").format(ips=",".join(ips)), params, headers, None
 
     @classmethod
     def _parse_response(
         cls, data: dict[str, Any], ip_obj: IPv4Address | IPv6Address
-    ) -> IPLookupResult:
-        """Parse the IPRegistry API response into a LookupResult."""
-        # Handle the case where the response has a 'results' array
+    ) -> IPLookupResult | None:
+        """Parse the IPRegistry API response, which may be wrapped in a 'results' array."""
         if "results" in data and isinstance(data["results"], list) and data["results"]:
             data = data["results"][0]
-
-        result = IPLookupResult(ip=ip_obj, source=cls.SOURCE_NAME)
-
-        cls._extract_location_info(data, result)
-        cls._extract_connection_info(data, result)
-        cls._extract_security_info(data, result)
-
-        return result
-
-    @classmethod
-    def _extract_location_info(cls, data: dict[str, Any], result: IPLookupResult) -> None:
-        """Extract location information from the location field."""
-        if location := data.get("location", {}):
-            if country := location.get("country", {}):
-                result.country = country.get("name")
-
-            if region := location.get("region", {}):
-                result.region = region.get("name")
-
-            result.city = location.get("city")
-
-    @classmethod
-    def _extract_connection_info(cls, data: dict[str, Any], result: IPLookupResult) -> None:
-        """Extract organization, ISP, and ASN information from connection field."""
-        if connection := data.get("connection", {}):
-            result.isp = connection.get("domain")
-            result.org = connection.get("organization")
-
-            # Extract ASN information if available
-            if asn_num := connection.get("asn"):
-                result.asn = f"AS{asn_num}" if not str(asn_num).startswith("AS") else str(asn_num)
-            if asn_name := connection.get("organization"):
-                result.asn_name = asn_name
-            if route := connection.get("route"):
-                result.ip_range = route
-
-        elif company := data.get("company", {}):
-            result.org = company.get("name")
-
-    @classmethod
-    def _extract_security_info(cls, data: dict[str, Any], result: IPLookupResult) -> None:
-        """Extract security-related information from the security field."""
-        if security := data.get("security", {}):
-            result.is_vpn = security.get("is_vpn")
-            result.is_proxy = security.get("is_proxy")
-            result.is_tor = security.get("is_tor")
-            result.is_datacenter = security.get("is_cloud_provider")
-            result.is_anonymous = security.get("is_anonymous")
+        return super()._parse_response(data, ip_obj)
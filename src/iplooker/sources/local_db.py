@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from iplooker.lookup_source import IPLookupSource
+from iplooker.range_db import RangeDatabase
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class LocalDBLookup(IPLookupSource):
+    """Perform IP lookups offline using a local memory-mapped range database.
+
+    The database is built with `python -m iplooker.range_db` and its path is read from the
+    IPLOOKER_LOCAL_DB environment variable. If the variable isn't set, the source is silently
+    skipped, the same as a remote source without an API key.
+    """
+
+    SOURCE_NAME: ClassVar[str] = "local database"
+    API_URL: ClassVar[str] = ""
+    REQUIRES_KEY: ClassVar[bool] = False
+
+    # Local lookups are already faster than a cache round trip
+    CACHE_TTL: ClassVar[int] = 0
+
+    # Environment variable holding the path of the range database
+    DB_PATH_VAR: ClassVar[str] = "IPLOOKER_LOCAL_DB"
+
+    _database: ClassVar[RangeDatabase | None] = None
+    _database_path: ClassVar[str | None] = None
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    FIELD_MAP: ClassVar[dict[str, str | tuple[str, ...]]] = {
+        "country": "country",
+        "region": "region",
+        "city": "city",
+        "isp": "isp",
+        "org": "org",
+        "asn": "asn",
+        "asn_name": "asn_name",
+        "ip_range": "ip_range",
+    }
+
+    @classmethod
+    def get_database(cls) -> RangeDatabase | None:
+        """Get the configured range database, opening it on first use."""
+        path = os.environ.get(cls.DB_PATH_VAR)
+        if not path:
+            return None
+
+        if cls._database is not None and cls._database_path == path:
+            return cls._database
+
+        with cls._lock:
+            if cls._database is None or cls._database_path != path:
+                if cls._database is not None:
+                    cls._database.close()
+                cls._database = RangeDatabase(path)
+                cls._database_path = path
+            return cls._database
+
+    @classmethod
+    def _prepare_request(cls, ip: str, key: str) -> tuple[str, dict[str, Any], dict[str, str]]:  # noqa: ARG003
+        """Use the IP address itself in place of a URL, since there's no remote request."""
+        return ip, {}, {}
+
+    @classmethod
+    def _make_request_with_reason(
+        cls,
+        url: str,
+        params: dict[str, Any] | None = None,  # noqa: ARG003
+        headers: dict[str, str] | None = None,  # noqa: ARG003
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Look up the IP address in the local database instead of making an HTTP request."""
+        try:
+            database = cls.get_database()
+        except (OSError, ValueError):
+            return None, "database unavailable"
+
+        if database is None:
+            return None, ""  # Silently skip when no database is configured
+
+        record = database.lookup(url)
+        if record is None:
+            return None, "not in database"
+
+        return record, ""
+
+    @classmethod
+    async def _amake_request_with_reason(
+        cls,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        client: httpx.AsyncClient | None = None,  # noqa: ARG003
+    ) -> tuple[dict[str, Any] | None, str]:
+        """Look up the IP address in the local database, which never blocks for long."""
+        return cls._make_request_with_reason(url, params=params, headers=headers)